@@ -4,6 +4,16 @@
 TEMP_DIRECTORY_PATH = "/tmp/orchest"
 TEMP_VOLUME_NAME = "tmp-orchest-{uuid}-{project_uuid}"
 PROJECT_DIR = "/project-dir"
+# The directory of a job is mounted here in the steps of its runs, see
+# `JOB_BLOB_STORE_DIR`.
+JOB_DIR = "/job-dir"
+# Blob store of data that is output to disk with deduplication, shared
+# by all runs of a job. Hard links cannot cross mounts, thus the runs
+# write their data through the mount of the job directory as well.
+JOB_BLOB_STORE_DIR = JOB_DIR + "/.orchest/blobs"
+# History of the memory usage of the memory-servers of the runs of a
+# job, since every run starts from a fresh copy of the project.
+JOB_MEMORY_HISTORY_FNAME = JOB_DIR + "/.orchest/memory-history.json"
 PIPELINE_PARAMETERS_RESERVED_KEY = "pipeline_parameters"
 
 # Databases
@@ -82,3 +92,10 @@ DOCKER_NETWORK = "orchest"
 
 # memory-server
 MEMORY_SERVER_SOCK_PATH = TEMP_DIRECTORY_PATH
+# Printed by the memory-server once its store and manager are ready, the
+# orchest-api waits for it before a session is considered launched.
+MEMORY_SERVER_READY_MESSAGE = "Memory-server is ready"
+MEMORY_SERVER_READY_TIMEOUT = 60
+# Metrics of the memory-server in the Prometheus text format, written
+# next to the socket of its store (at its default location).
+MEMORY_SERVER_METRICS_PATH = f"{MEMORY_SERVER_SOCK_PATH}/plasma.sock.metrics.prom"
@@ -21,16 +21,22 @@ class Config:
     # base directory in which the function is called.
     # '/project-dir' as project root is hardcoded because code sharing
     # with the internal config library is not possible due to the
-    # license difference.
+    # license difference. In the runs of a job, the project directory
+    # is accessed through the mount of the job directory instead, which
+    # also contains the blob store (see ``BLOB_STORE_DIR``).
     STEP_DATA_DIR = (
-        "/project-dir/.orchest/pipelines/" + PIPELINE_UUID + "/data/{step_uuid}"
+        os.getenv("ORCHEST_JOB_RUN_DIR", "/project-dir")
+        + "/.orchest/pipelines/"
+        + PIPELINE_UUID
+        + "/data/{step_uuid}"
     )
 
     # Path to the file that contains the pipeline definition.
     PIPELINE_DEFINITION_PATH = f"/project-dir/{PIPELINE_PATH}"
 
     # Only fill the Plasma store to 95% capacity. Otherwise the
-    # additional messages for eviction cannot be inserted. NOTE:
+    # additional messages for eviction cannot be inserted, in case the
+    # control channel of the memory-server is unavailable. NOTE:
     # trying to use 100% might therefore raise a MemoryError.
     MAX_RELATIVE_STORE_CAPACITY = 0.95
 
@@ -40,10 +46,56 @@ class Config:
     # socket to connect to the plasma store.
     STORE_SOCKET_NAME = "/tmp/orchest/plasma.sock"
 
+    # Directory of the store of memory-mapped files, which is used
+    # instead of the plasma store if the memory-server is started with
+    # the mmap backend. Like the socket, it is created by the
+    # memory-server.
+    MMAP_STORE_DIR = "/tmp/orchest/mmap-store"
+
+    # Timeout in seconds of requests to the orchest-api and the Jupyter
+    # server to resolve the UUID of the step of a kernel.
+    REQUEST_TIMEOUT = 10
+
     # For transfer.py
     IDENTIFIER_SERIALIZATION = 1
     IDENTIFIER_EVICTION = 2
+    IDENTIFIER_MANIFEST = 3
+    IDENTIFIER_SPILL = 4
+    IDENTIFIER_DISK_FALLBACK = 5
+    # Maximum size in bytes of a message over the control channel of the
+    # memory-server, has to match the memory-server.
+    CONTROL_MESSAGE_MAX_SIZE = 1 << 16
     CONN_NUM_RETRIES = 20
+    # Buffers of at least this number of bytes, e.g. the data of NumPy
+    # arrays, are pickled out-of-band (requires pickle protocol 5) so
+    # that they are not copied when serializing and deserializing.
+    PICKLE_OOB_MIN_BUFFER_SIZE = 1 << 16
+    # Codecs that can be used to compress data that is output to disk.
+    DISK_COMPRESSION_CODECS = ["lz4", "zstd"]
+    # Content-addressed store of data that is output to disk with
+    # deduplication, see ``orchest.transfer.output_to_disk``. Blobs that
+    # are no longer linked to by any output are removed once they are
+    # older than ``BLOB_PRUNE_AGE`` seconds. All runs of a job share the
+    # blob store in the directory of the job.
+    BLOB_STORE_DIR = os.getenv(
+        "ORCHEST_JOB_BLOB_STORE_DIR", "/project-dir/.orchest/blobs"
+    )
+    BLOB_PRUNE_AGE = 3600
+    # Number of rows per row group of Parquet files. Smaller row groups
+    # allow more rows to be skipped when filtering on read.
+    PARQUET_ROW_GROUP_SIZE = 1 << 16
+    # Maximum number of threads that run the blocking I/O and
+    # (de)serialization of ``orchest.transfer.aio``.
+    AIO_MAX_WORKERS = 4
+    # Seconds to wait for the memory-server to spill objects to disk
+    # when an object does not fit in the store, and the interval in
+    # seconds at which to check whether it fits.
+    SPILL_TIMEOUT = 10
+    SPILL_POLL_INTERVAL = 0.05
+    # Seconds to wait for an object to be released by other clients,
+    # e.g. receiving steps, when it is output again. The store defers
+    # the deletion of an object until it is no longer used.
+    OBJECT_REPLACE_TIMEOUT = 1
     # Separator for the metadata related to stored data, both to disk
     # and to memory.
     __METADATA_SEPARATOR__ = "; "
@@ -54,3 +106,28 @@ class Config:
     @classmethod
     def get_step_data_dir(cls, step_uuid):
         return cls.STEP_DATA_DIR.format(step_uuid=step_uuid)
+
+    @classmethod
+    def get_store_usage_file(cls):
+        # The memory-server keeps track of the memory that is used in
+        # the store in this file.
+        return f"{cls.STORE_SOCKET_NAME}.usage"
+
+    @classmethod
+    def get_store_reservations_dir(cls):
+        # Every reservation in the usage file is tied to a lock on a
+        # file in this directory, which is held until the object is
+        # sealed.
+        return f"{cls.STORE_SOCKET_NAME}.reservations"
+
+    @classmethod
+    def get_control_socket(cls):
+        # The memory-server receives messages for eviction and spilling
+        # on this socket, so that they do not have to be put in the
+        # store.
+        return f"{cls.STORE_SOCKET_NAME}.control"
+
+    @classmethod
+    def get_mmap_store_file(cls):
+        # Written by the memory-server once the mmap store is ready.
+        return os.path.join(cls.MMAP_STORE_DIR, "store.json")
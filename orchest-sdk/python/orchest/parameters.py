@@ -4,12 +4,13 @@ Parameters are stored in the corresponding pipeline definition file,
 e.g. ``pipeline.orchest``.
 
 """
+import copy
 import json
 from typing import Optional, Tuple
 
 from orchest.config import Config
 from orchest.error import StepUUIDResolveError
-from orchest.pipeline import Pipeline
+from orchest.pipeline import Pipeline, read_pipeline
 from orchest.utils import get_step_uuid
 
 
@@ -20,19 +21,17 @@ def get_params() -> Tuple[dict, dict]:
         A tuple of two elements, where the first is the parameters of
         the current step, the second is the parameters of the pipeline.
     """
-    with open(Config.PIPELINE_DEFINITION_PATH, "r") as f:
-        pipeline_definition = json.load(f)
-
-    pipeline = Pipeline.from_json(pipeline_definition)
+    pipeline = read_pipeline(Config.PIPELINE_DEFINITION_PATH)
     try:
         step_uuid = get_step_uuid(pipeline)
     except StepUUIDResolveError:
         raise StepUUIDResolveError("Parameters could not be identified.")
 
     step = pipeline.get_step_by_uuid(step_uuid)
-    params = step.get_params()
 
-    return params, pipeline.get_params()
+    # The pipeline is shared by all calls, thus the parameters are
+    # copied to keep it from being modified.
+    return copy.deepcopy(step.get_params()), copy.deepcopy(pipeline.get_params())
 
 
 def update_params(
@@ -58,6 +57,8 @@ def update_params(
         since different steps could be updating them at the same time.
 
     """
+    # NOTE: the pipeline is not read through `read_pipeline`, because
+    # the pipeline that it returns should not be modified.
     with open(Config.PIPELINE_DEFINITION_PATH, "r") as f:
         pipeline_definition = json.load(f)
 
@@ -1,4 +1,6 @@
-from typing import Any, Dict, List, Optional
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple
 
 from orchest import error
 
@@ -83,6 +85,8 @@ class Pipeline:
         self.steps = steps
         self.properties = properties
 
+        self._steps_by_uuid = {step.properties["uuid"]: step for step in steps}
+
     @classmethod
     def from_json(cls, description: PipelineDefinition) -> "Pipeline":
         """Constructs a pipeline from a json description.
@@ -131,13 +135,12 @@ class Pipeline:
                 thus it cannot determine where to output data to.
 
         """
-        for step in self.steps:
-            if step.properties["uuid"] == uuid:
-                return step
-
-        raise error.StepUUIDResolveError(
-            "Step does not exist in the pipeline with UUID: {uuid}."
-        )
+        try:
+            return self._steps_by_uuid[uuid]
+        except KeyError:
+            raise error.StepUUIDResolveError(
+                f"Step does not exist in the pipeline with UUID: {uuid}."
+            )
 
     def get_params(self) -> Dict[str, Any]:
         return self.properties.get("parameters", {})
@@ -152,3 +155,47 @@ class Pipeline:
 
     def __repr__(self) -> str:
         return f"Pipeline({self.steps!r})"
+
+
+# Pipelines that have been read by this process by the path of their
+# definition file. Together with the key of the file, see
+# `get_file_key`, at the time it was read.
+_pipeline_cache: Dict[str, Tuple[Tuple[int, int, int], Pipeline]] = {}
+
+
+def get_file_key(path: str) -> Tuple[int, int, int]:
+    """Returns a key that changes whenever the file is changed."""
+    stat = os.stat(path)
+    return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+def read_pipeline(path: str) -> Pipeline:
+    """Reads a pipeline from its definition file.
+
+    The pipeline is cached, so that the file is only parsed again once
+    it has changed.
+
+    Args:
+        path: Path to the pipeline definition file.
+
+    Returns:
+        The pipeline defined by the file. It is shared between calls and
+        should therefore not be modified.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+    """
+    key = get_file_key(path)
+    try:
+        cached_key, pipeline = _pipeline_cache[path]
+    except KeyError:
+        pass
+    else:
+        if cached_key == key:
+            return pipeline
+
+    with open(path, "r") as f:
+        pipeline = Pipeline.from_json(json.load(f))
+
+    _pipeline_cache[path] = (key, pipeline)
+    return pipeline
@@ -0,0 +1,3712 @@
+"""Transfer mechanisms to output data and get data."""
+import contextlib
+import fcntl
+import hashlib
+import json
+import os
+import pickle
+import re
+import shutil
+import socket
+import struct
+import sys
+import tempfile
+import threading
+import time
+import types
+import uuid
+from collections import defaultdict
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from enum import Enum
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from orchest import error
+from orchest.config import Config
+from orchest.pipeline import Pipeline, PipelineStep, read_pipeline
+from orchest.transfer import _plasma as plasma
+from orchest.transfer._mmap_store import MmapStoreClient
+from orchest.utils import get_step_uuid
+
+
+class Serialization(Enum):
+    """Possible types of serialization.
+
+    Types are:
+
+        * ``ARROW_TABLE``
+        * ``ARROW_BATCH``
+        * ``PICKLE``
+        * ``PICKLE5_OOB``: pickle protocol 5 where large buffers, e.g.
+          the data of NumPy arrays, are stored out-of-band next to the
+          pickle stream. On retrieval these buffers are not copied.
+        * ``PANDAS_ARROW``: a ``pd.DataFrame`` converted to a
+          ``pa.Table``, including the metadata to restore its index and
+          dtypes.
+        * ``PARQUET``: tabular data written to disk as a Parquet file,
+          see :func:`output_to_disk`.
+
+    """
+
+    ARROW_TABLE = 0
+    ARROW_BATCH = 1
+    PICKLE = 2
+    PICKLE5_OOB = 3
+    PANDAS_ARROW = 4
+    PARQUET = 5
+
+
+# Serializations of which the data is an Arrow IPC stream.
+_ARROW_STREAM_SERIALIZATIONS = [
+    Serialization.ARROW_TABLE,
+    Serialization.ARROW_BATCH,
+    Serialization.PANDAS_ARROW,
+]
+
+
+def _get_pipeline() -> Pipeline:
+    """Gets the pipeline defined by the pipeline definition file.
+
+    Raises:
+        PipelineDefinitionNotFoundError: If the pipeline definition file
+            could not be found.
+    """
+    try:
+        return read_pipeline(Config.PIPELINE_DEFINITION_PATH)
+    except FileNotFoundError:
+        raise error.PipelineDefinitionNotFoundError(
+            f"Could not open {Config.PIPELINE_DEFINITION_PATH}."
+        )
+
+
+def _check_data_name_validity(name: Optional[str]):
+    if not isinstance(name, (str, type(None))):
+        raise TypeError("Name should be of type string or `None`.")
+
+    if name is None:
+        return
+
+    if name == Config._RESERVED_UNNAMED_OUTPUTS_STR:
+        raise ValueError(
+            f"'{Config._RESERVED_UNNAMED_OUTPUTS_STR}' is a reserved `name`."
+        )
+
+    if Config.__METADATA_SEPARATOR__ in name:
+        raise ValueError(
+            f"'{Config.__METADATA_SEPARATOR__}' cannot be part of the `name`."
+        )
+
+
+def _interpret_metadata(metadata: str) -> Tuple[str, str, str, Optional[str]]:
+    """Interpret and return Orchest SDK metadata.
+
+    Args:
+        metadata: A string that can be interpreted as Orchest SDK
+            metadata. To be considered valid, it must contain the string
+            ``Config.__METADATA__SEPARATOR`` in a way that splitting the
+            string through the separator would result in 3 or 4 elements
+            , after dropping the leading internal flag of metadata that
+            was stored in memory. Those strings must be, in order: a
+            valid string representing a datetime (utc, ISO format), the
+            string representation of a member of the Serialization enum,
+            any string and optionally a compression codec (one of
+            ``Config.DISK_COMPRESSION_CODECS``).
+
+    Raises:
+        InvalidMetaDataError: If the input string is invalid.
+
+    Returns:
+        A tuple of 3 strings and the compression. The first is the
+        timestamp of when the data related to the metadata was produced
+        (utc, ISO format). The second string is the type of
+        serialization used (See the Serialization enum). The third
+        string is the name with which the data was output. The last is
+        the codec with which the data was compressed or ``None``.
+    """
+
+    if Config.__METADATA_SEPARATOR__ not in metadata:
+        raise error.InvalidMetaDataError(
+            f"Metadata {metadata} is missing the required separator."
+        )
+    metadata = metadata.split(Config.__METADATA_SEPARATOR__)
+
+    # Metadata that was stored in memory starts with an internal flag,
+    # which is ignored. Such a flag is never a valid timestamp.
+    if metadata[0] == str(Config.IDENTIFIER_SERIALIZATION):
+        metadata = metadata[1:]
+
+    # Metadata that was stored on disk has a 4th element in case the
+    # data was compressed.
+    if len(metadata) in [3, 4]:
+        timestamp, serialization, name = metadata[:3]
+        compression = metadata[3] if len(metadata) == 4 else None
+
+        # check timestamp for validity
+        try:
+            datetime.fromisoformat(timestamp)
+        except ValueError:
+            raise error.InvalidMetaDataError(
+                f"Metadata {metadata} has an invalid timestamp ({timestamp})."
+            )
+        except AttributeError:
+            # ``fromisoformat`` was added in Python3.7. For earlier
+            # versions we will simply not check the timestamp for
+            # validity. Since we know we are always writing ISO
+            # formatted strings, this case only becomes an issue if the
+            # user is manually writing the data passing.
+            pass
+
+        # check serialization for correctness
+        if (
+            serialization not in Serialization.__members__
+            and serialization not in _serializers
+        ):
+            raise error.InvalidMetaDataError(
+                f"Metadata {metadata} has an "
+                f"invalid serialization ({serialization})."
+            )
+
+        if compression is not None and (
+            compression not in Config.DISK_COMPRESSION_CODECS
+        ):
+            raise error.InvalidMetaDataError(
+                f"Metadata {metadata} has an invalid compression ({compression})."
+            )
+
+        return timestamp, serialization, name, compression
+    else:
+        raise error.InvalidMetaDataError(
+            f"Metadata {metadata} has an invalid number of elements."
+        )
+
+
+class _PlasmaConnector:
+    """Manages the connection to the in-memory object store.
+
+    Allows for only one connection per process to make sure the
+    different methods don't all try to connect to the store
+    individually. All instances share the same client.
+
+    The store is either a plasma store, or the mmap store (see
+    :mod:`orchest.transfer._mmap_store`) if there is no plasma socket
+    but there is a ``Config.MMAP_STORE_DIR``. The client of the mmap
+    store has the same interface as a plasma client.
+
+    The connection is transparently re-established if:
+
+    * The process was forked, e.g. by ``multiprocessing``. The socket of
+      the parent process cannot be shared with the child.
+    * The store was restarted, which is detected by a change of the
+      inode of the ``Config.STORE_SOCKET_NAME`` or of the file of the
+      mmap store.
+    * The ``Config.STORE_SOCKET_NAME`` or ``Config.MMAP_STORE_DIR`` was
+      changed.
+
+    """
+
+    _client: Optional[Union[plasma.PlasmaClient, MmapStoreClient]] = None
+
+    # Identifies the connection of the shared `_client` as a tuple of
+    # (pid, socket name, inode of the socket file, mmap store dir, inode
+    # of the mmap store file).
+    _conn_key: Optional[Tuple[int, str, Optional[int], str, Optional[int]]] = None
+
+    _lock = threading.RLock()
+
+    @staticmethod
+    def _get_inode(path: str) -> Optional[int]:
+        try:
+            return os.stat(path).st_ino
+        except OSError:
+            return None
+
+    @classmethod
+    def _get_conn_key(cls) -> Tuple[int, str, Optional[int], str, Optional[int]]:
+        # Checking the inode is a cheap health check, because it does
+        # not require a round trip to the store.
+        return (
+            os.getpid(),
+            Config.STORE_SOCKET_NAME,
+            cls._get_inode(Config.STORE_SOCKET_NAME),
+            Config.MMAP_STORE_DIR,
+            cls._get_inode(Config.get_mmap_store_file()),
+        )
+
+    @classmethod
+    def reset(cls) -> None:
+        """Drops the shared client, the next access reconnects."""
+        with cls._lock:
+            client, conn_key = cls._client, cls._conn_key
+            cls._client, cls._conn_key = None, None
+
+            # A client inherited from the parent process is left alone,
+            # its socket is still in use by the parent.
+            if client is not None and conn_key[0] == os.getpid():
+                try:
+                    client.disconnect()
+                except Exception:
+                    pass
+
+    @classmethod
+    def _after_fork_in_child(cls) -> None:
+        # The lock might have been held by another thread at the moment
+        # of forking, in which case it would never be released.
+        cls._lock = threading.RLock()
+
+    @property
+    def client(self) -> Union[plasma.PlasmaClient, MmapStoreClient]:
+        """Connects to the in-memory store if not already connected.
+
+        Returns:
+            A plasma client, or a client of the mmap store.
+
+        Raises:
+            OrchestNetworkError: Could not connect to the
+                ``Config.STORE_SOCKET_NAME``, because it does not exist.
+                Which might be because the specified value was wrong or
+                the store died.
+        """
+        cls = type(self)
+        with cls._lock:
+            if cls._client is not None and cls._conn_key == cls._get_conn_key():
+                return cls._client
+
+            cls.reset()
+
+            try:
+                if not os.path.exists(Config.STORE_SOCKET_NAME) and os.path.exists(
+                    Config.get_mmap_store_file()
+                ):
+                    client = MmapStoreClient(Config.MMAP_STORE_DIR)
+                else:
+                    client = plasma.connect(
+                        Config.STORE_SOCKET_NAME, num_retries=Config.CONN_NUM_RETRIES
+                    )
+            except (OSError, ValueError):
+                raise error.OrchestNetworkError(
+                    "Failed to connect to in-memory object store."
+                )
+
+            cls._client = client
+            cls._conn_key = cls._get_conn_key()
+
+            return cls._client
+
+
+# ``os.register_at_fork`` was added in Python3.7. For earlier versions
+# the pid in the connection key of the connector still makes sure that
+# a child process never reuses the client of its parent.
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_PlasmaConnector._after_fork_in_child)
+
+
+class _MultipartBuffer:
+    """Serialized data that consists of multiple parts.
+
+    Behaves as the concatenation of a header and the parts without ever
+    concatenating them in memory. This way the parts are copied only
+    once, straight into the destination (the plasma store or a file).
+
+    The layout is: the number of parts after the first one `n` and then
+    the lengths of the `n + 1` parts (all unsigned 64 bits little-endian
+    integers), followed by the parts. Every part starts at an offset
+    that is a multiple of ``_MultipartBuffer.ALIGNMENT``.
+
+    Args:
+        parts: The parts, contiguous objects that support the buffer
+            protocol, e.g. ``bytes``. There has to be at least one.
+    """
+
+    ALIGNMENT = 64
+
+    def __init__(self, parts: Sequence[Any]) -> None:
+        parts = [memoryview(part).cast("B") for part in parts]
+        lengths = [part.nbytes for part in parts]
+        header = struct.pack(f"<{len(lengths) + 1}Q", len(parts) - 1, *lengths)
+
+        self._parts = [memoryview(header)] + parts
+
+    @staticmethod
+    def _padding(offset: int) -> int:
+        return -offset % _MultipartBuffer.ALIGNMENT
+
+    @property
+    def size(self) -> int:
+        """The size of the serialized object in bytes."""
+        size = 0
+        for part in self._parts:
+            size += part.nbytes
+            size += self._padding(size)
+
+        return size
+
+    def write_to(self, stream) -> None:
+        """Writes the serialized object to the given stream."""
+        offset = 0
+        for part in self._parts:
+            stream.write(part)
+            offset += part.nbytes
+
+            padding = self._padding(offset)
+            stream.write(b"\0" * padding)
+            offset += padding
+
+    @classmethod
+    def split(cls, buffer: pa.Buffer) -> List[pa.Buffer]:
+        """Splits a buffer that was written by ``write_to`` into parts.
+
+        The parts are zero-copy slices of the given `buffer`.
+        """
+        (num_parts,) = struct.unpack_from("<Q", buffer)
+        lengths = struct.unpack_from(f"<{num_parts + 1}Q", buffer, offset=8)
+
+        offset = 8 * (num_parts + 2)
+        parts = []
+        for length in lengths:
+            offset += cls._padding(offset)
+            parts.append(buffer.slice(offset, length))
+            offset += length
+
+        return parts
+
+
+class _OutOfBandPickle(_MultipartBuffer):
+    """A pickle (protocol 5) together with its out-of-band buffers.
+
+    The first part is the pickle stream, followed by the buffers.
+
+    Args:
+        data: The pickle stream.
+        buffers: The out-of-band buffers of the pickle stream.
+    """
+
+    def __init__(self, data: bytes, buffers: List[memoryview]) -> None:
+        super().__init__([data] + buffers)
+
+    @classmethod
+    def loads(cls, buffer: pa.Buffer, copy: bool = True) -> Any:
+        """Deserializes a buffer that was written by ``write_to``.
+
+        Args:
+            buffer: The buffer to deserialize.
+            copy: If ``True``, then a read-only `buffer` is first
+                copied into writable memory. Otherwise the out-of-band
+                buffers are zero-copy slices of the given `buffer`, thus
+                e.g. NumPy arrays are reconstructed as read-only views
+                on the `buffer`.
+        """
+        if copy:
+            buffer = _writable_buffer(buffer)
+        parts = cls.split(buffer)
+        return pickle.loads(parts[0], buffers=parts[1:])
+
+
+def _writable_buffer(buffer: pa.Buffer) -> pa.Buffer:
+    """Returns the buffer, or a writable copy if it is read-only.
+
+    Buffers on the memory store and on memory mapped files are
+    read-only, buffers that were decompressed are not shared and thus
+    writable.
+    """
+    if buffer.is_mutable:
+        return buffer
+    return pa.py_buffer(bytearray(buffer))
+
+
+def _write_serialized(obj: Union[pa.Buffer, _MultipartBuffer], stream) -> None:
+    """Writes an object serialized by :func:`_serialize` to a stream."""
+    if isinstance(obj, _MultipartBuffer):
+        obj.write_to(stream)
+    else:
+        stream.write(obj)
+
+
+def _pickle(data: Any) -> Tuple[Union[pa.Buffer, _MultipartBuffer], Serialization]:
+    """Pickles an object using the best protocol possible.
+
+    When pickle protocol 5 is available, buffers of at least
+    ``Config.PICKLE_OOB_MIN_BUFFER_SIZE`` bytes are stored out-of-band.
+
+    Raises:
+        PicklingError: If the data could not be pickled.
+    """
+    # Pickle protocol 5 was added in Python3.8.
+    if pickle.HIGHEST_PROTOCOL < 5:
+        return pa.py_buffer(pickle.dumps(data, pickle.HIGHEST_PROTOCOL)), (
+            Serialization.PICKLE
+        )
+
+    buffers = []
+
+    def buffer_callback(buffer: pickle.PickleBuffer) -> bool:
+        # Returning a false value makes the buffer out-of-band.
+        try:
+            raw = buffer.raw()
+        except BufferError:
+            # Non-contiguous buffers are serialized in-band.
+            return True
+
+        if raw.nbytes < Config.PICKLE_OOB_MIN_BUFFER_SIZE:
+            return True
+
+        buffers.append(raw)
+        return False
+
+    serialized = pickle.dumps(data, protocol=5, buffer_callback=buffer_callback)
+
+    if not buffers:
+        # NOTE: zero-copy view on the bytes.
+        return pa.py_buffer(serialized), Serialization.PICKLE
+
+    return _OutOfBandPickle(serialized, buffers), Serialization.PICKLE5_OOB
+
+
+def _is_arrow_compatible_dataframe(data: Any) -> bool:
+    """Returns whether the data is a DataFrame that Arrow can represent.
+
+    Columns of the ``object`` dtype are only considered compatible if
+    they contain strings, since other objects (e.g. dictionaries) are
+    not guaranteed to survive the conversion unchanged.
+    """
+    # The user can only have created a DataFrame if pandas is already
+    # imported. This way pandas does not have to be a dependency and we
+    # never pay the price of importing it.
+    pd = sys.modules.get("pandas")
+    if pd is None or not isinstance(data, pd.DataFrame):
+        return False
+
+    for i, dtype in enumerate(data.dtypes):
+        if dtype != object:
+            continue
+
+        if pd.api.types.infer_dtype(data.iloc[:, i], skipna=True) != "string":
+            return False
+
+    return True
+
+
+def _serialize_arrow(data: Union[pa.RecordBatch, pa.Table]) -> pa.Buffer:
+    """Serializes Arrow data to an IPC stream in a ``pa.Buffer``.
+
+    Raises:
+        SerializationError: If the data could not be serialized.
+    """
+    output_buffer = pa.BufferOutputStream()
+    try:
+        writer = pa.RecordBatchStreamWriter(output_buffer, data.schema)
+        writer.write(data)
+        writer.close()
+    except pa.ArrowSerializationError:
+        raise error.SerializationError(
+            f"Could not serialize data of type {type(data)}."
+        )
+
+    return output_buffer.getvalue()
+
+
+class _Serializer(NamedTuple):
+    """A serializer that is registered by :func:`register_serializer`.
+
+    Like the members of :class:`Serialization`, it has a ``name`` that
+    is stored in the metadata of the serialized data.
+    """
+
+    name: str
+    type: Union[type, str]
+    dumps: Callable[[Any], Optional[Sequence[Any]]]
+    loads: Callable[[List[pa.Buffer]], Any]
+    subclasses: bool = True
+
+
+# Registered serializers by name, in order of registration.
+_serializers: Dict[str, _Serializer] = {}
+
+
+def register_serializer(
+    type: Union[type, str],
+    dumps: Callable[[Any], Optional[Sequence[Any]]],
+    loads: Callable[[List[pa.Buffer]], Any],
+    name: str,
+    subclasses: bool = True,
+) -> None:
+    """Registers a serializer for data of the given type.
+
+    Output data that is an instance of the `type` is serialized by
+    `dumps` instead of the built-in serialization, i.e. Arrow or pickle.
+    The serialized data consists of a list of buffers, which are copied
+    into the store (or a file) one by one. On retrieval `loads` gets
+    writable copies of these buffers, or read-only zero-copy views on
+    them if the data is retrieved with ``get_inputs(copy=False)``.
+
+    A serializer has to be registered in the receiving step as well.
+    Serializers for NumPy arrays, SciPy sparse matrices and Polars
+    DataFrames are registered by default.
+
+    Args:
+        type: The type of the data to serialize. Either the type itself
+            or its fully qualified name, e.g. ``"numpy.ndarray"``, so
+            that its module does not have to be imported.
+        dumps: Serializes data into a list of contiguous objects that
+            support the buffer protocol, e.g. ``bytes`` or NumPy arrays.
+            If it returns ``None``, then the data is serialized as if
+            the serializer were not registered.
+        loads: Deserializes data from the list of buffers (as
+            ``pa.Buffer`` objects) that was returned by `dumps`.
+        name: Name of the serializer, which is stored in the metadata
+            of the serialized data. Registering a serializer with the
+            same name replaces the previous one.
+        subclasses: If ``False``, then only data of exactly the `type`
+            is serialized, and not instances of its subclasses, which
+            could hold state that `dumps` does not know of.
+
+    Raises:
+        ValueError: If the `name` contains characters other than
+            letters, digits, ``"_"`` and ``"-"`` or if it is the name of
+            a member of :class:`Serialization`.
+        TypeError: If `dumps` or `loads` is not callable.
+
+    Example:
+        >>> register_serializer(
+        ...     "my_module.MyClass",
+        ...     dumps=lambda obj: [obj.to_bytes()],
+        ...     loads=lambda buffers: MyClass.from_bytes(buffers[0]),
+        ...     name="my-class",
+        ... )
+
+    Note:
+        Serializers that are registered later take precedence over the
+        ones that are registered earlier.
+
+    """
+    if not isinstance(name, str) or re.fullmatch(r"[\w-]+", name, re.ASCII) is None:
+        raise ValueError("The `name` can only contain letters, digits, '_' and '-'.")
+    if name in Serialization.__members__:
+        raise ValueError(f"'{name}' is a reserved serialization name.")
+    if not callable(dumps) or not callable(loads):
+        raise TypeError("Both `dumps` and `loads` have to be callable.")
+
+    # Re-registering moves the serializer to the end of the registry.
+    _serializers.pop(name, None)
+    _serializers[name] = _Serializer(name, type, dumps, loads, subclasses)
+
+
+def _resolve_serializer_type(type_: Union[type, str]) -> Optional[type]:
+    """Returns the type of a serializer, if its module is imported.
+
+    Data can only be an instance of a type if the module of the type is
+    already imported. This way the module is never imported needlessly.
+    """
+    if not isinstance(type_, str):
+        return type_
+
+    module_name, _, attr = type_.rpartition(".")
+    module = sys.modules.get(module_name)
+    return getattr(module, attr, None)
+
+
+def _serialize_registered(
+    data: Any,
+) -> Optional[Tuple[_MultipartBuffer, _Serializer]]:
+    """Serializes data with the registered serializer for its type.
+
+    Returns:
+        The serialized data and the serializer that was used, or
+        ``None`` if no registered serializer serialized the data.
+
+    Raises:
+        SerializationError: If the serializer failed.
+    """
+    for serializer in reversed(list(_serializers.values())):
+        type_ = _resolve_serializer_type(serializer.type)
+        if type_ is None or not isinstance(data, type_):
+            continue
+        if not serializer.subclasses and type(data) is not type_:
+            continue
+
+        try:
+            parts = serializer.dumps(data)
+            if parts is None:
+                continue
+            if not parts:
+                raise ValueError("No buffers to serialize.")
+
+            return _MultipartBuffer(parts), serializer
+        except Exception as e:
+            raise error.SerializationError(
+                f'Serializer "{serializer.name}" could not serialize data of '
+                f"type {type(data)}: {e}"
+            )
+
+    return None
+
+
+def _deserialize_registered(
+    serialization: str, buffer: pa.Buffer, copy: bool = True
+) -> Any:
+    """Deserializes data that was serialized by a registered serializer.
+
+    Args:
+        serialization: The name of the serializer.
+        buffer: The serialized data.
+        copy: If ``True``, then a read-only `buffer` is first copied
+            into writable memory, so that e.g. NumPy arrays that are
+            views on the buffers can be modified.
+
+    Raises:
+        DeserializationError: If the serializer failed.
+    """
+    serializer = _serializers[serialization]
+    if copy:
+        buffer = _writable_buffer(buffer)
+
+    try:
+        return serializer.loads(_MultipartBuffer.split(buffer))
+    except Exception as e:
+        raise error.DeserializationError(
+            f'Serializer "{serializer.name}" could not deserialize data: {e}'
+        )
+
+
+def _ndarray_to_parts(array: Any) -> Tuple[Tuple[Any, Tuple, bool], Any]:
+    """Returns the header and the data buffer of a NumPy array.
+
+    The array is only copied if it is neither C nor Fortran contiguous.
+    """
+    import numpy as np
+
+    shape = array.shape
+    fortran_order = array.flags.f_contiguous and not array.flags.c_contiguous
+    if fortran_order:
+        # The transpose of a Fortran contiguous array is C contiguous.
+        array = array.T
+
+    # Viewing the data as bytes also works for dtypes that do not
+    # support the buffer protocol, e.g. datetimes.
+    buffer = np.ascontiguousarray(array).reshape(-1).view(np.uint8)
+    return (array.dtype, shape, fortran_order), buffer
+
+
+def _ndarray_from_parts(header: Tuple[Any, Tuple, bool], buffer: pa.Buffer) -> Any:
+    """Reconstructs a NumPy array as a zero-copy view on a buffer.
+
+    The array is read-only if the `buffer` is.
+    """
+    import numpy as np
+
+    dtype, shape, fortran_order = header
+    array = np.frombuffer(buffer, dtype=dtype)
+    return array.reshape(shape, order="F" if fortran_order else "C")
+
+
+def _dumps_ndarray(data: Any) -> Optional[List[Any]]:
+    # Arrays of Python objects are pickled instead, just like subclasses
+    # (e.g. masked arrays), for which the serializer is not used.
+    if data.dtype.hasobject or data.dtype.itemsize == 0:
+        return None
+
+    header, buffer = _ndarray_to_parts(data)
+    return [pickle.dumps(header), buffer]
+
+
+def _loads_ndarray(buffers: List[pa.Buffer]) -> Any:
+    return _ndarray_from_parts(pickle.loads(buffers[0]), buffers[1])
+
+
+# Arrays of which a SciPy sparse matrix consists, by format.
+_SPARSE_COMPONENTS = {
+    "csr": ["data", "indices", "indptr"],
+    "csc": ["data", "indices", "indptr"],
+    "coo": ["data", "row", "col"],
+}
+
+
+def _dumps_sparse(data: Any) -> Optional[List[Any]]:
+    import scipy.sparse
+
+    # Other formats and subclasses are pickled instead.
+    components = _SPARSE_COMPONENTS.get(data.format)
+    cls_name = type(data).__name__
+    if components is None or getattr(scipy.sparse, cls_name, None) is not type(data):
+        return None
+
+    headers, buffers = [], []
+    for component in components:
+        array = getattr(data, component)
+        if array.dtype.hasobject:
+            return None
+
+        header, buffer = _ndarray_to_parts(array)
+        headers.append(header)
+        buffers.append(buffer)
+
+    return [pickle.dumps((cls_name, data.format, data.shape, headers))] + buffers
+
+
+def _loads_sparse(buffers: List[pa.Buffer]) -> Any:
+    import scipy.sparse
+
+    cls_name, sparse_format, shape, headers = pickle.loads(buffers[0])
+    arrays = [
+        _ndarray_from_parts(header, buffer)
+        for header, buffer in zip(headers, buffers[1:])
+    ]
+
+    cls = getattr(scipy.sparse, cls_name)
+    if sparse_format == "coo":
+        data, row, col = arrays
+        return cls((data, (row, col)), shape=shape)
+    return cls(tuple(arrays), shape=shape)
+
+
+def _dumps_polars(data: Any) -> List[Any]:
+    return [_serialize_arrow(data.to_arrow())]
+
+
+def _loads_polars(buffers: List[pa.Buffer]) -> Any:
+    import polars
+
+    return polars.from_arrow(pa.ipc.open_stream(buffers[0]).read_all())
+
+
+register_serializer(
+    "numpy.ndarray", _dumps_ndarray, _loads_ndarray, "NUMPY", subclasses=False
+)
+register_serializer(
+    "scipy.sparse.spmatrix", _dumps_sparse, _loads_sparse, "SCIPY_SPARSE"
+)
+register_serializer("polars.DataFrame", _dumps_polars, _loads_polars, "POLARS")
+
+
+def _serialize(
+    data: Any,
+) -> Tuple[Union[pa.Buffer, _MultipartBuffer], Union[Serialization, _Serializer]]:
+    """Serializes an object.
+
+    The way the object is serialized depends on the nature of the
+    object: objects of a type for which a serializer is registered,
+    see :func:`register_serializer`, are serialized by that serializer,
+    e.g. NumPy arrays. ``pa.RecordBatch`` and ``pa.Table`` are
+    serialized using ``pyarrow`` functions. So are ``pd.DataFrame``
+    objects, after being converted to a ``pa.Table``, if all their
+    columns can be represented by Arrow. All other cases are serialized
+    through the ``pickle`` library, where large buffers are kept
+    out-of-band if pickle protocol 5 is available.
+
+    Args:
+        data: The object/data to be serialized.
+
+    Returns:
+        Tuple of the serialized data (in ``pa.Buffer`` format, or as a
+        ``_MultipartBuffer`` for the ``PICKLE5_OOB`` serialization and
+        registered serializers) and the :class:`Serialization` or the
+        registered serializer that was used.
+
+    Raises:
+        SerializationError: If the data could not be serialized.
+
+    Note:
+        ``pickle`` does not include the code of custom functions or
+        classes, it only pickles their names. Following to the official
+        `Python Docs
+        <https://docs.python.org/3/library/pickle.html#what-can-be-pickled-and-unpickled>`_:
+        "Thus the defining module must be importable in the unpickling
+        environment, and the module must contain the named object,
+        otherwise an exception will be raised."
+
+    """
+    registered = _serialize_registered(data)
+    if registered is not None:
+        return registered
+
+    table = None
+    if isinstance(data, (pa.RecordBatch, pa.Table)):
+        # Use the intended pyarrow functionalities when possible.
+        if isinstance(data, pa.Table):
+            serialization = Serialization.ARROW_TABLE
+        else:
+            serialization = Serialization.ARROW_BATCH
+
+        table = data
+
+    elif _is_arrow_compatible_dataframe(data):
+        try:
+            # The conversion uses multiple threads.
+            table = pa.Table.from_pandas(data)
+        except (pa.ArrowException, ValueError):
+            # E.g. duplicate column names. The DataFrame is pickled
+            # instead.
+            pass
+        else:
+            serialization = Serialization.PANDAS_ARROW
+
+    if table is not None:
+        serialized = _serialize_arrow(table)
+
+    else:
+        # All other cases use the pickle library. Use the best protocol
+        # possible, for reference see:
+        # https://docs.python.org/3/library/pickle.html#pickle-protocols
+        try:
+            serialized, serialization = _pickle(data)
+        except pickle.PicklingError:
+            raise error.SerializationError(
+                f"Could not pickle data of type {type(data)}."
+            )
+
+    return serialized, serialization
+
+
+def _table_to_pandas(table: pa.Table, copy: bool = True) -> Any:
+    """Converts a table of the ``PANDAS_ARROW`` serialization back.
+
+    Every column gets its own block, which avoids having to consolidate
+    (and thus copy) columns of the same dtype, and columns of the table
+    are released as soon as they are converted.
+
+    Args:
+        table: The table to convert, which can no longer be used
+            afterwards.
+        copy: If ``True``, then the blocks that are zero-copy views on
+            the `table`, which are read-only, are copied. Otherwise they
+            are kept read-only.
+    """
+    df = table.to_pandas(split_blocks=True, self_destruct=True)
+    if copy:
+        _make_blocks_writable(df)
+    return df
+
+
+def _make_blocks_writable(df: Any) -> None:
+    """Copies the read-only blocks of a ``pd.DataFrame`` in place.
+
+    Only the blocks that are views on Arrow memory are read-only, the
+    others were already copied by the conversion and are kept. pandas
+    has no public API to replace a single block, thus its internals are
+    used.
+    """
+    import numpy as np
+
+    # NOTE: the block manager was renamed in pandas 1.1.
+    manager = df._mgr if hasattr(df, "_mgr") else df._data
+    for block in manager.blocks:
+        if isinstance(block.values, np.ndarray) and not block.values.flags.writeable:
+            block.values = block.values.copy()
+
+
+# Key in the schema metadata of Parquet files to store the type of the
+# data that was output, so that the same type can be returned.
+_PARQUET_TYPE_KEY = b"orchest_type"
+
+
+def _to_parquet_table(data: Any) -> Optional[pa.Table]:
+    """Converts tabular data to a table that can be written as Parquet.
+
+    Returns:
+        The table, or ``None`` if the `data` is not tabular.
+    """
+    if isinstance(data, pa.Table):
+        table = data
+    elif isinstance(data, pa.RecordBatch):
+        table = pa.Table.from_batches([data])
+    elif _is_arrow_compatible_dataframe(data):
+        try:
+            table = pa.Table.from_pandas(data)
+        except (pa.ArrowException, ValueError):
+            return None
+    else:
+        return None
+
+    metadata = dict(table.schema.metadata or {})
+    metadata[_PARQUET_TYPE_KEY] = type(data).__name__.encode("utf-8")
+    return table.replace_schema_metadata(metadata)
+
+
+def _read_parquet(
+    file_path: str,
+    columns: Optional[List[str]] = None,
+    filters: Optional[List[Any]] = None,
+    copy: bool = True,
+) -> Any:
+    """Reads a Parquet file written through :func:`output_to_disk`.
+
+    Only the requested `columns` are read and row groups that cannot
+    match the `filters` are skipped, see ``pyarrow.parquet.read_table``.
+    DataFrames are converted as described by :func:`_table_to_pandas`.
+
+    Returns:
+        Data of the same type as was output, i.e. a ``pa.Table``,
+        ``pa.RecordBatch`` or ``pd.DataFrame``.
+    """
+    table = pq.read_table(
+        file_path,
+        columns=columns,
+        filters=filters,
+        memory_map=True,
+        # Makes sure that the index of DataFrames is read as well.
+        use_pandas_metadata=True,
+    )
+
+    metadata = dict(table.schema.metadata or {})
+    data_type = metadata.pop(_PARQUET_TYPE_KEY, b"Table")
+    table = table.replace_schema_metadata(metadata or None)
+
+    if data_type == b"DataFrame":
+        return _table_to_pandas(table, copy=copy)
+    elif data_type == b"RecordBatch":
+        batches = table.combine_chunks().to_batches()
+        if batches:
+            return batches[0]
+        return pa.RecordBatch.from_arrays(
+            [pa.array([], type=field.type) for field in table.schema],
+            schema=table.schema,
+        )
+
+    return table
+
+
+def _output_to_disk(
+    obj: Union[pa.Buffer, _MultipartBuffer],
+    full_path: str,
+    serialization: Union[Serialization, _Serializer],
+    compression: Optional[str] = None,
+) -> None:
+    """Outputs a serialized object to disk to the specified path.
+
+    Args:
+        obj: Object to output to disk.
+        full_path: Full path to save the data to.
+        serialization: Serialization of the `obj`. For possible values
+            see :class:`Serialization`, or a registered serializer.
+        compression: Codec to compress the `obj` with. For possible
+            values see ``Config.DISK_COMPRESSION_CODECS``. If ``None``,
+            then the `obj` is not compressed.
+
+    Raises:
+        ValueError: If the specified serialization is not valid.
+    """
+    if not isinstance(serialization, (Serialization, _Serializer)):
+        raise ValueError("Function not defined for specified 'serialization'")
+
+    file_path = f"{full_path}.{serialization.name}"
+
+    # The file might be a hard link to a blob, which must not be
+    # overwritten in place. See `_output_to_blob`.
+    try:
+        os.remove(file_path)
+    except FileNotFoundError:
+        pass
+
+    if serialization == Serialization.PARQUET:
+        # Parquet has its own compression, defaulting to snappy.
+        pq.write_table(
+            obj,
+            file_path,
+            row_group_size=Config.PARQUET_ROW_GROUP_SIZE,
+            compression=compression or "snappy",
+        )
+
+    elif compression is None:
+        with pa.OSFile(file_path, "wb") as f:
+            _write_serialized(obj, f)
+
+    elif serialization in _ARROW_STREAM_SERIALIZATIONS:
+        # The buffers inside the IPC stream are compressed, the stream
+        # reader transparently decompresses them.
+        reader = pa.ipc.open_stream(obj)
+        options = pa.ipc.IpcWriteOptions(compression=compression)
+        with pa.OSFile(file_path, "wb") as f:
+            with pa.ipc.new_stream(f, reader.schema, options=options) as writer:
+                for batch in reader:
+                    writer.write_batch(batch)
+
+    else:
+        with pa.output_stream(file_path, compression=compression) as f:
+            _write_serialized(obj, f)
+
+    return
+
+
+# The ``FICLONE`` ioctl request of Linux, which makes a file share the
+# data of another file (a reflink) on filesystems that support it.
+_FICLONE = 0x40049409
+
+
+def _hash_serialized(obj: Union[pa.Buffer, _MultipartBuffer]) -> str:
+    """Returns the SHA-256 digest of a serialized object, in hex."""
+    digest = hashlib.sha256()
+    _write_serialized(obj, types.SimpleNamespace(write=digest.update))
+    return digest.hexdigest()
+
+
+def _link_blob(blob_path: str, file_path: str) -> None:
+    """Makes the file at `file_path` have the content of a blob.
+
+    A hard link is used if possible, otherwise a reflink and lastly a
+    copy, e.g. if the blob store is on a different filesystem.
+    """
+    try:
+        os.link(blob_path, file_path)
+        return
+    except OSError:
+        pass
+
+    with open(blob_path, "rb") as src, open(file_path, "wb") as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+            return
+        except OSError:
+            pass
+
+        shutil.copyfileobj(src, dst)
+
+
+def _prune_blobs() -> None:
+    """Removes the blobs that are no longer linked to by any output.
+
+    Only blobs older than ``Config.BLOB_PRUNE_AGE`` are removed, so that
+    a blob is never removed between its creation and it being linked.
+    """
+    try:
+        file_names = os.listdir(Config.BLOB_STORE_DIR)
+    except FileNotFoundError:
+        return
+
+    min_mtime = time.time() - Config.BLOB_PRUNE_AGE
+    for file_name in file_names:
+        path = os.path.join(Config.BLOB_STORE_DIR, file_name)
+        try:
+            stat = os.stat(path)
+            if stat.st_nlink == 1 and stat.st_mtime < min_mtime:
+                os.remove(path)
+        except FileNotFoundError:
+            continue
+
+
+def _output_to_blob(
+    obj: Union[pa.Buffer, _MultipartBuffer],
+    full_path: str,
+    serialization: Union[Serialization, _Serializer],
+    compression: Optional[str] = None,
+) -> None:
+    """Outputs a serialized object to disk through the blob store.
+
+    The object is written to the blob store under the hash of its
+    serialized bytes, unless an identical object was written before,
+    after which the output is linked to the blob. See
+    :func:`_output_to_disk` for the arguments.
+    """
+    blob_name = f"{_hash_serialized(obj)}.{serialization.name}"
+    if compression is not None:
+        blob_name += f".{compression}"
+    blob_path = os.path.join(Config.BLOB_STORE_DIR, blob_name)
+
+    try:
+        # Keeps the blob from being pruned, see `_prune_blobs`.
+        os.utime(blob_path)
+    except FileNotFoundError:
+        os.makedirs(Config.BLOB_STORE_DIR, exist_ok=True)
+
+        # Write to a temporary file first, so that concurrent writers of
+        # the same blob never link to a partially written blob.
+        tmp_path = f"{blob_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        _output_to_disk(obj, tmp_path, serialization, compression=compression)
+        os.replace(f"{tmp_path}.{serialization.name}", blob_path)
+
+    file_path = f"{full_path}.{serialization.name}"
+    try:
+        os.remove(file_path)
+    except FileNotFoundError:
+        pass
+    _link_blob(blob_path, file_path)
+
+
+def _get_disk_compression(
+    pipeline: Pipeline, compression: Optional[str] = None
+) -> Optional[str]:
+    """Gets the codec to compress data that is output to disk with.
+
+    Args:
+        pipeline: The pipeline of the step that outputs data.
+        compression: The codec that was explicitly requested. If
+            ``None``, then the ``data_passing_disk_compression`` setting
+            of the `pipeline` is used.
+
+    Raises:
+        ValueError: If the compression is not supported.
+    """
+    if compression is None:
+        settings = pipeline.properties.get("settings") or {}
+        compression = settings.get("data_passing_disk_compression")
+
+    if compression is not None and compression not in Config.DISK_COMPRESSION_CODECS:
+        raise ValueError(
+            f"Compression '{compression}' is not one of "
+            f"{Config.DISK_COMPRESSION_CODECS}."
+        )
+
+    return compression
+
+
+def _get_disk_deduplication(
+    pipeline: Pipeline, deduplicate: Optional[bool] = None
+) -> bool:
+    """Gets whether to deduplicate data that is output to disk.
+
+    Args:
+        pipeline: The pipeline of the step that outputs data.
+        deduplicate: Whether deduplication was explicitly requested. If
+            ``None``, then the ``data_passing_disk_deduplication``
+            setting of the `pipeline` is used.
+    """
+    if deduplicate is None:
+        settings = pipeline.properties.get("settings") or {}
+        deduplicate = settings.get("data_passing_disk_deduplication", False)
+
+    return bool(deduplicate)
+
+
+def _get_output_key(step_uuid: str, name: Optional[str]) -> Optional[str]:
+    """Returns the key that identifies an output of a step on disk.
+
+    The key of a named output is the hexadecimal representation of the
+    ID of the output in memory. The unnamed output has no key.
+    """
+    if name is None:
+        return None
+
+    return _convert_uuid_to_object_id(step_uuid, name).binary().hex()
+
+
+def _get_output_paths(step_uuid: str, key: Optional[str] = None) -> Tuple[str, str]:
+    """Returns the paths of an output of a step on disk.
+
+    Args:
+        step_uuid: The UUID of the step that output the data.
+        key: The key of the output, see :func:`_get_output_key`.
+
+    Returns:
+        The path of the HEAD file of the output and the path of its data
+        without the extension of the serialization.
+    """
+    step_data_dir = Config.get_step_data_dir(step_uuid)
+    if key is None:
+        return (
+            os.path.join(step_data_dir, "HEAD"),
+            os.path.join(step_data_dir, step_uuid),
+        )
+
+    return (
+        os.path.join(step_data_dir, f"HEAD.{key}"),
+        os.path.join(step_data_dir, f"{step_uuid}.{key}"),
+    )
+
+
+# Identifies the run of the step if the orchest-api did not set one,
+# see `_get_step_run_uuid`. Child processes that are forked share it.
+_process_run_uuid = uuid.uuid4().hex
+
+# Name of the file in the data directory of a step that contains the
+# UUID of the run that last removed the outputs of the step.
+_STEP_RUN_FNAME = "RUN"
+
+# Maps the UUIDs of the steps of which the outputs of a previous
+# execution have been removed to the UUID of the run that removed them,
+# see `_clear_previous_outputs`.
+_cleared_step_runs: Dict[str, str] = {}
+# Outputs can be written by multiple threads at once, e.g. through
+# :mod:`orchest.transfer.aio`. Guards the removal of the outputs of a
+# previous execution and the updates of the manifest of the step.
+_outputs_lock = threading.RLock()
+
+
+def _get_kernel_execution_count() -> Optional[int]:
+    """Returns the execution count of the IPython kernel, if any."""
+    # Don't import IPython if it is not used already.
+    ipython = sys.modules.get("IPython")
+    if ipython is None:
+        return None
+
+    shell = ipython.get_ipython()
+    if shell is None:
+        return None
+
+    return shell.execution_count
+
+
+def _get_step_run_uuid() -> str:
+    """Returns the UUID of the current run of the step.
+
+    The orchest-api sets ``ORCHEST_STEP_RUN_UUID`` for the steps of
+    pipeline runs. Otherwise, every execution of a cell is a run in a
+    Jupyter kernel, and the process is the run elsewhere.
+    """
+    run_uuid = os.environ.get("ORCHEST_STEP_RUN_UUID")
+    if run_uuid is not None:
+        return run_uuid
+
+    execution_count = _get_kernel_execution_count()
+    if execution_count is not None:
+        return f"{_process_run_uuid}-{execution_count}"
+
+    return _process_run_uuid
+
+
+def _clear_previous_outputs(step_uuid: str) -> None:
+    """Removes the outputs of a previous execution of the step.
+
+    Every output name of a step is stored separately. To make sure that
+    receiving steps do not get data that a previous execution output
+    under a name that is no longer used, all outputs of the step are
+    removed the first time the step outputs data in the current run, see
+    :func:`_get_step_run_uuid`.
+
+    A run can consist of multiple processes, e.g. a script that uses
+    ``multiprocessing`` or a step that runs multiple scripts, which must
+    not remove each other's outputs. The UUID of the run that removed
+    the outputs is therefore stored in the data directory of the step.
+    """
+    run_uuid = _get_step_run_uuid()
+    with _outputs_lock:
+        if _cleared_step_runs.get(step_uuid) == run_uuid:
+            return
+
+        step_data_dir = Config.get_step_data_dir(step_uuid)
+        os.makedirs(step_data_dir, exist_ok=True)
+
+        run_file = os.path.join(step_data_dir, _STEP_RUN_FNAME)
+        with open(run_file, "a+") as f:
+            # Processes of the same run wait for the first one to
+            # remove the outputs.
+            fcntl.flock(f, fcntl.LOCK_EX)
+            f.seek(0)
+            if f.read() != run_uuid:
+                _clear_step_outputs(step_uuid)
+                f.seek(0)
+                f.truncate()
+                f.write(run_uuid)
+
+        _cleared_step_runs[step_uuid] = run_uuid
+
+
+def _clear_step_outputs(step_uuid: str) -> None:
+    """See :func:`_clear_previous_outputs`."""
+
+    step_data_dir = Config.get_step_data_dir(step_uuid)
+    try:
+        file_names = os.listdir(step_data_dir)
+    except FileNotFoundError:
+        file_names = []
+
+    for file_name in file_names:
+        if file_name.startswith(("HEAD", step_uuid)):
+            os.remove(os.path.join(step_data_dir, file_name))
+
+    # Removing the outputs might have unlinked blobs.
+    _prune_blobs()
+
+    # Don't wait for the connection retries if there is no store.
+    if not os.path.exists(Config.STORE_SOCKET_NAME) and not os.path.exists(
+        Config.get_mmap_store_file()
+    ):
+        return
+
+    try:
+        client = _PlasmaConnector().client
+    except error.OrchestNetworkError:
+        return
+
+    manifest_id = _get_manifest_object_id(step_uuid)
+    names = _interpret_manifest(client.get_metadata([manifest_id], timeout_ms=0)[0])
+    obj_ids = [_convert_uuid_to_object_id(step_uuid)]
+    obj_ids += [_convert_uuid_to_object_id(step_uuid, name) for name in names]
+    client.delete(obj_ids + [manifest_id])
+
+
+def _write_head(
+    head_file: str,
+    serialization: Union[Serialization, _Serializer],
+    name: str,
+    compression: Optional[str] = None,
+) -> None:
+    """Writes the HEAD file of the most recent write to disk.
+
+    The HEAD file serves to resolve the transfer method, see
+    :func:`_resolve_disk`.
+    """
+    with open(head_file, "w") as f:
+        metadata = [
+            datetime.utcnow().isoformat(timespec="seconds"),
+            serialization.name,
+            name,
+        ]
+        if compression is not None:
+            metadata.append(compression)
+        metadata = Config.__METADATA_SEPARATOR__.join(metadata)
+        f.write(metadata)
+
+
+def output_to_disk(
+    data: Any,
+    name: Optional[str],
+    serialization: Optional[Serialization] = None,
+    compression: Optional[str] = None,
+    parquet: bool = False,
+    deduplicate: Optional[bool] = None,
+) -> None:
+    """Outputs data to disk.
+
+    To manage outputing the data to disk, this function has a side
+    effect:
+
+    * Writes to a HEAD file alongside the actual data file. This file
+      serves as a protocol that returns the timestamp of the latest
+      write to disk via this function alongside the used serialization.
+      Every output name has its own HEAD and data file.
+
+    Args:
+        data: Data to output to disk.
+        name: Name of the output data. As a string, it becomes the name
+            of the data, when ``None``, the data is considered nameless.
+            This affects the way the data can be later retrieved using
+            :func:`get_inputs`.
+        serialization: Serialization of the `data` in case it is already
+            serialized. For possible values see :class:`Serialization`.
+        compression: Codec to compress the data with, either ``"lz4"``
+            or ``"zstd"``. If ``None``, then the
+            ``data_passing_disk_compression`` setting of the pipeline is
+            used, by default the data is not compressed.
+        parquet: If ``True`` and the data is tabular, i.e. a
+            ``pa.Table``, ``pa.RecordBatch`` or ``pd.DataFrame``, then
+            it is written as a Parquet file. Receiving steps can then
+            read just the columns and rows they need, see the `columns`
+            and `filters` arguments of :func:`get_inputs`.
+        deduplicate: If ``True``, then the data is stored in a blob
+            store in the ``.orchest`` directory of the project under the
+            hash of its serialized bytes, and the output is a hard link
+            to the blob. Outputting data that is identical to earlier
+            output, of any step, then does not write the data again. If
+            ``None``, then the ``data_passing_disk_deduplication``
+            setting of the pipeline is used, by default data is not
+            deduplicated. Parquet files are never deduplicated.
+
+    Raises:
+        DataInvalidNameError: The name of the output data is invalid,
+            e.g because it is a reserved name (``"unnamed"``) or because
+            it contains a reserved substring.
+        PipelineDefinitionNotFoundError: If the pipeline definition file
+            could not be found.
+        ValueError: If the specified compression is not supported.
+        StepUUIDResolveError: The step's UUID cannot be resolved and
+            thus it cannot determine where to output data to.
+
+    Example:
+        >>> data = "Data I would like to use in my next step"
+        >>> output_to_disk(data, name="my_data")
+
+    Note:
+        Calling :meth:`output_to_disk` multiple times within the same
+        script with the same output ``name`` will overwrite the output.
+        Data output with different names is stored separately, so that
+        receiving steps can get every output on its own. The outputs of
+        a previous execution of the step are removed once the step
+        outputs data for the first time.
+
+    """
+    try:
+        _check_data_name_validity(name)
+    except (ValueError, TypeError) as e:
+        raise error.DataInvalidNameError(e)
+
+    pipeline = _get_pipeline()
+
+    try:
+        step_uuid = get_step_uuid(pipeline)
+    except error.StepUUIDResolveError:
+        raise error.StepUUIDResolveError("Failed to determine where to output data to.")
+
+    compression = _get_disk_compression(pipeline, compression)
+    deduplicate = _get_disk_deduplication(pipeline, deduplicate)
+
+    _clear_previous_outputs(step_uuid)
+
+    if serialization is None and parquet:
+        table = _to_parquet_table(data)
+        if table is not None:
+            data, serialization = table, Serialization.PARQUET
+
+    # In case the data is not already serialized, then we need to
+    # serialize it.
+    if serialization is None:
+        data, serialization = _serialize(data)
+
+    # Recursively create any directories if they do not already exists.
+    step_data_dir = Config.get_step_data_dir(step_uuid)
+    os.makedirs(step_data_dir, exist_ok=True)
+
+    # The HEAD file serves to resolve the transfer method. The full path
+    # is where the actual data is written to.
+    head_file, full_path = _get_output_paths(
+        step_uuid, _get_output_key(step_uuid, name)
+    )
+    _write_head(
+        head_file,
+        serialization,
+        name if name is not None else Config._RESERVED_UNNAMED_OUTPUTS_STR,
+        compression=compression,
+    )
+
+    if deduplicate and serialization != Serialization.PARQUET:
+        return _output_to_blob(
+            data, full_path, serialization=serialization, compression=compression
+        )
+
+    return _output_to_disk(
+        data, full_path, serialization=serialization, compression=compression
+    )
+
+
+def _deserialize_output_disk(
+    full_path: str,
+    serialization: str,
+    compression: Optional[str] = None,
+    columns: Optional[List[str]] = None,
+    filters: Optional[List[Any]] = None,
+    copy: bool = True,
+) -> Any:
+    """Gets data from disk.
+
+    The `columns` and `filters` only apply to the ``PARQUET``
+    serialization. See :func:`get_inputs` for the meaning of `copy`.
+
+    Raises:
+        ValueError: If the serialization argument is unsupported.
+    """
+    file_path = f"{full_path}.{serialization}"
+    if serialization == Serialization.PARQUET.name:
+        return _read_parquet(file_path, columns=columns, filters=filters, copy=copy)
+
+    if compression is not None and (
+        serialization in [Serialization.PICKLE.name, Serialization.PICKLE5_OOB.name]
+        or serialization in _serializers
+    ):
+        # Compressed Arrow streams are decompressed by the stream reader
+        # itself, other data has to be decompressed first.
+        with pa.input_stream(file_path, compression=compression) as input_file:
+            buffer = input_file.read_buffer()
+
+        if serialization == Serialization.PICKLE.name:
+            return pickle.loads(buffer)
+        elif serialization == Serialization.PICKLE5_OOB.name:
+            return _OutOfBandPickle.loads(buffer, copy=copy)
+        return _deserialize_registered(serialization, buffer, copy=copy)
+
+    if serialization == Serialization.ARROW_TABLE.name:
+        # pa.memory_map is for reading (zero-copy)
+        with pa.memory_map(file_path, "rb") as input_file:
+            # read all batches as a table
+            stream = pa.ipc.open_stream(input_file)
+            return stream.read_all()
+    elif serialization == Serialization.ARROW_BATCH.name:
+        with pa.memory_map(file_path, "rb") as input_file:
+            # return the first batch (the only one)
+            stream = pa.ipc.open_stream(input_file)
+            return [b for b in stream][0]
+    elif serialization == Serialization.PANDAS_ARROW.name:
+        with pa.memory_map(file_path, "rb") as input_file:
+            stream = pa.ipc.open_stream(input_file)
+            return _table_to_pandas(stream.read_all(), copy=copy)
+    elif serialization == Serialization.PICKLE.name:
+        # https://docs.python.org/3/library/pickle.html
+        # The argument file must have three methods:
+        # * ``read()`` that takes an integer argument,
+        # * ``readinto()`` that takes a buffer argument,
+        # * ``readline()`` that requires no arguments, similar to the
+        #   ``io.BufferedIOBase`` interface.
+
+        # https://arrow.apache.org/docs/python/generated/pyarrow.MemoryMappedFile.html#pyarrow.MemoryMappedFile
+        # While ``memory_map`` does not support readline, given the
+        # docs, using ``pickle.load`` on a memory mapped file would
+        # work, however, it was safer to not take the risk and use the
+        # normal python file.
+        with open(file_path, "rb") as input_file:
+            return pickle.load(input_file)
+    elif serialization == Serialization.PICKLE5_OOB.name:
+        # Unless the data is copied, the memory map is kept open by the
+        # buffers that are referenced by the deserialized data.
+        input_file = pa.memory_map(file_path, "rb")
+        return _OutOfBandPickle.loads(input_file.read_buffer(), copy=copy)
+    elif serialization in _serializers:
+        input_file = pa.memory_map(file_path, "rb")
+        return _deserialize_registered(
+            serialization, input_file.read_buffer(), copy=copy
+        )
+    else:
+        raise ValueError(
+            f"The specified serialization of '{serialization}' is unsupported."
+        )
+
+
+def _get_output_disk(
+    step_uuid: str,
+    serialization: str,
+    compression: Optional[str] = None,
+    columns: Optional[List[str]] = None,
+    filters: Optional[List[Any]] = None,
+    key: Optional[str] = None,
+    copy: bool = True,
+) -> Any:
+    """Gets data from disk.
+
+    Args:
+        step_uuid: The UUID of the step to get output data from.
+        serialization: The serialization for the output. For possible
+            values see :class:`Serialization`.
+        compression: The codec the output was compressed with, ``None``
+            if it is not compressed.
+        columns: Only read these columns of a ``PARQUET`` output.
+        filters: Only read the rows of a ``PARQUET`` output that match
+            these filters.
+        key: The key of the output, ``None`` for the unnamed output.
+            See :func:`_get_output_key`.
+        copy: If ``False``, then the data can be a read-only view on
+            the memory mapped file, see :func:`get_inputs`.
+
+    Returns:
+        Data from the step identified by `step_uuid`.
+
+    Raises:
+        DiskOutputNotFoundError: If output from `step_uuid` cannot be
+            found.
+        DeserializationError: If the data could not be deserialized.
+    """
+    _, full_path = _get_output_paths(step_uuid, key)
+
+    try:
+        return _deserialize_output_disk(
+            full_path,
+            serialization=serialization,
+            compression=compression,
+            columns=columns,
+            filters=filters,
+            copy=copy,
+        )
+    except FileNotFoundError:
+        # TODO: Ideally we want to provide the user with the step's
+        #       name instead of UUID.
+        raise error.DiskOutputNotFoundError(
+            f'Output from incoming step "{step_uuid}" cannot be found. '
+            "Try rerunning it."
+        )
+    # IOError is to try to catch pyarrow failures on opening the file.
+    except (pickle.UnpicklingError, IOError):
+        raise error.DeserializationError(
+            f'Output from incoming step "{step_uuid}" ({full_path}) '
+            "could not be deserialized."
+        )
+
+
+def _resolve_disk(step_uuid: str) -> List[Dict[str, Any]]:
+    """Returns information of the most recent writes to disk.
+
+    Resolves via the HEAD files the timestamps (that are used to
+    determine the most recent write) and arguments to call the
+    :meth:`get_output_disk` method, for every output of the step.
+
+    Args:
+        step_uuid: The UUID of the step to resolve its most recent
+            writes to disk.
+
+    Returns:
+        List of dictionaries containing the information of the function
+        to be called to get the most recent data of an output of the
+        step. Additionally, returns fill-in arguments for the function
+        and metadata related to the data that would be retrieved.
+
+    Raises:
+        DiskOutputNotFoundError: If output from `step_uuid` cannot be
+            found.
+    """
+    step_data_dir = Config.get_step_data_dir(step_uuid)
+    try:
+        file_names = sorted(os.listdir(step_data_dir))
+    except FileNotFoundError:
+        file_names = []
+
+    res = []
+    for file_name in file_names:
+        if file_name == "HEAD":
+            key = None
+        elif file_name.startswith("HEAD."):
+            key = file_name[len("HEAD.") :]
+        else:
+            continue
+
+        head_file, _ = _get_output_paths(step_uuid, key)
+        try:
+            with open(head_file, "r") as f:
+                timestamp, serialization, name, compression = _interpret_metadata(
+                    f.read()
+                )
+        except (
+            # The output got removed in the meantime.
+            FileNotFoundError,
+            # Might happen in the case a user has metadata produced by a
+            # version of the Orchest-SDK that is incompatible with this
+            # one.
+            error.InvalidMetaDataError,
+        ):
+            continue
+
+        res.append(
+            {
+                "method_to_call": _get_output_disk,
+                "method_args": (step_uuid,),
+                "method_kwargs": {
+                    "serialization": serialization,
+                    "compression": compression,
+                    "key": key,
+                },
+                "metadata": {
+                    "timestamp": timestamp,
+                    "serialization": serialization,
+                    "name": name,
+                },
+            }
+        )
+
+    if not res:
+        # TODO: Ideally we want to provide the user with the step's
+        #       name instead of UUID.
+        raise error.DiskOutputNotFoundError(
+            f'Output from incoming step "{step_uuid}" cannot be found. '
+            "Try rerunning it."
+        )
+
+    return res
+
+
+@contextlib.contextmanager
+def _open_store_usage(usage_file: str) -> Iterator[Dict[str, Any]]:
+    """Opens the usage file of the store with an exclusive lock.
+
+    Yields:
+        The usage, which is written back to the file on exit. E.g.
+        ``{"used": 1024, "reservations": {"<object ID>": {"size": 64,
+        ...}}}``, see :func:`_reserve_store_memory`. The memory-server
+        sets ``"spill"`` if it spills objects to disk.
+
+    Raises:
+        FileNotFoundError: If the usage file does not exist.
+    """
+    with open(usage_file, "r+") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        usage = json.load(f)
+        yield usage
+        f.seek(0)
+        f.truncate()
+        json.dump(usage, f)
+
+
+@contextlib.contextmanager
+def _reserve_store_memory(
+    client: plasma.PlasmaClient, obj_id: plasma.ObjectID, size: int
+) -> Iterator[None]:
+    """Reserves memory in the store to output an object.
+
+    The memory-server keeps count of the memory used by the objects in
+    the store, so that checking whether an object fits does not require
+    listing all objects. The reservation makes sure that concurrent
+    outputs cannot all pass the check and then fail to create their
+    object. It is released by the memory-server once the object is
+    sealed, or on exit if an exception occurred. For as long as the
+    reservation is made, a shared lock is held on its file in
+    ``Config.get_store_reservations_dir()``, so that the memory-server
+    can expire it if the process dies before the object is sealed. The
+    lock is released by the kernel when the process dies, also if it
+    runs in another container than the memory-server.
+
+    If the memory-server spills objects to disk, then it is requested to
+    make room for an object that does not fit, which is waited for at
+    most ``Config.SPILL_TIMEOUT`` seconds. See :func:`_request_spill`.
+
+    Args:
+        client: A PlasmaClient to interface with the in-memory object
+            store.
+        obj_id: The ID of the object to reserve memory for.
+        size: The number of bytes to reserve.
+
+    Raises:
+        MemoryError: If the object does not fit in memory.
+    """
+    # Check whether the object to be passed in memory actually fits in
+    # memory. We check explicitely instead of trying to insert it,
+    # because inserting an already full Plasma store will start evicting
+    # objects to free up space. However, we want to maintain control
+    # over what objects get evicted.
+    # Take a percentage of the maximum capacity such that the message
+    # for object eviction always fits inside the store.
+    store_capacity = Config.MAX_RELATIVE_STORE_CAPACITY * client.store_capacity()
+    usage_file = Config.get_store_usage_file()
+    key = obj_id.binary().hex()
+
+    # Whether the reservation is kept in the usage file. The body is run
+    # outside of the exception handler, so that its exceptions are not
+    # chained to the one of the missing usage file.
+    reserved = True
+    lock_file = None
+    try:
+        deadline = time.monotonic() + Config.SPILL_TIMEOUT
+        spill_requested = False
+        while True:
+            with _open_store_usage(usage_file) as usage:
+                reserved_size = sum(
+                    reservation["size"]
+                    for reservation in usage["reservations"].values()
+                )
+                free_size = store_capacity - usage["used"] - reserved_size
+                if size <= free_size:
+                    lock_file = _lock_reservation(key)
+                    usage["reservations"][key] = {"size": size}
+                    break
+
+                spill = usage.get("spill", False)
+
+            # If the memory-server spills objects to disk, then wait for
+            # it to make room instead of failing right away.
+            if not spill or size > store_capacity or time.monotonic() > deadline:
+                raise MemoryError("Object does not fit in memory")
+
+            if not spill_requested:
+                spill_requested = _request_spill(client, int(size - free_size))
+            time.sleep(Config.SPILL_POLL_INTERVAL)
+
+    except (FileNotFoundError, ValueError, KeyError):
+        # No memory-server keeps count of the used memory, e.g. because
+        # the store was started on its own.
+        reserved = False
+
+    if not reserved:
+        occupied_size = sum(
+            obj["data_size"] + obj["metadata_size"] for obj in client.list().values()
+        )
+        if size > store_capacity - occupied_size:
+            raise MemoryError("Object does not fit in memory")
+
+        yield
+        return
+
+    try:
+        yield
+    except BaseException:
+        with _open_store_usage(usage_file) as usage:
+            usage["reservations"].pop(key, None)
+        raise
+    finally:
+        _unlock_reservation(lock_file)
+
+
+def _lock_reservation(key: str) -> IO:
+    """Locks the file of a reservation of memory in the store.
+
+    The lock is shared, since multiple processes can reserve memory for
+    the same object, e.g. when a step is run concurrently. The
+    memory-server considers the reservation to be in use for as long as
+    any of them holds the lock.
+
+    Args:
+        key: The (hex) ID of the object the memory is reserved for.
+
+    Returns:
+        The opened file, which holds the lock until it is closed.
+
+    Raises:
+        FileNotFoundError: If the directory of reservations does not
+            exist, i.e. no memory-server keeps count of the used memory.
+    """
+    lock_file = open(os.path.join(Config.get_store_reservations_dir(), key), "a")
+    fcntl.flock(lock_file, fcntl.LOCK_SH)
+    return lock_file
+
+
+def _unlock_reservation(lock_file: Optional[IO]) -> None:
+    """Releases the lock of a reservation, see :func:`_lock_reservation`.
+
+    The file itself is removed by the memory-server, since it could
+    still be locked by another process.
+    """
+    if lock_file is not None:
+        lock_file.close()
+
+
+def _send_control_message(identifier: int, parts: List[str]) -> bool:
+    """Sends a message over the control channel of the memory-server.
+
+    The channel is a Unix datagram socket, thus messages for eviction
+    and spilling do not have to be put in the store. The parts of the
+    message are separated by ``";"``, e.g.
+    ``b"2;uuid-1,uuid-3;uuid-2,uuid-3"``, and split over multiple
+    datagrams if they do not fit in ``Config.CONTROL_MESSAGE_MAX_SIZE``
+    bytes. The memory-server processes all pending datagrams at once.
+
+    Args:
+        identifier: The identifier of the message, e.g.
+            ``Config.IDENTIFIER_EVICTION``.
+        parts: The parts of the message.
+
+    Returns:
+        Whether the message was sent, which is not the case if no
+        memory-server listens on the control socket.
+    """
+    prefix = str(identifier).encode("utf-8")
+    max_size = Config.CONTROL_MESSAGE_MAX_SIZE
+    messages = []
+    message = prefix
+    for part in parts:
+        part = b";" + part.encode("utf-8")
+        if message != prefix and len(message) + len(part) > max_size:
+            messages.append(message)
+            message = prefix
+        message += part
+    messages.append(message)
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sock:
+            sock.settimeout(Config.REQUEST_TIMEOUT)
+            for message in messages:
+                sock.sendto(message, Config.get_control_socket())
+    except OSError:
+        return False
+
+    return True
+
+
+def _request_spill(client: plasma.PlasmaClient, size: int) -> bool:
+    """Requests the memory-server to spill objects to disk.
+
+    The memory-server does so if the ``data_passing_memory_spill``
+    setting of the pipeline is enabled. Objects of which all receiving
+    steps have read them are spilled first, then the least recently used
+    ones. A spilled object is written to the data directory of its step,
+    just like :func:`output_to_disk` would, and then deleted from the
+    store.
+
+    The request states the number of bytes to free, e.g. ``b"4;1024"``,
+    and is sent over the control channel, see
+    :func:`_send_control_message`. If the channel is unavailable, then
+    the request is an empty object with the message as metadata. It
+    bypasses the reservation of memory, since the store is full, and
+    fits in the part of the store that is kept free for such messages.
+
+    Args:
+        client: A PlasmaClient to interface with the in-memory object
+            store.
+        size: The number of bytes to free.
+
+    Returns:
+        Whether the request was sent.
+    """
+    if _send_control_message(Config.IDENTIFIER_SPILL, [str(size)]):
+        return True
+
+    empty_obj, _ = _serialize("")
+    metadata = bytes(f"{Config.IDENTIFIER_SPILL};{size}", "utf-8")
+    obj_id = plasma.ObjectID.from_random()
+    try:
+        buffer = client.create(obj_id, empty_obj.size, metadata=metadata)
+        _write_serialized(empty_obj, pa.FixedSizeBufferWriter(buffer))
+        client.seal(obj_id)
+    except (pa.ArrowException, OSError):
+        return False
+
+    return True
+
+
+def _replace_object(
+    client: plasma.PlasmaClient,
+    obj_id: plasma.ObjectID,
+    data_size: int,
+    metadata: Optional[bytes] = None,
+) -> pa.Buffer:
+    """Deletes an existing object and creates it again.
+
+    The store defers the deletion of an object while other clients use
+    it, e.g. a receiving step that reads it or the memory-server that
+    reads its metadata. Creating the object is therefore retried for at
+    most ``Config.OBJECT_REPLACE_TIMEOUT`` seconds.
+
+    Returns:
+        A mutable buffer to write the data of the object into.
+
+    Raises:
+        MemoryError: If the object is still used after the timeout, in
+            which case it cannot be output to memory.
+    """
+    deadline = time.monotonic() + Config.OBJECT_REPLACE_TIMEOUT
+    delay = 0.01
+    while True:
+        client.delete([obj_id])
+        try:
+            return client.create(obj_id, data_size, metadata=metadata)
+        except plasma.PlasmaObjectExists:
+            if time.monotonic() > deadline:
+                raise MemoryError("Object is in use and cannot be replaced.")
+
+        time.sleep(delay)
+        delay = min(2 * delay, 0.1)
+
+
+def _output_to_memory(
+    obj: Union[pa.Buffer, _MultipartBuffer],
+    client: plasma.PlasmaClient,
+    obj_id: Optional[plasma.ObjectID] = None,
+    metadata: Optional[bytes] = None,
+    memcopy_threads: int = 6,
+) -> plasma.ObjectID:
+    """Outputs an object to memory.
+
+    Args:
+        obj: Object to output to memory.
+        client: A PlasmaClient to interface with the in-memory object
+            store.
+        obj_id: The ID to assign to the `obj` inside the plasma store.
+            If ``None`` then one is randomly generated.
+        metadata: Metadata to add to the `obj` inside the store.
+        memcopy_threads: The number of threads to use to write the
+            `obj` into the object store for large objects.
+
+    Returns:
+        The ID of the object inside the store. Either the given `obj_id`
+        or a randomly generated one.
+
+    Raises:
+        MemoryError: If the `obj` does not fit in memory, or if an
+            object with the same ID is in use, see
+            :func:`_replace_object`.
+    """
+    # obj.size -> "The buffer size in bytes."
+    total_size = obj.size
+    if metadata is not None:
+        total_size += len(metadata)
+
+    # In case no `obj_id` is specified, one has to be generated because
+    # an ID is required for an object to be inserted in the store.
+    if obj_id is None:
+        obj_id = plasma.ObjectID.from_random()
+
+    with _reserve_store_memory(client, obj_id, total_size):
+        # Write the object to the plasma store. If the obj_id already
+        # exists, then it first has to be deleted. Essentially we are
+        # overwriting the data (just like we do for disk)
+        try:
+            buffer = client.create(obj_id, obj.size, metadata=metadata)
+        except plasma.PlasmaObjectExists:
+            buffer = _replace_object(client, obj_id, obj.size, metadata)
+
+        stream = pa.FixedSizeBufferWriter(buffer)
+        stream.set_memcopy_threads(memcopy_threads)
+
+        _write_serialized(obj, stream)
+        client.seal(obj_id)
+
+    return obj_id
+
+
+def _interpret_manifest(metadata: Optional[pa.Buffer]) -> List[str]:
+    """Returns the names listed in the metadata of a manifest object.
+
+    The names that a step has output to memory are listed, as JSON, in
+    the metadata of its manifest object. For example:
+    ``b'3;["name-1", "name-2"]'``. An empty list is returned if the
+    manifest does not exist or is invalid.
+    """
+    if metadata is None:
+        return []
+
+    _, _, names = metadata.to_pybytes().decode("utf-8").partition(";")
+    try:
+        return json.loads(names)
+    except ValueError:
+        return []
+
+
+def _add_to_manifest(step_uuid: str, name: str, client: plasma.PlasmaClient) -> None:
+    """Adds the name of an output to the manifest of the step.
+
+    See :func:`_interpret_manifest`.
+
+    Raises:
+        MemoryError: If the manifest does not fit in memory, or if it
+            cannot be replaced because other clients still use it.
+    """
+    # NOTE: the metadata buffer is not kept around, because a referenced
+    # object cannot be overwritten.
+    manifest_id = _get_manifest_object_id(step_uuid)
+    with _outputs_lock:
+        names = _interpret_manifest(client.get_metadata([manifest_id], timeout_ms=0)[0])
+        if name in names:
+            return
+
+        names.append(name)
+        metadata = bytes(f"{Config.IDENTIFIER_MANIFEST};{json.dumps(names)}", "utf-8")
+        empty_obj, _ = _serialize("")
+        _output_to_memory(empty_obj, client, obj_id=manifest_id, metadata=metadata)
+
+
+def output_to_memory(
+    data: Any, name: Optional[str], disk_fallback: bool = True
+) -> None:
+    """Outputs data to memory.
+
+    To manage outputing the data to memory for the user, this function
+    uses metadata to add info to objects inside the plasma store.
+
+    Args:
+        data: Data to output.
+        name: Name of the output data. As a string, it becomes the name
+            of the data, when ``None``, the data is considered nameless.
+            This affects the way the data can be later retrieved using
+            :func:`get_inputs`.
+        disk_fallback: If ``True``, then outputing to disk is used when
+            the `data` does not fit in memory. If ``False``, then a
+            :exc:`MemoryError` is thrown.
+
+    Raises:
+        DataInvalidNameError: The name of the output data is invalid,
+            e.g because it is a reserved name (``"unnamed"``) or because
+            it contains a reserved substring.
+        MemoryError: If the `data` does not fit in memory and
+            ``disk_fallback=False``.
+        OrchestNetworkError: Could not connect to the
+            ``Config.STORE_SOCKET_NAME``, because it does not exist.
+            Which might be because the specified value was wrong or the
+            store died.
+        PipelineDefinitionNotFoundError: If the pipeline definition file
+            could not be found.
+        StepUUIDResolveError: The step's UUID cannot be resolved and
+            thus it cannot set the correct ID to identify the data in
+            the memory store.
+
+    Example:
+        >>> data = "Data I would like to use in my next step"
+        >>> output_to_memory(data, name="my_data")
+
+    Note:
+        Calling :meth:`output_to_memory` multiple times within the same
+        script with the same output ``name`` will overwrite the output.
+        Data output with different names is stored as separate objects,
+        which are evicted independently once all receiving steps have
+        read them. The outputs of a previous execution of the step are
+        removed once the step outputs data for the first time.
+
+    """
+    try:
+        _check_data_name_validity(name)
+    except (ValueError, TypeError) as e:
+        raise error.DataInvalidNameError(e)
+
+    pipeline = _get_pipeline()
+
+    try:
+        step_uuid = get_step_uuid(pipeline)
+    except error.StepUUIDResolveError:
+        raise error.StepUUIDResolveError("Failed to determine where to output data to.")
+
+    _clear_previous_outputs(step_uuid)
+
+    # Serialize the object and collect the serialization metadata.
+    obj, serialization = _serialize(data)
+
+    try:
+        client = _PlasmaConnector().client
+    except error.OrchestNetworkError as e:
+        if not disk_fallback:
+            raise error.OrchestNetworkError(e)
+
+        return output_to_disk(obj, name, serialization=serialization)
+
+    # Try to output to memory.
+    obj_id = _convert_uuid_to_object_id(step_uuid, name)
+    metadata = [
+        str(Config.IDENTIFIER_SERIALIZATION),
+        # The plasma store allows to get the creation timestamp, but
+        # creating it this way makes the process more consistent with
+        # the metadata we are writing when outputting to disk, moreover,
+        # it makes the code less dependent on the plasma store API.
+        datetime.utcnow().isoformat(timespec="seconds"),
+        serialization.name,
+        # Can't simply assign to name beforehand because name might be
+        # passed to output_to_disk, which needs to check for name
+        # validity itself since its a public function.
+        name if name is not None else Config._RESERVED_UNNAMED_OUTPUTS_STR,
+    ]
+    metadata = bytes(Config.__METADATA_SEPARATOR__.join(metadata), "utf-8")
+
+    try:
+        # Add the name to the manifest first, so that the output can be
+        # found as soon as it is sealed.
+        if name is not None:
+            _add_to_manifest(step_uuid, name, client)
+
+        obj_id = _output_to_memory(obj, client, obj_id=obj_id, metadata=metadata)
+
+    except MemoryError:
+        if not disk_fallback:
+            raise MemoryError("Data does not fit in memory.")
+
+        # The memory-server counts the outputs that did not fit in its
+        # metrics, which helps to choose the size of the store.
+        _send_control_message(Config.IDENTIFIER_DISK_FALLBACK, [str(obj.size)])
+
+        # TODO: note that metadata is lost when falling back to disk.
+        #       Therefore we will only support metadata added by the
+        #       user, once disk also supports passing metadata.
+        return output_to_disk(obj, name, serialization=serialization)
+
+    return
+
+
+def _deserialize_output_memory(
+    metadata: pa.Buffer, buffer: pa.Buffer, copy: bool = True
+) -> Any:
+    """Deserializes data that was retrieved from memory.
+
+    Args:
+        metadata: The metadata of the object as it was stored in the
+            plasma store.
+        buffer: The buffer of the object as it was stored in the plasma
+            store.
+        copy: If ``False``, then the data can be a read-only view on
+            the `buffer`, see :func:`get_inputs`.
+
+    Returns:
+        The unserialized data.
+
+    Raises:
+        ValueError: If the serialization type in the metadata is not
+            valid.
+    """
+    metadata = metadata.to_pybytes().decode("utf-8")
+    _, serialization, _, _ = _interpret_metadata(metadata)
+
+    if serialization == Serialization.ARROW_TABLE.name:
+        # Read all batches as a table.
+        stream = pa.ipc.open_stream(buffer)
+        return stream.read_all()
+
+    elif serialization == Serialization.ARROW_BATCH.name:
+        # Return the first batch (the only one).
+        stream = pa.ipc.open_stream(buffer)
+        return [b for b in stream][0]
+
+    elif serialization == Serialization.PANDAS_ARROW.name:
+        stream = pa.ipc.open_stream(buffer)
+        return _table_to_pandas(stream.read_all(), copy=copy)
+
+    elif serialization == Serialization.PICKLE.name:
+        # Can load the buffer directly because its a bytes-like-object:
+        # https://docs.python.org/3/library/pickle.html#pickle.loads
+        return pickle.loads(buffer)
+
+    elif serialization == Serialization.PICKLE5_OOB.name:
+        # Unless copied, the out-of-band buffers are views on the plasma
+        # buffer.
+        return _OutOfBandPickle.loads(buffer, copy=copy)
+
+    elif serialization in _serializers:
+        return _deserialize_registered(serialization, buffer, copy=copy)
+    else:
+        raise ValueError("Object was serialized with an unsupported serialization")
+
+
+def _notify_eviction(
+    outputs: List[Tuple[str, plasma.ObjectID]],
+    consumer: Optional[str],
+    client: plasma.PlasmaClient,
+) -> None:
+    """Notifies the memory-server that outputs have been consumed.
+
+    A single message lists all the (source, target) pairs, which is
+    used by the memory-server to manage eviction of objects. For
+    example: ``b"2;uuid-1,uuid-3;uuid-2,uuid-3"``. Pairs of named
+    outputs also contain the ID of the object, in hexadecimal, e.g.
+    ``b"2;uuid-1,uuid-3,<object ID>"``.
+
+    The message is sent over the control channel of the memory-server,
+    see :func:`_send_control_message`. If the channel is unavailable,
+    then an empty object is put inside the store with the message as
+    metadata, which triggers a notification in the store instead.
+
+    Args:
+        outputs: The UUIDs of the steps whose output was consumed
+            together with the IDs of the consumed objects.
+        consumer: The UUID of the consuming step. If ``None``, then no
+            notification is sent.
+        client: A PlasmaClient to interface with the in-memory object
+            store.
+    """
+    # NOTE: the "ORCHEST_MEMORY_EVICTION" ENV variable is set in the
+    # orchest-api. Now we always know when we are running inside a
+    # jupyter kernel interactively. And in that case we never want
+    # to do eviction. Without a `consumer` the outputs are not consumed
+    # yet, e.g. when prefetching the inputs of a step.
+    if os.getenv("ORCHEST_MEMORY_EVICTION") is None or not outputs:
+        return
+    if consumer is None:
+        return
+
+    pairs = []
+    for step_uuid, obj_id in outputs:
+        if obj_id == _convert_uuid_to_object_id(step_uuid):
+            pairs.append(f"{step_uuid},{consumer}")
+        else:
+            pairs.append(f"{step_uuid},{consumer},{obj_id.binary().hex()}")
+
+    if _send_control_message(Config.IDENTIFIER_EVICTION, pairs):
+        return
+
+    # TODO: note somewhere (maybe in the docstring) that it might
+    #       although very unlikely raise MemoryError, because the
+    #       receive is now actually also outputing data.
+    empty_obj, _ = _serialize("")
+    msg = ";".join([str(Config.IDENTIFIER_EVICTION)] + pairs)
+    metadata = bytes(msg, "utf-8")
+    _output_to_memory(empty_obj, client, metadata=metadata)
+
+
+def _get_outputs_memory(
+    outputs: List[Tuple[str, plasma.ObjectID]],
+    consumer: Optional[str] = None,
+    copy: bool = True,
+) -> Dict[Tuple[str, plasma.ObjectID], Any]:
+    """Gets outputs from memory in one batch.
+
+    All objects are retrieved from the store through a single call and
+    only one eviction notification is sent for all of them.
+
+    Args:
+        outputs: The UUIDs of the steps to get output data from together
+            with the IDs of the objects of the outputs.
+        consumer: The consumer of the output data. This is put inside
+            the metadata of an empty object to trigger a notification in
+            the plasma store, which is then used to manage eviction of
+            objects.
+        copy: If ``False``, then the data can be a read-only view on
+            the memory of the store, see :func:`get_inputs`.
+
+    Returns:
+        Dictionary mapping the elements of `outputs` to their data.
+        Outputs that could not be found in the store are not included.
+
+    Raises:
+        DeserializationError: If the data could not be deserialized.
+        OrchestNetworkError: Could not connect to the
+            ``Config.STORE_SOCKET_NAME``, because it does not exist.
+            Which might be because the specified value was wrong or the
+            store died.
+    """
+    client = _PlasmaConnector().client
+
+    obj_ids = [obj_id for _, obj_id in outputs]
+    buffers = client.get_buffers(obj_ids, with_meta=True, timeout_ms=1000)
+
+    data = {}
+    for (step_uuid, obj_id), (metadata, buffer) in zip(outputs, buffers):
+        # Getting the buffer timed out. We conclude that the object has
+        # not yet been written to the store and maybe never will.
+        if metadata is None and buffer is None:
+            continue
+
+        try:
+            data[(step_uuid, obj_id)] = _deserialize_output_memory(
+                metadata, buffer, copy=copy
+            )
+        # IOError is to try to catch pyarrow deserialization errors.
+        except (pickle.UnpicklingError, IOError, error.InvalidMetaDataError):
+            raise error.DeserializationError(
+                f'Output from incoming step "{step_uuid}" could not be deserialized.'
+            )
+
+    _notify_eviction(list(data.keys()), consumer, client)
+
+    return data
+
+
+def _get_output_memory(
+    step_uuid: str,
+    obj_id: Optional[plasma.ObjectID] = None,
+    consumer: Optional[str] = None,
+    copy: bool = True,
+) -> Any:
+    """Gets data from memory.
+
+    Args:
+        step_uuid: The UUID of the step to get output data from.
+        obj_id: The ID of the object of the output. If ``None``, then
+            the unnamed output of the step is retrieved.
+        consumer: The consumer of the output data. This is put inside
+            the metadata of an empty object to trigger a notification in
+            the plasma store, which is then used to manage eviction of
+            objects.
+        copy: See :func:`_get_outputs_memory`.
+
+    Returns:
+        Data from step identified by `step_uuid`.
+
+    Raises:
+        DeserializationError: If the data could not be deserialized.
+        MemoryOutputNotFoundError: If output from `step_uuid` cannot be
+            found.
+        OrchestNetworkError: Could not connect to the
+            ``Config.STORE_SOCKET_NAME``, because it does not exist.
+            Which might be because the specified value was wrong or the
+            store died.
+    """
+    if obj_id is None:
+        obj_id = _convert_uuid_to_object_id(step_uuid)
+
+    data = _get_outputs_memory([(step_uuid, obj_id)], consumer=consumer, copy=copy)
+
+    try:
+        return data[(step_uuid, obj_id)]
+    except KeyError:
+        pass
+
+    try:
+        return _get_spilled_output(step_uuid, obj_id, copy=copy)
+    except error.DiskOutputNotFoundError:
+        raise error.MemoryOutputNotFoundError(
+            f'Output from incoming step "{step_uuid}" cannot be found. '
+            "Try rerunning it."
+        )
+
+
+def _get_spilled_output(
+    step_uuid: str, obj_id: plasma.ObjectID, copy: bool = True
+) -> Any:
+    """Gets an output that was spilled from memory to disk.
+
+    An object can be spilled by the memory-server (see
+    :func:`_request_spill`) after it was resolved to be in memory, but
+    before it was retrieved.
+
+    Args:
+        step_uuid: The UUID of the step to get output data from.
+        obj_id: The ID of the object of the output in memory.
+        copy: See :func:`_get_output_disk`.
+
+    Returns:
+        Data from the step identified by `step_uuid`.
+
+    Raises:
+        DeserializationError: If the data could not be deserialized.
+        DiskOutputNotFoundError: If the output is not on disk.
+    """
+    key, serialization, compression = _get_spilled_metadata(step_uuid, obj_id)
+    return _get_output_disk(
+        step_uuid, serialization, compression=compression, key=key, copy=copy
+    )
+
+
+def _get_spilled_metadata(
+    step_uuid: str, obj_id: plasma.ObjectID
+) -> Tuple[Optional[str], str, Optional[str]]:
+    """Gets the metadata of an output that was spilled to disk.
+
+    Args:
+        step_uuid: The UUID of the step that output the data.
+        obj_id: The ID of the object of the output in memory.
+
+    Returns:
+        The key of the output on disk (see :func:`_get_output_paths`),
+        its serialization and its compression.
+
+    Raises:
+        DiskOutputNotFoundError: If the output is not on disk.
+    """
+    key = None
+    if obj_id != _convert_uuid_to_object_id(step_uuid):
+        key = obj_id.binary().hex()
+
+    head_file, _ = _get_output_paths(step_uuid, key)
+    try:
+        with open(head_file, "r") as f:
+            _, serialization, _, compression = _interpret_metadata(f.read())
+    except (FileNotFoundError, error.InvalidMetaDataError):
+        raise error.DiskOutputNotFoundError(
+            f'Output from incoming step "{step_uuid}" cannot be found. '
+            "Try rerunning it."
+        )
+
+    return key, serialization, compression
+
+
+def _resolve_memory_batch(
+    step_uuids: List[str], consumer: str = None
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Returns information of the most recent writes to memory.
+
+    Same as :func:`_resolve_memory`, but the metadata of all the given
+    steps is retrieved from the store through a single call, plus one
+    call for the named outputs.
+
+    Args:
+        step_uuids: The UUIDs of the steps to resolve their most recent
+            writes to memory.
+        consumer: See :func:`_resolve_memory`.
+
+    Returns:
+        Dictionary mapping the UUID of a step to the information as
+        returned by :func:`_resolve_memory`. Steps without (valid)
+        output in memory are not included.
+
+    Raises:
+        OrchestNetworkError: Could not connect to the
+            ``Config.STORE_SOCKET_NAME``, because it does not exist.
+            Which might be because the specified value was wrong or the
+            store died.
+    """
+    client = _PlasmaConnector().client
+
+    # The unnamed outputs are retrieved together with the manifests of
+    # the steps, which list their named outputs.
+    obj_ids = [_convert_uuid_to_object_id(step_uuid) for step_uuid in step_uuids]
+    manifest_ids = [_get_manifest_object_id(step_uuid) for step_uuid in step_uuids]
+
+    # Get metadata of the objects if they exist.
+    metadatas = client.get_metadata(obj_ids + manifest_ids, timeout_ms=0)
+    outputs = list(zip(step_uuids, obj_ids, metadatas[: len(step_uuids)]))
+
+    named_outputs = []
+    for step_uuid, manifest in zip(step_uuids, metadatas[len(step_uuids) :]):
+        named_outputs.extend(
+            (step_uuid, _convert_uuid_to_object_id(step_uuid, name))
+            for name in _interpret_manifest(manifest)
+        )
+
+    if named_outputs:
+        metadatas = client.get_metadata(
+            [obj_id for _, obj_id in named_outputs], timeout_ms=0
+        )
+        outputs.extend(
+            (step_uuid, obj_id, metadata)
+            for (step_uuid, obj_id), metadata in zip(named_outputs, metadatas)
+        )
+
+    res = defaultdict(list)
+    for step_uuid, obj_id, metadata in outputs:
+        if metadata is None:
+            continue
+
+        # This is a pyarrow.Buffer, gotta make it into pybytes to
+        # decode, not much overhead given that this is just metadata.
+        metadata = metadata.to_pybytes()
+        try:
+            metadata = _interpret_metadata(metadata.decode("utf-8"))
+        except error.InvalidMetaDataError:
+            # Might happen in the case a user has metadata produced by a
+            # version of the Orchest-SDK that is incompatible with this
+            # one.
+            continue
+        timestamp, serialization, name, _ = metadata
+
+        res[step_uuid].append(
+            {
+                "method_to_call": _get_output_memory,
+                "method_args": (step_uuid, obj_id),
+                "method_kwargs": {"consumer": consumer},
+                "metadata": {
+                    "timestamp": timestamp,
+                    "serialization": serialization,
+                    "name": name,
+                },
+            }
+        )
+
+    return dict(res)
+
+
+def _resolve_memory(step_uuid: str, consumer: str = None) -> List[Dict[str, Any]]:
+    """Returns information of the most recent writes to memory.
+
+    Resolves the timestamps via the metadata of the objects inside the
+    plasma store, for every output of the step. It also sets the
+    arguments to call the :func:`get_output_memory` method with.
+
+    Args:
+        step_uuid: The UUID of the step to resolve its most recent
+            writes to memory.
+        consumer: The consumer of the output data. This is put inside
+            the metadata of an empty object to trigger a notification in
+            the plasma store, which is then used to manage eviction of
+            objects.
+
+    Returns:
+        List of dictionaries containing the information of the function
+        to be called to get the most recent data of an output of the
+        step. Additionally, returns fill-in arguments for the function
+        and metadata related to the data that would be retrieved.
+
+    Raises:
+        MemoryOutputNotFoundError: If output from `step_uuid` cannot be
+            found.
+        OrchestNetworkError: Could not connect to the
+            ``Config.STORE_SOCKET_NAME``, because it does not exist.
+            Which might be because the specified value was wrong or the
+            store died.
+    """
+    res = _resolve_memory_batch([step_uuid], consumer=consumer)
+
+    try:
+        return res[step_uuid]
+    except KeyError:
+        raise error.MemoryOutputNotFoundError(
+            f'Output from incoming step "{step_uuid}" cannot be found. '
+            "Try rerunning it."
+        )
+
+
+def _resolve_batch(
+    step_uuids: List[str], consumer: str = None
+) -> List[List[Tuple[Callable, Sequence[Any], Dict[str, Any], Dict[str, Any]]]]:
+    """Resolves the most recently used tranfer methods of given steps.
+
+    Additionally, resolves all the ``*args`` and ``**kwargs`` the
+    receiving transfer method has to be called with. The memory store
+    is queried only once for all the steps.
+
+    Args:
+        step_uuids: UUIDs of the steps to resolve their most recent
+            writes.
+        consumer: The consumer of the output data. This is put inside
+            the metadata of an empty object to trigger a notification in
+            the plasma store, which is then used to manage eviction of
+            objects.
+
+    Returns:
+        List, in the same order as the `step_uuids`, of lists with a
+        tuple per output name of the step. A tuple contains the
+        information of the function to be called to get the most recent
+        data of the output. Additionally, the tuple contains fill-in
+        arguments for the function and metadata related to the data that
+        would be retrieved. The list is empty if no output can be found
+        of the step. Either no output was generated or the in-memory
+        object store died (and therefore lost all its data).
+    """
+    try:
+        memory_infos = _resolve_memory_batch(step_uuids, consumer=consumer)
+    except error.OrchestNetworkError:
+        # If no in-memory store is running, then getting the data from
+        # memory obviously will not work.
+        memory_infos = {}
+
+    resolved = []
+    for step_uuid in step_uuids:
+        # NOTE: the order of this list matters. It is used to resolve
+        # what "get_output_..." method to invoke in case of equal
+        # timestamps.
+        method_infos = list(memory_infos.get(step_uuid, []))
+
+        try:
+            method_infos.extend(_resolve_disk(step_uuid))
+        except error.OutputNotFoundError:
+            # We know now that the user did not use this method to
+            # output thus we can just skip it and continue.
+            pass
+
+        # Per output name, get the method that was most recently used
+        # based on its logged timestamp.
+        # NOTE: if multiple methods have the same timestamp then the
+        # method that is highest in the `method_infos` list will be
+        # returned.
+        most_recent = {}
+        for method_info in method_infos:
+            name = method_info["metadata"]["name"]
+            if (
+                name not in most_recent
+                or method_info["metadata"]["timestamp"]
+                > most_recent[name]["metadata"]["timestamp"]
+            ):
+                most_recent[name] = method_info
+
+        resolved.append(
+            [
+                (
+                    method_info["method_to_call"],
+                    method_info["method_args"],
+                    method_info["method_kwargs"],
+                    method_info["metadata"],
+                )
+                for method_info in most_recent.values()
+            ]
+        )
+
+    return resolved
+
+
+def _resolve(
+    step_uuid: str, consumer: str = None
+) -> List[Tuple[Callable, Sequence[Any], Dict[str, Any], Dict[str, Any]]]:
+    """Resolves the most recently used tranfer methods of a step.
+
+    Additionally, resolves all the ``*args`` and ``**kwargs`` the
+    receiving transfer method has to be called with.
+
+    Args:
+        step_uuid: UUID of the step to resolve its most recent writes.
+        consumer: The consumer of the output data. This is put inside
+            the metadata of an empty object to trigger a notification in
+            the plasma store, which is then used to manage eviction of
+            objects.
+
+    Returns:
+        List with a tuple per output name of the step, see
+        :func:`_resolve_batch`.
+
+    Raises:
+        OutputNotFoundError: If no output can be found of the given
+            `step_uuid`. Either no output was generated or the in-memory
+            object store died (and therefore lost all its data).
+    """
+    resolved = _resolve_batch([step_uuid], consumer=consumer)[0]
+    if not resolved:
+        raise error.OutputNotFoundError(
+            "Output could not be found in memory or on disk."
+        )
+
+    return resolved
+
+
+def get_inputs(
+    ignore_failure: bool = False,
+    verbose: bool = False,
+    max_workers: Optional[int] = None,
+    columns: Optional[Dict[str, List[str]]] = None,
+    filters: Optional[Dict[str, List[Any]]] = None,
+    lazy: bool = False,
+    names: Optional[List[str]] = None,
+    copy: bool = True,
+) -> Union[Dict[str, Any], "LazyInputs"]:
+    """Gets all data sent from incoming steps.
+
+    Args:
+        ignore_failure: If ``True`` then the returned result can have
+            ``None`` values if the data of a step could not be
+            retrieved. If ``False``, then this function will fail if any
+            of the incoming steps's data could not be retrieved.
+            Example: ``[None, "Hello World!"]`` vs
+            :exc:`OutputNotFoundError`
+        verbose: If ``True`` print all the steps from which the current
+            step has retrieved data.
+        max_workers: If given, the data that incoming steps have output
+            to disk is read and deserialized concurrently by a pool of
+            at most `max_workers` threads. Useful when getting multiple
+            large outputs from disk. The returned result is the same as
+            when reading sequentially.
+        columns: Mapping from the name of input data to the list of
+            columns to read, e.g. ``{"features": ["age", "income"]}``.
+        filters: Mapping from the name of input data to the filters
+            that rows have to match, in the format of
+            ``pyarrow.parquet.read_table``, e.g.
+            ``{"features": [("age", ">", 18)]}``. Row groups that cannot
+            contain matching rows are not read at all. Both `columns`
+            and `filters` only apply to data that was output to disk
+            with ``parquet=True``, see :func:`output_to_disk`. Other
+            data is always returned in full.
+        lazy: If ``True``, then a :class:`LazyInputs` mapping is
+            returned instead of a dictionary. Its values are only
+            retrieved (and thereby considered received for the purpose
+            of auto eviction) when they are accessed for the first time.
+        names: If given, only the data with these names is retrieved,
+            use ``"unnamed"`` to retrieve the unnamed data. Data of
+            other incoming steps is skipped and counts as received for
+            the purpose of auto eviction.
+        copy: If ``False``, then data is not copied out of the memory
+            store or out of memory mapped files where possible. The
+            returned NumPy arrays, including the ones inside other
+            objects and the columns of DataFrames, are then read-only
+            views and trying to modify them raises a ``ValueError``.
+            Useful to avoid copying large inputs that are only read.
+
+    Returns:
+        Dictionary with input data for this step. We differentiate
+        between two cases:
+
+        * Named data, which is data that was outputted with a `name` by
+          any parent step. Named data can be retrieved through the
+          dictionary by its name, e.g.
+          ``data = get_inputs()["my_name"]``.  Name collisions will
+          raise an :exc:`InputNameCollisionError`.
+        * Unnamed data, which is an ordered list containing all the
+          data that was outputted without a name by the parent steps.
+          Unnamed data can be retrieved by accessing the reserved
+          ``"unnamed"`` key. The order of this list depends on the order
+          of the parent steps of the node, which is visible through the
+          GUI, refer to the :ref:`connections section <connections>`.
+
+        Example::
+
+            # It does not matter how the data was outputted by parent
+            # steps. It is resolved automatically by the `get_inputs`
+            # method.
+            {
+                "unnamed" : ["Hello World!", (3, 4)],
+                "named_1" : "mystring",
+                "named_2" : [1, 2, 3]
+            }
+
+    Raises:
+        InputNameCollisionError: Multiple steps have outputted data with
+            the same name.
+        OutputNotFoundError: If no output can be found of the given
+            `step_uuid`. Either no output was generated or the in-memory
+            object store died (and therefore lost all its data). Or if
+            no incoming step has output data with one of the `names`.
+        StepUUIDResolveError: The step's UUID cannot be resolved and
+            thus it cannot determine what inputs to get.
+
+    Warning:
+        Only call :meth:`get_inputs` once! When auto eviction is
+        configured data might no longer be available. Either cache the
+        data or maintain a copy yourself.
+
+    """
+    pipeline = _get_pipeline()
+    try:
+        step_uuid = get_step_uuid(pipeline)
+    except error.StepUUIDResolveError:
+        raise error.StepUUIDResolveError("Failed to determine from where to get data.")
+
+    if (
+        not ignore_failure
+        and not verbose
+        and columns is None
+        and filters is None
+        and not lazy
+        and names is None
+        and copy
+    ):
+        data = _take_prefetched_inputs(step_uuid)
+        if data is not None:
+            return data
+    else:
+        _release_prefetched_inputs()
+
+    get_output_methods = _resolve_inputs(pipeline, step_uuid, names)
+
+    # Pass the projection and filters on to the Parquet reader.
+    for _, _, _, kwargs, metadata in get_output_methods:
+        if metadata["serialization"] != Serialization.PARQUET.name:
+            continue
+
+        name = metadata["name"]
+        if columns is not None and name in columns:
+            kwargs["columns"] = columns[name]
+        if filters is not None and name in filters:
+            kwargs["filters"] = filters[name]
+
+    if lazy:
+        return LazyInputs(
+            get_output_methods, step_uuid, ignore_failure, verbose, max_workers, copy
+        )
+
+    return _get_inputs(
+        get_output_methods, step_uuid, ignore_failure, verbose, max_workers, copy
+    )
+
+
+def _resolve_inputs(
+    pipeline: Pipeline, step_uuid: str, names: Optional[List[str]] = None
+) -> List[Tuple[PipelineStep, Callable, Sequence[Any], Dict, Dict]]:
+    """Resolves the output methods to get the inputs of a step with.
+
+    See :func:`get_inputs` for the meaning of the arguments.
+
+    Returns:
+        The incoming steps together with the method, arguments and
+        metadata to get their output data with, in order.
+
+    Raises:
+        InputNameCollisionError: Multiple steps have outputs with the
+            same name.
+        OutputNotFoundError: If no output can be found of one of the
+            incoming steps or of one of the `names`.
+    """
+    collisions_dict = defaultdict(list)
+    get_output_methods = []
+
+    # For each parent get what function to use to retrieve its output
+    # data and metadata related to said data. All parents are resolved
+    # at once to limit the number of round trips to the memory store.
+    parents = pipeline.get_step_by_uuid(step_uuid).parents
+    resolved = _resolve_batch(
+        [parent.properties["uuid"] for parent in parents], consumer=step_uuid
+    )
+
+    # Outputs in memory that are not retrieved because they are not in
+    # the requested `names`.
+    skipped_memory_outputs = []
+
+    # Check for collisions before retrieving any data.
+    for parent, parent_resolved in zip(parents, resolved):
+        parent_uuid = parent.properties["uuid"]
+
+        if not parent_resolved:
+            # When only specific `names` are requested it is unknown
+            # whether this output was requested, which is checked below.
+            if names is not None:
+                continue
+
+            parent_title = parent.properties["title"]
+            msg = (
+                f'Output from incoming step "{parent_title}" '
+                f'("{parent_uuid}") cannot be found. Try rerunning it.'
+            )
+            raise error.OutputNotFoundError(msg)
+
+        for get_output_method, args, kwargs, metadata in parent_resolved:
+            if names is not None and metadata["name"] not in names:
+                if get_output_method is _get_output_memory:
+                    skipped_memory_outputs.append(args)
+                continue
+
+            # Maintain the output methods in order, but wait with
+            # calling them so that we can first check for collisions.
+            get_output_methods.append(
+                (parent, get_output_method, args, kwargs, metadata)
+            )
+
+            if metadata["name"] != Config._RESERVED_UNNAMED_OUTPUTS_STR:
+                collisions_dict[metadata["name"]].append(parent.properties["title"])
+
+    # If there are collisions raise an error.
+    collisions_dict = {k: v for k, v in collisions_dict.items() if len(v) > 1}
+    if collisions_dict:
+        msg = "".join(
+            [
+                f"\n{name}: {sorted(step_names)}"
+                for name, step_names in collisions_dict.items()
+            ]
+        )
+        raise error.InputNameCollisionError(
+            f"Name collisions between input data coming from different steps: {msg}"
+        )
+
+    if names is not None:
+        missing_names = set(names) - {
+            metadata["name"] for *_, metadata in get_output_methods
+        }
+        missing_names.discard(Config._RESERVED_UNNAMED_OUTPUTS_STR)
+        if missing_names:
+            raise error.OutputNotFoundError(
+                f"No incoming step has output data with name(s): "
+                f"{sorted(missing_names)}."
+            )
+
+        # This step will never retrieve the skipped outputs, thus they
+        # count as received for the purpose of auto eviction.
+        if skipped_memory_outputs:
+            _notify_eviction(
+                skipped_memory_outputs, step_uuid, _PlasmaConnector().client
+            )
+
+    return get_output_methods
+
+
+def _get_inputs(
+    get_output_methods: List[Tuple[PipelineStep, Callable, Sequence[Any], Dict, Dict]],
+    consumer: str,
+    ignore_failure: bool,
+    verbose: bool,
+    max_workers: Optional[int] = None,
+    copy: bool = True,
+) -> Dict[str, Any]:
+    """Calls the resolved output methods and collects their data.
+
+    See :func:`get_inputs` for the meaning of the arguments.
+    """
+    executor = None
+    if max_workers is not None:
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    try:
+        return _collect_inputs(
+            get_output_methods, consumer, ignore_failure, verbose, executor, copy
+        )
+    finally:
+        if executor is not None:
+            # Don't wait on the remaining reads in case of a failure.
+            executor.shutdown(wait=False)
+
+
+def _collect_inputs(
+    get_output_methods: List[Tuple[PipelineStep, Callable, Sequence[Any], Dict, Dict]],
+    consumer: str,
+    ignore_failure: bool,
+    verbose: bool,
+    executor: Optional[ThreadPoolExecutor] = None,
+    copy: bool = True,
+) -> Dict[str, Any]:
+    """See :func:`_get_inputs`."""
+    # Outputs that are not in memory are read concurrently if an
+    # `executor` is given. Reading Arrow data releases the GIL.
+    futures = {}
+    if executor is not None:
+        for i, (_, get_output_method, args, kwargs, _) in enumerate(get_output_methods):
+            if get_output_method is not _get_output_memory:
+                futures[i] = executor.submit(
+                    get_output_method, *args, copy=copy, **kwargs
+                )
+
+    # Outputs in memory are retrieved in a single batch, which also
+    # sends a single eviction notification for all of them.
+    memory_outputs = [
+        args
+        for _, get_output_method, args, _, _ in get_output_methods
+        if get_output_method is _get_output_memory
+    ]
+    memory_data = {}
+    if memory_outputs:
+        memory_data = _get_outputs_memory(memory_outputs, consumer=consumer, copy=copy)
+
+    # NOTE: the order in which the `parents` list is traversed is
+    # indirectly set in the UI. The order is important since it
+    # determines the order in which unnamed inputs are received in
+    # the next step.
+    data: Dict[str, Any] = {Config._RESERVED_UNNAMED_OUTPUTS_STR: []}
+    for i, (parent, get_output_method, args, kwargs, metadata) in enumerate(
+        get_output_methods
+    ):
+
+        # Either raise an error on failure of getting output or
+        # continue with other steps.
+        try:
+            if i in futures:
+                incoming_step_data = futures[i].result()
+            elif get_output_method is _get_output_memory:
+                try:
+                    incoming_step_data = memory_data[args]
+                except KeyError:
+                    incoming_step_data = _get_spilled_output(*args, copy=copy)
+            else:
+                incoming_step_data = get_output_method(*args, copy=copy, **kwargs)
+        except error.OutputNotFoundError as e:
+            if not ignore_failure:
+                raise error.OutputNotFoundError(e)
+
+            incoming_step_data = None
+
+        if verbose:
+            parent_title = parent.properties["title"]
+            if incoming_step_data is None:
+                print(f'Failed to retrieve input from step: "{parent_title}"')
+            else:
+                print(f'Retrieved input from step: "{parent_title}"')
+
+        # Populate the return dictionary, where nameless data gets
+        # appended to a list and named data becomes a (name, data) pair.
+        name = metadata["name"]
+        if name == Config._RESERVED_UNNAMED_OUTPUTS_STR:
+            data[Config._RESERVED_UNNAMED_OUTPUTS_STR].append(incoming_step_data)
+        else:
+            data[name] = incoming_step_data
+
+    return data
+
+
+# The inputs of the step that are prefetched in the background when
+# the "ORCHEST_PREFETCH_INPUTS" ENV variable is set, which the
+# orchest-api does for runs of pipelines with the
+# "data_passing_prefetch_inputs" setting enabled. This way the inputs
+# are retrieved while the step is still importing its libraries.
+_prefetch_lock = threading.Lock()
+_prefetch_thread: Optional[threading.Thread] = None
+_prefetch_result: Optional[Tuple[str, Dict[str, Any], List]] = None
+# Set once the prefetched inputs have been taken or released, after
+# which a prefetch that is still running discards its result.
+_prefetch_released = False
+
+
+def _prefetch_inputs() -> None:
+    """Gets the inputs of the step and stores them for `get_inputs`.
+
+    Outputs in memory are not yet marked as consumed, this is done once
+    :func:`get_inputs` actually returns the prefetched inputs.
+    """
+    global _prefetch_result
+
+    try:
+        pipeline = _get_pipeline()
+        step_uuid = get_step_uuid(pipeline)
+        get_output_methods = _resolve_inputs(pipeline, step_uuid)
+        data = _get_inputs(
+            get_output_methods, consumer=None, ignore_failure=False, verbose=False
+        )
+    except Exception:
+        # The inputs are retrieved (and any error is raised) once
+        # get_inputs() is called instead.
+        return
+
+    memory_outputs = [
+        args
+        for _, get_output_method, args, _, _ in get_output_methods
+        if get_output_method is _get_output_memory
+    ]
+    with _prefetch_lock:
+        if not _prefetch_released:
+            _prefetch_result = (step_uuid, data, memory_outputs)
+
+
+def _start_prefetch_inputs() -> None:
+    """Starts prefetching the inputs of the step in a daemon thread."""
+    global _prefetch_thread
+
+    with _prefetch_lock:
+        if _prefetch_thread is not None:
+            return
+
+        _prefetch_thread = threading.Thread(
+            target=_prefetch_inputs, name="orchest-prefetch-inputs", daemon=True
+        )
+        _prefetch_thread.start()
+
+
+def _take_prefetched_inputs(step_uuid: str) -> Optional[Dict[str, Any]]:
+    """Returns the prefetched inputs of the step, if any.
+
+    Waits for the prefetching to finish. The prefetched inputs can only
+    be taken once, afterwards the inputs are retrieved again so that
+    they reflect the current outputs of the incoming steps.
+
+    Args:
+        step_uuid: The UUID of the step that is getting its inputs.
+
+    Returns:
+        The inputs as returned by :func:`get_inputs`, or ``None`` if
+        they were not prefetched (successfully).
+    """
+    global _prefetch_result, _prefetch_released
+
+    with _prefetch_lock:
+        thread = _prefetch_thread
+    if thread is None:
+        return None
+    thread.join()
+
+    with _prefetch_lock:
+        result, _prefetch_result = _prefetch_result, None
+        _prefetch_released = True
+
+    if result is None:
+        return None
+
+    prefetched_step_uuid, data, memory_outputs = result
+    if prefetched_step_uuid != step_uuid:
+        return None
+
+    _notify_eviction(memory_outputs, step_uuid, _PlasmaConnector().client)
+    return data
+
+
+def _release_prefetched_inputs() -> None:
+    """Releases the prefetched inputs of the step without using them.
+
+    Only :func:`get_inputs` with its default arguments can return the
+    prefetched inputs, any other way of getting inputs releases them so
+    that they are not kept in memory for nothing. Does not wait for the
+    prefetching to finish, a running prefetch discards its result.
+    """
+    global _prefetch_result, _prefetch_released
+
+    with _prefetch_lock:
+        _prefetch_result = None
+        _prefetch_released = True
+
+
+def get_input(
+    name: str,
+    ignore_failure: bool = False,
+    verbose: bool = False,
+    columns: Optional[List[str]] = None,
+    filters: Optional[List[Any]] = None,
+    copy: bool = True,
+) -> Any:
+    """Gets the data with the given name sent from an incoming step.
+
+    Only the data of the incoming step that output data with the given
+    `name` is retrieved, see the `names` argument of :func:`get_inputs`.
+
+    Args:
+        name: Name of the input data.
+        ignore_failure: See :func:`get_inputs`.
+        verbose: See :func:`get_inputs`.
+        columns: The columns to read, see :func:`get_inputs`.
+        filters: The filters that rows have to match, see
+            :func:`get_inputs`.
+        copy: See :func:`get_inputs`.
+
+    Returns:
+        The input data.
+
+    Raises:
+        InputNameCollisionError: Multiple steps have outputted data with
+            the given `name`.
+        OutputNotFoundError: If no incoming step has output data with
+            the given `name`.
+        StepUUIDResolveError: The step's UUID cannot be resolved and
+            thus it cannot determine what inputs to get.
+
+    Example:
+        >>> data = get_input("my_name")
+
+    """
+    inputs = get_inputs(
+        ignore_failure=ignore_failure,
+        verbose=verbose,
+        columns={name: columns} if columns is not None else None,
+        filters={name: filters} if filters is not None else None,
+        names=[name],
+        copy=copy,
+    )
+    return inputs[name]
+
+
+class LazyInputs(Mapping):
+    """Input data of a step that is retrieved on first access.
+
+    Returned by :func:`get_inputs` when called with ``lazy=True``. It
+    behaves as the dictionary that would otherwise be returned, but the
+    data of an incoming step is only retrieved when its key is accessed.
+    Accessing the ``"unnamed"`` key retrieves all unnamed data at once.
+
+    Note that incoming steps are only considered to have been received
+    from, for the purpose of auto eviction, once their data has been
+    accessed. Call :meth:`prefetch` to retrieve all data in the
+    background instead.
+
+    Example:
+        >>> inputs = get_inputs(lazy=True)
+        >>> inputs.prefetch()
+        >>> data = inputs["my_name"]
+
+    """
+
+    def __init__(
+        self,
+        get_output_methods: List[
+            Tuple[PipelineStep, Callable, Sequence[Any], Dict, Dict]
+        ],
+        consumer: str,
+        ignore_failure: bool = False,
+        verbose: bool = False,
+        max_workers: Optional[int] = None,
+        copy: bool = True,
+    ) -> None:
+        self._consumer = consumer
+        self._ignore_failure = ignore_failure
+        self._verbose = verbose
+        self._max_workers = max_workers
+        self._copy = copy
+
+        # Maintain the order of the output methods per key, since it
+        # determines the order of the unnamed data.
+        self._get_output_methods = {Config._RESERVED_UNNAMED_OUTPUTS_STR: []}
+        for get_output_method in get_output_methods:
+            name = get_output_method[4]["name"]
+            self._get_output_methods.setdefault(name, []).append(get_output_method)
+
+        self._data: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, key: str) -> Any:
+        # Avoid taking the lock for already retrieved data, which could
+        # otherwise be blocked by a prefetch of other data.
+        try:
+            return self._data[key]
+        except KeyError:
+            pass
+
+        if key not in self._get_output_methods:
+            raise KeyError(key)
+
+        with self._lock:
+            if key not in self._data:
+                data = _get_inputs(
+                    self._get_output_methods[key],
+                    self._consumer,
+                    self._ignore_failure,
+                    self._verbose,
+                    self._max_workers,
+                    self._copy,
+                )
+                self._data[key] = data[key]
+
+        return self._data[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._get_output_methods)
+
+    def __len__(self) -> int:
+        return len(self._get_output_methods)
+
+    def is_retrieved(self, key: str) -> bool:
+        """Returns whether the data of the `key` has been retrieved."""
+        return key in self._data
+
+    def prefetch(self) -> threading.Thread:
+        """Retrieves all data in a background thread.
+
+        Data that fails to be retrieved is retried, raising the error,
+        once it is accessed.
+
+        Returns:
+            The (daemon) thread that retrieves the data.
+        """
+
+        def retrieve_all():
+            for key in self:
+                try:
+                    self[key]
+                except Exception:
+                    pass
+
+        thread = threading.Thread(target=retrieve_all, daemon=True)
+        thread.start()
+        return thread
+
+    def __repr__(self) -> str:
+        return f"LazyInputs({list(self)!r})"
+
+
+def output(data: Any, name: Optional[str]) -> None:
+    """Outputs data so that it can be retrieved by the next step.
+
+    It first tries to output to memory and if it does not fit in memory,
+    then disk will be used.
+
+    Args:
+        data: Data to output.
+        name: Name of the output data. As a string, it becomes the name
+            of the data, when ``None``, the data is considered nameless.
+            This affects the way the data can be later retrieved using
+            :func:`get_inputs`.
+
+    Raises:
+        DataInvalidNameError: The name of the output data is invalid,
+            e.g because it is a reserved name (``"unnamed"``) or because
+            it contains a reserved substring.
+        OrchestNetworkError: Could not connect to the
+            ``Config.STORE_SOCKET_NAME``, because it does not exist.
+            Which might be because the specified value was wrong or the
+            store died.
+        StepUUIDResolveError: The step's UUID cannot be resolved and
+            thus data cannot be outputted.
+
+    Example:
+        >>> data = "Data I would like to use in my next step"
+        >>> output(data, name="my_data")
+
+    Note:
+        Calling :meth:`output` multiple times within the same script
+        with the same output ``name`` will overwrite the output. Data
+        output with different names is stored separately, so that
+        receiving steps can get every output on its own.
+
+    """
+    try:
+        _check_data_name_validity(name)
+    except (ValueError, TypeError) as e:
+        raise error.DataInvalidNameError(e)
+
+    return output_to_memory(data, name, disk_fallback=True)
+
+
+class _OutputStream:
+    """Writes tabular data incrementally to disk.
+
+    See :func:`output_stream`. The data is written to a temporary file
+    that only replaces the output once the stream is closed, so that
+    receiving steps never read a partially written output. Every stream
+    has its own temporary file, thus multiple processes can write the
+    same output without truncating each other's data.
+
+    Args:
+        file_path: Path of the file to write the Arrow IPC stream to.
+        schema: Schema of the data. If ``None``, then the schema of the
+            first written data is used.
+        compression: Codec to compress the data with. If ``None``, then
+            the data is not compressed.
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        schema: Optional[pa.Schema] = None,
+        compression: Optional[str] = None,
+    ) -> None:
+        self._file_path = file_path
+        self._tmp_file_path = None
+        self._compression = compression
+
+        self._file = None
+        self._writer = None
+        if schema is not None:
+            self._open(schema)
+
+    def _open(self, schema: pa.Schema) -> None:
+        options = pa.ipc.IpcWriteOptions(compression=self._compression)
+        fd, self._tmp_file_path = tempfile.mkstemp(
+            suffix=".tmp",
+            prefix=f"{os.path.basename(self._file_path)}.",
+            dir=os.path.dirname(self._file_path),
+        )
+        os.close(fd)
+        # Readable by receiving steps, like the other outputs.
+        os.chmod(self._tmp_file_path, 0o644)
+        self._file = pa.OSFile(self._tmp_file_path, "wb")
+        self._writer = pa.ipc.new_stream(self._file, schema, options=options)
+
+    def write(self, data: Union[pa.RecordBatch, pa.Table]) -> None:
+        """Writes data to the stream.
+
+        Args:
+            data: The data to write. All written data must have the same
+                schema.
+
+        Raises:
+            TypeError: If the data is not a ``pa.RecordBatch`` or
+                ``pa.Table``.
+        """
+        if not isinstance(data, (pa.RecordBatch, pa.Table)):
+            raise TypeError("Data should be of type `pa.RecordBatch` or `pa.Table`.")
+
+        if self._writer is None:
+            self._open(data.schema)
+
+        if isinstance(data, pa.Table):
+            self._writer.write_table(data)
+        else:
+            self._writer.write_batch(data)
+
+    def close(self) -> bool:
+        """Closes the stream, making the output visible.
+
+        Returns:
+            ``True`` if anything was output, ``False`` otherwise.
+        """
+        if self._writer is None:
+            return False
+
+        self._writer.close()
+        self._file.close()
+        os.replace(self._tmp_file_path, self._file_path)
+        return True
+
+    def abort(self) -> None:
+        """Closes the stream, discarding the written data."""
+        if self._writer is None:
+            return
+
+        self._file.close()
+        os.remove(self._tmp_file_path)
+
+
+@contextlib.contextmanager
+def output_stream(
+    name: Optional[str],
+    schema: Optional[pa.Schema] = None,
+    compression: Optional[str] = None,
+) -> Iterator[_OutputStream]:
+    """Outputs tabular data to disk incrementally.
+
+    Allows to output data that is larger than memory by writing it
+    batch by batch. Receiving steps can get the data through
+    :func:`get_inputs` as a single ``pa.Table``, or one batch at a time
+    through :func:`iter_input_batches`.
+
+    Args:
+        name: Name of the output data. As a string, it becomes the name
+            of the data, when ``None``, the data is considered nameless.
+            This affects the way the data can be later retrieved using
+            :func:`get_inputs`.
+        schema: Schema of the data. If ``None``, then the schema of the
+            first written data is used.
+        compression: Codec to compress the data with, either ``"lz4"``
+            or ``"zstd"``. If ``None``, then the
+            ``data_passing_disk_compression`` setting of the pipeline is
+            used, by default the data is not compressed.
+
+    Yields:
+        A stream with a ``write`` method that accepts a
+        ``pa.RecordBatch`` or ``pa.Table``. The output is only updated
+        once the context is exited without an exception. If no `schema`
+        is given and nothing is written, then the output is not updated
+        at all.
+
+    Raises:
+        DataInvalidNameError: The name of the output data is invalid,
+            e.g because it is a reserved name (``"unnamed"``) or because
+            it contains a reserved substring.
+        PipelineDefinitionNotFoundError: If the pipeline definition file
+            could not be found.
+        StepUUIDResolveError: The step's UUID cannot be resolved and
+            thus it cannot determine where to output data to.
+        ValueError: If the specified compression is not supported.
+
+    Example:
+        >>> with output_stream(name="my_data") as stream:
+        ...     for batch in batches:
+        ...         stream.write(batch)
+
+    """
+    try:
+        _check_data_name_validity(name)
+    except (ValueError, TypeError) as e:
+        raise error.DataInvalidNameError(e)
+
+    pipeline = _get_pipeline()
+
+    try:
+        step_uuid = get_step_uuid(pipeline)
+    except error.StepUUIDResolveError:
+        raise error.StepUUIDResolveError("Failed to determine where to output data to.")
+
+    compression = _get_disk_compression(pipeline, compression)
+
+    _clear_previous_outputs(step_uuid)
+
+    # Recursively create any directories if they do not already exists.
+    step_data_dir = Config.get_step_data_dir(step_uuid)
+    os.makedirs(step_data_dir, exist_ok=True)
+
+    # A multi-batch stream is read back as a table.
+    serialization = Serialization.ARROW_TABLE
+    head_file, full_path = _get_output_paths(
+        step_uuid, _get_output_key(step_uuid, name)
+    )
+    if name is None:
+        name = Config._RESERVED_UNNAMED_OUTPUTS_STR
+
+    stream = _OutputStream(
+        f"{full_path}.{serialization.name}", schema=schema, compression=compression
+    )
+
+    try:
+        yield stream
+    except BaseException:
+        stream.abort()
+        raise
+
+    if stream.close():
+        _write_head(head_file, serialization, name, compression=compression)
+
+
+def _iter_batches_disk(
+    step_uuid: str, serialization: str, key: Optional[str] = None
+) -> Iterator[pa.RecordBatch]:
+    """Iterates over the record batches of tabular data on disk.
+
+    The output is looked up right away, its batches are read while they
+    are iterated over.
+
+    Raises:
+        DiskOutputNotFoundError: If output from `step_uuid` cannot be
+            found.
+        ValueError: If the data is not tabular.
+    """
+    _, full_path = _get_output_paths(step_uuid, key)
+    file_path = f"{full_path}.{serialization}"
+
+    if not os.path.exists(file_path):
+        raise error.DiskOutputNotFoundError(
+            f'Output from incoming step "{step_uuid}" cannot be found. '
+            "Try rerunning it."
+        )
+
+    if serialization == Serialization.PARQUET.name:
+        return _iter_parquet_batches(file_path)
+    elif serialization in [s.name for s in _ARROW_STREAM_SERIALIZATIONS]:
+        return _iter_stream_batches(file_path)
+
+    raise ValueError(f'Output from incoming step "{step_uuid}" is not tabular.')
+
+
+def _iter_parquet_batches(file_path: str) -> Iterator[pa.RecordBatch]:
+    # Only one row group at a time is held in memory.
+    parquet_file = pq.ParquetFile(file_path, memory_map=True)
+    for i in range(parquet_file.num_row_groups):
+        yield from parquet_file.read_row_group(i).to_batches()
+
+
+def _iter_stream_batches(file_path: str) -> Iterator[pa.RecordBatch]:
+    with pa.memory_map(file_path, "rb") as input_file:
+        yield from pa.ipc.open_stream(input_file)
+
+
+def _iter_batches_memory(
+    step_uuid: str,
+    obj_id: plasma.ObjectID,
+    serialization: str,
+    consumer: Optional[str] = None,
+) -> Iterator[pa.RecordBatch]:
+    """Iterates over the record batches of tabular data in memory.
+
+    The batches are zero-copy views on the object in the store. If the
+    object was spilled to disk, then the batches are read from disk.
+
+    Raises:
+        MemoryOutputNotFoundError: If output from `step_uuid` cannot be
+            found.
+        ValueError: If the data is not tabular.
+    """
+    if serialization not in [s.name for s in _ARROW_STREAM_SERIALIZATIONS]:
+        raise ValueError(f'Output from incoming step "{step_uuid}" is not tabular.')
+
+    client = _PlasmaConnector().client
+
+    [(_, buffer)] = client.get_buffers([obj_id], with_meta=True, timeout_ms=1000)
+    if buffer is None:
+        # The object could have been spilled to disk after it was
+        # resolved to be in memory, see `_get_spilled_output`.
+        try:
+            key, serialization, _ = _get_spilled_metadata(step_uuid, obj_id)
+            return _iter_batches_disk(step_uuid, serialization, key=key)
+        except error.DiskOutputNotFoundError:
+            raise error.MemoryOutputNotFoundError(
+                f'Output from incoming step "{step_uuid}" cannot be found. '
+                "Try rerunning it."
+            )
+
+    _notify_eviction([(step_uuid, obj_id)], consumer, client)
+
+    return iter(pa.ipc.open_stream(buffer))
+
+
+def iter_input_batches(name: str) -> Iterator[pa.RecordBatch]:
+    """Iterates over tabular input data one record batch at a time.
+
+    Allows to process data that is larger than memory, e.g. data that
+    was output through :func:`output_stream`, without ever holding all
+    of it in memory. The input is resolved when this function is called,
+    thus errors are raised right away instead of on the first iteration.
+
+    Args:
+        name: Name of the input data, i.e. the `name` with which an
+            incoming step has output the data.
+
+    Returns:
+        An iterator over the ``pa.RecordBatch`` objects of the data.
+        Data that was output as a ``pd.DataFrame`` is returned as record
+        batches as well.
+
+    Raises:
+        InputNameCollisionError: Multiple steps have outputted data with
+            the given `name`.
+        OutputNotFoundError: If no incoming step has outputted data with
+            the given `name`.
+        StepUUIDResolveError: The step's UUID cannot be resolved and
+            thus it cannot determine what inputs to get.
+        ValueError: If the data is not tabular.
+
+    Example:
+        >>> for batch in iter_input_batches("my_data"):
+        ...     process(batch)
+
+    """
+    pipeline = _get_pipeline()
+    try:
+        step_uuid = get_step_uuid(pipeline)
+    except error.StepUUIDResolveError:
+        raise error.StepUUIDResolveError("Failed to determine from where to get data.")
+
+    _release_prefetched_inputs()
+
+    parents = pipeline.get_step_by_uuid(step_uuid).parents
+    resolved = _resolve_batch(
+        [parent.properties["uuid"] for parent in parents], consumer=step_uuid
+    )
+
+    matches = [
+        (parent, parent_output)
+        for parent, parent_resolved in zip(parents, resolved)
+        for parent_output in parent_resolved
+        if parent_output[3]["name"] == name
+    ]
+    if not matches:
+        raise error.OutputNotFoundError(
+            f'No incoming step has output data with name "{name}".'
+        )
+    elif len(matches) > 1:
+        step_names = sorted(parent.properties["title"] for parent, _ in matches)
+        raise error.InputNameCollisionError(
+            f"Name collisions between input data coming from different steps: "
+            f"\n{name}: {step_names}"
+        )
+
+    parent, (get_output_method, args, kwargs, metadata) = matches[0]
+    parent_uuid = parent.properties["uuid"]
+
+    if get_output_method is _get_output_memory:
+        return _iter_batches_memory(
+            *args, metadata["serialization"], consumer=step_uuid
+        )
+
+    return _iter_batches_disk(parent_uuid, metadata["serialization"], key=kwargs["key"])
+
+
+def _convert_uuid_to_object_id(
+    step_uuid: str, name: Optional[str] = None
+) -> plasma.ObjectID:
+    """Converts a UUID to a plasma.ObjectID.
+
+    Args:
+        step_uuid: UUID of a step.
+        name: Name of an output of the step. If ``None``, then the ID of
+            the unnamed output of the step is returned.
+
+    Returns:
+        An ObjectID of the first 20 characters of the `step_uuid`. For a
+        named output, the ObjectID of the SHA-1 digest (which is exactly
+        20 bytes) of the `step_uuid` and `name`.
+    """
+    if name is None:
+        binary_uuid = str.encode(step_uuid)
+        return plasma.ObjectID(binary_uuid[:20])
+
+    key = f"{step_uuid}{Config.__METADATA_SEPARATOR__}{name}"
+    return plasma.ObjectID(hashlib.sha1(str.encode(key)).digest())
+
+
+def _get_manifest_object_id(step_uuid: str) -> plasma.ObjectID:
+    """Returns the ID of the manifest object of a step.
+
+    The manifest lists the named outputs of the step that are in memory,
+    see :func:`_interpret_manifest`. Since a name cannot contain the
+    metadata separator, the ID never collides with the ID of an output.
+    """
+    key = f"{step_uuid}{Config.__METADATA_SEPARATOR__ * 2}"
+    return plasma.ObjectID(hashlib.sha1(str.encode(key)).digest())
+
+
+if os.getenv("ORCHEST_PREFETCH_INPUTS") is not None:
+    _start_prefetch_inputs()
+
+
+# TODO: Once we are set on the API we could specify __all__. For now we
+#       will stick with the leading _underscore convention to indicate
+#       private methods.
@@ -0,0 +1,225 @@
+"""A store of objects as memory-mapped files, an alternative to plasma.
+
+The memory-server runs this store instead of a plasma store if the
+``data_passing_memory_backend`` setting of the pipeline is ``"mmap"``.
+Objects are files in a directory on the volume that is shared between
+the containers of a session. Steps write an object once and receiving
+steps memory-map it, so that data is never copied on retrieval.
+
+The layout of the store directory is:
+
+* ``store.json``: ``{"capacity": <bytes>}``, written by the
+  memory-server once the store is ready.
+* ``notifications``: log of sealed and deleted objects, the equivalent
+  of the notification socket of plasma. Every line is
+  ``<object ID> <data size> <metadata size>``, where the sizes of a
+  deleted object are ``-1``.
+* ``objects/<object ID>``: the metadata size and data size (unsigned 64
+  bits little-endian integers), followed by the metadata and then the
+  data at an offset that is a multiple of ``ALIGNMENT``. An object is
+  written to a temporary file that is renamed once it is sealed, thus
+  readers never see a partially written object.
+
+Contrary to plasma, the store keeps no reference counts of the objects
+that are in use. Deleting (or replacing) an object only unlinks its
+file, and the kernel frees the file once the last mapping of it is
+closed, so data that is still in use by a step stays valid. When the
+mmap backend is selected, the orchest-api creates the shared volume as
+a tmpfs, so the files are kept in memory instead of on disk.
+
+The memory-server has its own implementation of the server side of the
+store, which has to be kept in sync with this module.
+"""
+import json
+import mmap
+import os
+import struct
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import pyarrow as pa
+
+from orchest.transfer import _plasma as plasma
+
+STORE_FILE = "store.json"
+NOTIFICATIONS_FILE = "notifications"
+OBJECTS_DIR = "objects"
+ALIGNMENT = 64
+
+_HEADER = struct.Struct("<QQ")
+
+
+def _get_data_offset(metadata_size: int) -> int:
+    offset = _HEADER.size + metadata_size
+    return offset + (-offset % ALIGNMENT)
+
+
+class MmapStoreClient:
+    """Client of the mmap store with the interface of a PlasmaClient.
+
+    Only the methods that are used by :mod:`orchest.transfer` are
+    implemented. Contrary to plasma, getting an object never waits for
+    it to be sealed.
+
+    Args:
+        store_dir: The directory of the store.
+
+    Raises:
+        OSError: If the store is not ready.
+    """
+
+    def __init__(self, store_dir: str) -> None:
+        self._store_dir = store_dir
+        self._objects_dir = os.path.join(store_dir, OBJECTS_DIR)
+
+        with open(os.path.join(store_dir, STORE_FILE), "r") as f:
+            self._capacity = json.load(f)["capacity"]
+
+        # Objects that are created but not yet sealed, mapping their ID
+        # to their temporary file and memory map.
+        self._created: Dict[plasma.ObjectID, Tuple[str, mmap.mmap]] = {}
+
+    def _get_path(self, obj_id: plasma.ObjectID) -> str:
+        return os.path.join(self._objects_dir, obj_id.binary().hex())
+
+    def _notify(self, lines: List[str]) -> None:
+        if not lines:
+            return
+
+        # Appends are atomic, thus notifications of concurrent writers
+        # are not interleaved.
+        fd = os.open(
+            os.path.join(self._store_dir, NOTIFICATIONS_FILE), os.O_WRONLY | os.O_APPEND
+        )
+        try:
+            os.write(fd, "".join(lines).encode("utf-8"))
+        finally:
+            os.close(fd)
+
+    def store_capacity(self) -> int:
+        return self._capacity
+
+    def list(self) -> Dict[plasma.ObjectID, Dict[str, int]]:
+        objects = {}
+        for file_name in os.listdir(self._objects_dir):
+            # Skip the temporary files of unsealed objects.
+            if "." in file_name:
+                continue
+
+            try:
+                with open(os.path.join(self._objects_dir, file_name), "rb") as f:
+                    metadata_size, data_size = _HEADER.unpack(f.read(_HEADER.size))
+            except (FileNotFoundError, struct.error):
+                continue
+
+            objects[plasma.ObjectID(bytes.fromhex(file_name))] = {
+                "data_size": data_size,
+                "metadata_size": metadata_size,
+            }
+
+        return objects
+
+    def create(
+        self,
+        obj_id: plasma.ObjectID,
+        data_size: int,
+        metadata: Optional[bytes] = None,
+    ) -> pa.Buffer:
+        """Creates an object, which is invisible until it is sealed.
+
+        Returns:
+            A mutable buffer to write the data of the object into.
+
+        Raises:
+            PlasmaObjectExists: If the object already exists.
+        """
+        path = self._get_path(obj_id)
+        if os.path.exists(path):
+            raise plasma.PlasmaObjectExists(f"Object {obj_id} already exists.")
+
+        metadata = metadata or b""
+        data_offset = _get_data_offset(len(metadata))
+
+        tmp_path = f"{path}.{os.getpid()}.{os.urandom(4).hex()}.tmp"
+        with open(tmp_path, "w+b") as f:
+            f.truncate(data_offset + data_size)
+            mm = mmap.mmap(f.fileno(), data_offset + data_size)
+
+        mm[: _HEADER.size] = _HEADER.pack(len(metadata), data_size)
+        mm[_HEADER.size : _HEADER.size + len(metadata)] = metadata
+        self._created[obj_id] = (tmp_path, mm)
+
+        return pa.py_buffer(memoryview(mm)[data_offset:])
+
+    def seal(self, obj_id: plasma.ObjectID) -> None:
+        """Makes a created object visible to all clients."""
+        tmp_path, mm = self._created.pop(obj_id)
+        metadata_size, data_size = _HEADER.unpack(mm[: _HEADER.size])
+
+        # The memory map is released once the buffer that was returned
+        # by ``create`` is no longer referenced.
+        os.replace(tmp_path, self._get_path(obj_id))
+        self._notify([f"{obj_id.binary().hex()} {data_size} {metadata_size}\n"])
+
+    def delete(self, obj_ids: Sequence[plasma.ObjectID]) -> None:
+        """Deletes objects, ignoring the ones that do not exist.
+
+        Memory maps of a deleted object remain valid.
+        """
+        lines = []
+        for obj_id in obj_ids:
+            try:
+                os.remove(self._get_path(obj_id))
+            except FileNotFoundError:
+                continue
+
+            lines.append(f"{obj_id.binary().hex()} -1 -1\n")
+
+        self._notify(lines)
+
+    def get_metadata(
+        self, obj_ids: Sequence[plasma.ObjectID], timeout_ms: int = -1
+    ) -> List[Optional[pa.Buffer]]:
+        metadatas = []
+        for obj_id in obj_ids:
+            try:
+                with open(self._get_path(obj_id), "rb") as f:
+                    metadata_size, _ = _HEADER.unpack(f.read(_HEADER.size))
+                    metadatas.append(pa.py_buffer(f.read(metadata_size)))
+            except FileNotFoundError:
+                metadatas.append(None)
+
+        return metadatas
+
+    def get_buffers(
+        self,
+        obj_ids: Sequence[plasma.ObjectID],
+        timeout_ms: int = -1,
+        with_meta: bool = False,
+    ) -> list:
+        """Gets objects as zero-copy buffers on their memory map.
+
+        Returns:
+            A buffer per object, or ``None`` if the object does not
+            exist. If `with_meta`, then a tuple of the metadata and the
+            buffer.
+        """
+        res = []
+        for obj_id in obj_ids:
+            try:
+                with pa.memory_map(self._get_path(obj_id), "r") as f:
+                    buffer = f.read_buffer()
+            except FileNotFoundError:
+                res.append((None, None) if with_meta else None)
+                continue
+
+            metadata_size, data_size = _HEADER.unpack(buffer[: _HEADER.size])
+            data = buffer.slice(_get_data_offset(metadata_size), data_size)
+            if with_meta:
+                res.append((buffer.slice(_HEADER.size, metadata_size), data))
+            else:
+                res.append(data)
+
+        return res
+
+    def disconnect(self) -> None:
+        pass
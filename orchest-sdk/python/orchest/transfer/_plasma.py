@@ -0,0 +1,49 @@
+"""The plasma module of pyarrow, or a stand-in if it is unavailable.
+
+``pyarrow.plasma`` is deprecated and removed from recent releases of
+pyarrow. Without it, only the mmap store can be used to pass data in
+memory, see :mod:`orchest.transfer._mmap_store`.
+"""
+import os
+
+try:
+    from pyarrow.plasma import (  # noqa: F401
+        ObjectID,
+        PlasmaClient,
+        PlasmaObjectExists,
+        connect,
+    )
+except ImportError:
+
+    class ObjectID:
+        """An ID of 20 bytes, like ``pyarrow.plasma.ObjectID``."""
+
+        def __init__(self, object_id: bytes) -> None:
+            if len(object_id) != 20:
+                raise ValueError(f"Object ID must be 20 bytes, is {object_id}.")
+            self._object_id = bytes(object_id)
+
+        @classmethod
+        def from_random(cls) -> "ObjectID":
+            return cls(os.urandom(20))
+
+        def binary(self) -> bytes:
+            return self._object_id
+
+        def __eq__(self, other) -> bool:
+            return isinstance(other, ObjectID) and self.binary() == other.binary()
+
+        def __hash__(self) -> int:
+            return hash(self._object_id)
+
+        def __repr__(self) -> str:
+            return f"ObjectID({self._object_id.hex()})"
+
+    class PlasmaClient:
+        """Placeholder for type annotations, it cannot be connected."""
+
+    class PlasmaObjectExists(Exception):
+        pass
+
+    def connect(store_socket_name: str, num_retries: int = -1) -> PlasmaClient:
+        raise OSError("pyarrow.plasma is not available.")
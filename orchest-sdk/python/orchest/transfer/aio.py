@@ -0,0 +1,239 @@
+"""Asynchronous data passing, for steps that run an event loop.
+
+The functions mirror the ones of :mod:`orchest.transfer`, but the
+blocking I/O and (de)serialization are run in a pool of at most
+``Config.AIO_MAX_WORKERS`` threads. This way the event loop is never
+blocked and multiple outputs can be written concurrently.
+
+Example:
+    >>> from orchest.transfer import aio
+    >>> async def main():
+    ...     inputs = await aio.get_inputs()
+    ...     await asyncio.gather(
+    ...         aio.output(inputs["a"] + 1, name="b"),
+    ...         aio.output(inputs["a"] * 2, name="c"),
+    ...     )
+
+"""
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Union
+
+import pyarrow as pa
+
+from orchest import transfer
+from orchest.config import Config
+
+_executor: Optional[ThreadPoolExecutor] = None
+# The pid of the process that created the executor. A child process
+# does not inherit the threads of its parent.
+_executor_pid: Optional[int] = None
+_executor_lock = threading.Lock()
+
+# ``asyncio.get_running_loop`` was added in Python3.7. Before, inside a
+# coroutine the event loop of the current thread is the running one.
+_get_running_loop = getattr(asyncio, "get_running_loop", asyncio.get_event_loop)
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Returns the thread pool to run blocking functions in."""
+    global _executor, _executor_pid
+
+    with _executor_lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ThreadPoolExecutor(
+                max_workers=Config.AIO_MAX_WORKERS,
+                thread_name_prefix="orchest-aio",
+            )
+            _executor_pid = os.getpid()
+
+        return _executor
+
+
+def _run(func: Callable, *args, **kwargs) -> "asyncio.Future":
+    """Runs a blocking function in the thread pool.
+
+    Raises:
+        RuntimeError: If no event loop is running in the current thread.
+    """
+    loop = _get_running_loop()
+    return loop.run_in_executor(
+        _get_executor(), functools.partial(func, *args, **kwargs)
+    )
+
+
+async def get_inputs(
+    ignore_failure: bool = False,
+    verbose: bool = False,
+    max_workers: Optional[int] = None,
+    columns: Optional[Dict[str, List[str]]] = None,
+    filters: Optional[Dict[str, List[Any]]] = None,
+    names: Optional[List[str]] = None,
+    copy: bool = True,
+) -> Dict[str, Any]:
+    """Gets all data sent from incoming steps.
+
+    See :func:`orchest.transfer.get_inputs`.
+    """
+    return await _run(
+        transfer.get_inputs,
+        ignore_failure=ignore_failure,
+        verbose=verbose,
+        max_workers=max_workers,
+        columns=columns,
+        filters=filters,
+        names=names,
+        copy=copy,
+    )
+
+
+async def get_input(
+    name: str,
+    ignore_failure: bool = False,
+    verbose: bool = False,
+    columns: Optional[List[str]] = None,
+    filters: Optional[List[Any]] = None,
+    copy: bool = True,
+) -> Any:
+    """Gets the data with the given name sent from an incoming step.
+
+    See :func:`orchest.transfer.get_input`.
+    """
+    return await _run(
+        transfer.get_input,
+        name,
+        ignore_failure=ignore_failure,
+        verbose=verbose,
+        columns=columns,
+        filters=filters,
+        copy=copy,
+    )
+
+
+async def output(data: Any, name: Optional[str]) -> None:
+    """Outputs data so that it can be retrieved by the next step.
+
+    See :func:`orchest.transfer.output`.
+
+    Note:
+        The `data` should not be modified until the output is done.
+    """
+    await _run(transfer.output, data, name)
+
+
+async def output_to_memory(
+    data: Any, name: Optional[str], disk_fallback: bool = True
+) -> None:
+    """Outputs data to memory.
+
+    See :func:`orchest.transfer.output_to_memory`.
+    """
+    await _run(transfer.output_to_memory, data, name, disk_fallback=disk_fallback)
+
+
+async def output_to_disk(
+    data: Any,
+    name: Optional[str],
+    compression: Optional[str] = None,
+    parquet: bool = False,
+    deduplicate: Optional[bool] = None,
+) -> None:
+    """Outputs data to disk.
+
+    See :func:`orchest.transfer.output_to_disk`.
+    """
+    await _run(
+        transfer.output_to_disk,
+        data,
+        name,
+        compression=compression,
+        parquet=parquet,
+        deduplicate=deduplicate,
+    )
+
+
+class _AsyncOutputStream:
+    """Writes tabular data to disk, see :func:`output_stream`.
+
+    A write is done in the background, so that the next data can be
+    computed in the meantime. There is at most one write in progress,
+    which keeps the data in order and bounds the memory that is used.
+    """
+
+    def __init__(self, stream) -> None:
+        self._stream = stream
+        self._pending: Optional[asyncio.Future] = None
+
+    async def write(self, data: Union[pa.RecordBatch, pa.Table]) -> None:
+        """Starts writing data to the stream.
+
+        Waits for the previous write to finish, but not for this one.
+        Errors of a write are raised by the next call to ``write`` or
+        ``flush``, or when the stream is closed.
+
+        Args:
+            data: The data to write. All written data must have the same
+                schema.
+
+        Raises:
+            TypeError: If the data is not a ``pa.RecordBatch`` or
+                ``pa.Table``.
+        """
+        if not isinstance(data, (pa.RecordBatch, pa.Table)):
+            raise TypeError("Data should be of type `pa.RecordBatch` or `pa.Table`.")
+
+        await self.flush()
+        self._pending = _run(self._stream.write, data)
+
+    async def flush(self) -> None:
+        """Waits for the write in progress to finish."""
+        if self._pending is None:
+            return
+
+        pending, self._pending = self._pending, None
+        await pending
+
+
+class output_stream:
+    """Outputs tabular data to disk incrementally.
+
+    The asynchronous version of :func:`orchest.transfer.output_stream`,
+    to be used with ``async with``. See :class:`_AsyncOutputStream` for
+    how data is written.
+
+    Example:
+        >>> async with aio.output_stream(name="my_data") as stream:
+        ...     async for batch in batches:
+        ...         await stream.write(batch)
+
+    """
+
+    def __init__(
+        self,
+        name: Optional[str],
+        schema: Optional[pa.Schema] = None,
+        compression: Optional[str] = None,
+    ) -> None:
+        self._context = transfer.output_stream(
+            name, schema=schema, compression=compression
+        )
+        self._stream: Optional[_AsyncOutputStream] = None
+
+    async def __aenter__(self) -> _AsyncOutputStream:
+        self._stream = _AsyncOutputStream(await _run(self._context.__enter__))
+        return self._stream
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> bool:
+        try:
+            await self._stream.flush()
+        except BaseException as e:
+            # The output is discarded if the last write failed. An
+            # exception inside the context takes precedence.
+            if exc_type is None:
+                await _run(self._context.__exit__, type(e), e, e.__traceback__)
+                raise
+
+        return await _run(self._context.__exit__, exc_type, exc_value, traceback)
@@ -1,11 +1,16 @@
-import json
 import os
-import urllib
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Tuple
+
+import requests
 
 from orchest.config import Config
 from orchest.error import OrchestNetworkError, StepUUIDResolveError
-from orchest.pipeline import Pipeline
+from orchest.pipeline import Pipeline, get_file_key
+
+# The path of the notebook of a kernel by the ID of the kernel. Together
+# with the key of the pipeline definition file, see `get_file_key`, at
+# the time the path was resolved.
+_notebook_paths: Dict[str, Tuple[Optional[Tuple[int, int, int]], str]] = {}
 
 
 def get_step_uuid(pipeline: Pipeline) -> str:
@@ -32,6 +37,44 @@ def get_step_uuid(pipeline: Pipeline) -> str:
     if kernel_id is None:
         raise StepUUIDResolveError('Environment variable "KERNEL_ID" not present.')
 
+    notebook_path = _get_notebook_path(kernel_id, pipeline)
+
+    for step in pipeline.steps:
+        # Compare basenames, one pipeline can not have duplicate notebook names,
+        # so this should work
+        if os.path.basename(step.properties["file_path"]) == os.path.basename(
+            notebook_path
+        ):
+            # NOTE: the UUID cannot be cached here. Because if the
+            # notebook is assigned to a different step, then the env
+            # variable does not change and thus the notebooks wrongly
+            # thinks it is a different step. Only the path of the
+            # notebook is cached, see `_get_notebook_path`.
+            return step.properties["uuid"]
+
+    raise StepUUIDResolveError(f'No step with "notebook_path": {notebook_path}.')
+
+
+def _get_notebook_path(kernel_id: str, pipeline: Pipeline) -> str:
+    """Gets the path of the notebook that is running in the kernel.
+
+    The path is cached until the pipeline definition file changes, since
+    the path of the notebook of a step can only change together with the
+    pipeline definition.
+
+    Raises:
+        StepUUIDResolveError: The notebook of the kernel cannot be
+            resolved.
+    """
+    try:
+        file_key = get_file_key(Config.PIPELINE_DEFINITION_PATH)
+    except FileNotFoundError:
+        file_key = None
+
+    cached_file_key, notebook_path = _notebook_paths.get(kernel_id, (None, None))
+    if file_key is not None and cached_file_key == file_key:
+        return notebook_path
+
     # Get JupyterLab sessions to resolve the step's UUID via the id of
     # the running kernel and the step's associated file path.
     # Orchest API --jupyter_server_ip/port--> Jupyter sessions --notebook path--> UUID.
@@ -57,41 +100,46 @@ def get_step_uuid(pipeline: Pipeline) -> str:
     else:
         raise StepUUIDResolveError(
             f'Jupyter session data has no "kernel" with "id" equal to the '
-            '"KERNEL_ID" of this step: {kernel_id}.'
+            f'"KERNEL_ID" of this step: {kernel_id}.'
         )
 
-    for step in pipeline.steps:
-        # Compare basenames, one pipeline can not have duplicate notebook names,
-        # so this should work
-        if os.path.basename(step.properties["file_path"]) == os.path.basename(
-            notebook_path
-        ):
-            # NOTE: the UUID cannot be cached here. Because if the
-            # notebook is assigned to a different step, then the env
-            # variable does not change and thus the notebooks wrongly
-            # thinks it is a different step.
-            return step.properties["uuid"]
+    _notebook_paths[kernel_id] = (file_key, notebook_path)
+    return notebook_path
 
-    raise StepUUIDResolveError(f'No step with "notebook_path": {notebook_path}.')
+
+class _Session:
+    """Manages the HTTP session of the process.
+
+    The session keeps connections alive, so that subsequent requests to
+    the same server reuse the connection. A child process never reuses
+    the session of its parent, since the connections would be shared.
+    """
+
+    _session: Optional[requests.Session] = None
+    _pid: Optional[int] = None
+
+    @classmethod
+    def get(cls) -> requests.Session:
+        if cls._session is None or cls._pid != os.getpid():
+            cls._session = requests.Session()
+            cls._pid = os.getpid()
+
+        return cls._session
 
 
 def _request_json(url: str) -> Dict[Any, Any]:
     """Requests response from specified url and jsonifies it."""
     try:
-        with urllib.request.urlopen(url) as r:
-            encoding = r.info().get_param("charset")
-            data = r.read()
-    except urllib.error.HTTPError:
+        r = _Session.get().get(url, timeout=Config.REQUEST_TIMEOUT)
+        r.raise_for_status()
+    except requests.HTTPError:
         raise OrchestNetworkError(
             f"Failed to fetch data from {url}. The server could not fulfil the request."
         )
-    except urllib.error.URLError:
+    except requests.RequestException:
         raise OrchestNetworkError(
             f"Failed to fetch data from {url}. Either the specified server "
             "does not exist or the network connection could not be established."
         )
 
-    encoding = encoding or "utf-8"
-    data = data.decode(encoding or "utf-8")
-
-    return json.loads(data)
+    return r.json()
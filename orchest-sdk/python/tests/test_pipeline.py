@@ -0,0 +1,33 @@
+import json
+import shutil
+
+import pytest
+
+import orchest
+from orchest.pipeline import read_pipeline
+
+
+def test_read_pipeline_cache(tmp_path):
+    pipeline_fname = str(tmp_path / "pipeline.json")
+    shutil.copy("tests/userdir/pipeline-basic.json", pipeline_fname)
+
+    pipeline = read_pipeline(pipeline_fname)
+    assert read_pipeline(pipeline_fname) is pipeline
+
+    step = pipeline.get_step_by_uuid("uuid-2______________")
+    assert [parent.properties["uuid"] for parent in step.parents] == [
+        "uuid-1______________"
+    ]
+    with pytest.raises(orchest.error.StepUUIDResolveError):
+        pipeline.get_step_by_uuid("uuid-4______________")
+
+    # Changing the file invalidates the cache.
+    with open(pipeline_fname, "r") as f:
+        description = json.load(f)
+    description["name"] = "changed"
+    with open(pipeline_fname, "w") as f:
+        json.dump(description, f)
+
+    changed_pipeline = read_pipeline(pipeline_fname)
+    assert changed_pipeline is not pipeline
+    assert changed_pipeline.properties["name"] == "changed"
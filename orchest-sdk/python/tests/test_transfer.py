@@ -1,8 +1,15 @@
 """
 uuid-1, uuid-3 --> uuid-2
 """
+import asyncio
+import fcntl
+import json
+import os
+import pickle
 import shutil
+import socket
 import time
+import uuid
 from unittest.mock import patch
 
 import numpy as np
@@ -13,6 +20,7 @@ import pytest
 
 import orchest
 from orchest import transfer
+from orchest.transfer import aio
 
 KILOBYTE = 1 << 10
 MEGABYTE = KILOBYTE * KILOBYTE
@@ -88,6 +96,29 @@ def plasma_store(monkeypatch):
         shutil.rmtree(f"tests/userdir/.data/{step_uuid}", ignore_errors=True)
 
 
+@pytest.fixture()
+def mmap_store(monkeypatch, tmp_path):
+    # Create the store like the memory-server does, there is no plasma
+    # socket.
+    store_dir = tmp_path / "mmap-store"
+    (store_dir / "objects").mkdir(parents=True)
+    (store_dir / "notifications").touch()
+    (store_dir / "store.json").write_text(
+        json.dumps({"capacity": PLASMA_STORE_CAPACITY})
+    )
+
+    monkeypatch.setattr(
+        orchest.Config, "STORE_SOCKET_NAME", str(tmp_path / "plasma.sock")
+    )
+    monkeypatch.setattr(orchest.Config, "MMAP_STORE_DIR", str(store_dir))
+    yield store_dir
+
+    uuids = ["uuid-1______________", "uuid-2______________", "uuid-3______________"]
+
+    for step_uuid in uuids:
+        shutil.rmtree(f"tests/userdir/.data/{step_uuid}", ignore_errors=True)
+
+
 @pytest.mark.parametrize(
     "data_1",
     [
@@ -407,3 +438,900 @@ def test_output_no_memory_store(mock_get_step_uuid):
     input_data = transfer.get_inputs()
     input_data = input_data[orchest.Config._RESERVED_UNNAMED_OUTPUTS_STR][0]
     assert (input_data == data_1).all()
+
+
+def test_plasma_connection_reuse(plasma_store, monkeypatch):
+    client = transfer._PlasmaConnector().client
+    assert transfer._PlasmaConnector().client is client
+
+    # A forked process must not reuse the connection of its parent.
+    pid = transfer.os.getpid()
+    monkeypatch.setattr(transfer.os, "getpid", lambda: pid + 1)
+    assert transfer._PlasmaConnector().client is not client
+
+
+@patch("orchest.transfer.get_step_uuid")
+@patch("orchest.Config.STEP_DATA_DIR", "tests/userdir/.data/{step_uuid}")
+def test_receive_memory_inputs_batched(mock_get_step_uuid, plasma_store):
+    """Test that inputs in memory are retrieved in a single batch."""
+    orchest.Config.PIPELINE_DEFINITION_PATH = "tests/userdir/pipeline-order.json"
+
+    data_3 = generate_data(KILOBYTE)
+    mock_get_step_uuid.return_value = "uuid-3______________"
+    transfer.output_to_memory(data_3, name=None)
+
+    data_1 = generate_data(KILOBYTE)
+    mock_get_step_uuid.return_value = "uuid-1______________"
+    transfer.output_to_memory(data_1, name=None)
+
+    mock_get_step_uuid.return_value = "uuid-2______________"
+    with patch(
+        "orchest.transfer._get_outputs_memory", wraps=transfer._get_outputs_memory
+    ) as mock_get_outputs_memory:
+        input_data = transfer.get_inputs()
+
+    mock_get_outputs_memory.assert_called_once_with(
+        [
+            (step_uuid, transfer._convert_uuid_to_object_id(step_uuid))
+            for step_uuid in ["uuid-1______________", "uuid-3______________"]
+        ],
+        consumer="uuid-2______________",
+    )
+    input_data = input_data[orchest.Config._RESERVED_UNNAMED_OUTPUTS_STR]
+    assert (input_data[0] == data_1).all()
+    assert (input_data[1] == data_3).all()
+
+
+@patch("orchest.transfer.get_step_uuid")
+@patch("orchest.Config.STEP_DATA_DIR", "tests/userdir/.data/{step_uuid}")
+def test_receive_disk_inputs_concurrently(mock_get_step_uuid, plasma_store):
+    """Test that concurrently reading from disk maintains the order."""
+    orchest.Config.PIPELINE_DEFINITION_PATH = "tests/userdir/pipeline-order.json"
+
+    data_3 = get_test_table()
+    mock_get_step_uuid.return_value = "uuid-3______________"
+    transfer.output_to_disk(data_3, name=None)
+
+    data_1 = generate_data(KILOBYTE)
+    mock_get_step_uuid.return_value = "uuid-1______________"
+    transfer.output_to_disk(data_1, name=None)
+
+    mock_get_step_uuid.return_value = "uuid-2______________"
+    input_data = transfer.get_inputs(max_workers=2)
+    input_data = input_data[orchest.Config._RESERVED_UNNAMED_OUTPUTS_STR]
+    assert (input_data[0] == data_1).all()
+    assert input_data[1].equals(data_3)
+
+
+@pytest.mark.skipif(pickle.HIGHEST_PROTOCOL < 5, reason="Requires pickle protocol 5.")
+@pytest.mark.parametrize(
+    "method",
+    [transfer.output_to_disk, transfer.output_to_memory],
+    ids=["disk", "memory"],
+)
+@patch("orchest.transfer.get_step_uuid")
+@patch("orchest.Config.STEP_DATA_DIR", "tests/userdir/.data/{step_uuid}")
+@patch("orchest.Config.PICKLE_OOB_MIN_BUFFER_SIZE", KILOBYTE)
+def test_pickle5_out_of_band(mock_get_step_uuid, method, plasma_store):
+    orchest.Config.PIPELINE_DEFINITION_PATH = "tests/userdir/pipeline-basic.json"
+
+    data_1 = {"small": np.arange(3), "large": np.random.rand(4, KILOBYTE)}
+    _, serialization = transfer._serialize(data_1)
+    assert serialization == transfer.Serialization.PICKLE5_OOB
+
+    mock_get_step_uuid.return_value = "uuid-1______________"
+    method(data_1, name=None)
+
+    mock_get_step_uuid.return_value = "uuid-2______________"
+    input_data = transfer.get_inputs()
+    input_data = input_data[orchest.Config._RESERVED_UNNAMED_OUTPUTS_STR][0]
+    assert (input_data["small"] == data_1["small"]).all()
+    assert (input_data["large"] == data_1["large"]).all()
+
+
+@pytest.mark.skipif(pickle.HIGHEST_PROTOCOL < 5, reason="Requires pickle protocol 5.")
+@pytest.mark.parametrize(
+    "method",
+    [transfer.output_to_disk, transfer.output_to_memory],
+    ids=["disk", "memory"],
+)
+@patch("orchest.transfer.get_step_uuid")
+@patch("orchest.Config.STEP_DATA_DIR", "tests/userdir/.data/{step_uuid}")
+@patch("orchest.Config.PICKLE_OOB_MIN_BUFFER_SIZE", KILOBYTE)
+def test_pickle5_out_of_band_writable(mock_get_step_uuid, method, plasma_store):
+    orchest.Config.PIPELINE_DEFINITION_PATH = "tests/userdir/pipeline-basic.json"
+
+    # Columns of Python objects, other than strings, are pickled.
+    data_1 = {
+        "array": np.random.rand(4, KILOBYTE),
+        "df": pd.DataFrame(
+            {"C1": np.random.rand(KILOBYTE), "C2": [{"i": i} for i in range(KILOBYTE)]}
+        ),
+    }
+    _, serialization = transfer._serialize(data_1)
+    assert serialization == transfer.Serialization.PICKLE5_OOB
+
+    mock_get_step_uuid.return_value = "uuid-1______________"
+    method(data_1, name=None)
+
+    mock_get_step_uuid.return_value = "uuid-2______________"
+    input_data = transfer.get_inputs()
+    input_data = input_data[orchest.Config._RESERVED_UNNAMED_OUTPUTS_STR][0]
+    input_data["array"][0, 0] = -1
+    input_data["df"].iloc[0, 0] = -1
+    assert input_data["array"][0, 0] == -1
+    assert input_data["df"].iloc[0, 0] == -1
+    assert (input_data["array"][1:] == data_1["array"][1:]).all()
+
+    # Without copying, arrays are read-only views on the output.
+    input_data = transfer.get_inputs(copy=False)
+    input_data = input_data[orchest.Config._RESERVED_UNNAMED_OUTPUTS_STR][0]
+    assert not input_data["array"].flags.writeable
+    with pytest.raises(ValueError):
+        input_data["array"][0, 0] = -1
+    assert (input_data["array"] == data_1["array"]).all()
+
+
+@pytest.mark.parametrize(
+    "method",
+    [transfer.output_to_disk, transfer.output_to_memory],
+    ids=["disk", "memory"],
+)
+@patch("orchest.transfer.get_step_uuid")
+@patch("orchest.Config.STEP_DATA_DIR", "tests/userdir/.data/{step_uuid}")
+def test_pandas_arrow(mock_get_step_uuid, method, plasma_store):
+    orchest.Config.PIPELINE_DEFINITION_PATH = "tests/userdir/pipeline-basic.json"
+
+    data_1 = pd.DataFrame(
+        {
+            "C1": np.random.randint(-10000, 100000, size=20),
+            "C2": np.random.randn(20),
+            "C3": [str(i) if i % 2 else None for i in range(20)],
+        },
+        index=pd.Index([f"row-{i}" for i in range(20)], name="rows"),
+    )
+    _, serialization = transfer._serialize(data_1)
+    assert serialization == transfer.Serialization.PANDAS_ARROW
+
+    mock_get_step_uuid.return_value = "uuid-1______________"
+    method(data_1, name=None)
+
+    mock_get_step_uuid.return_value = "uuid-2______________"
+    input_data = transfer.get_inputs()
+    input_data = input_data[orchest.Config._RESERVED_UNNAMED_OUTPUTS_STR][0]
+    assert input_data.equals(data_1)
+
+    # The received DataFrame can be modified in place.
+    assert input_data["C1"].to_numpy().flags.writeable
+    assert input_data["C2"].to_numpy().flags.writeable
+    input_data.loc["row-0", "C2"] = -1.0
+    assert input_data.loc["row-0", "C2"] == -1.0
+
+    # Without copying, columns are read-only views on the output.
+    input_data = transfer.get_inputs(copy=False)
+    input_data = input_data[orchest.Config._RESERVED_UNNAMED_OUTPUTS_STR][0]
+    assert input_data.equals(data_1)
+    assert not input_data["C2"].to_numpy().flags.writeable
+
+
+@pytest.mark.parametrize(
+    "data_1",
+    [generate_data(KILOBYTE), get_test_record_batch(), get_test_table()],
+    ids=["basic", "record_batch", "table"],
+)
+@pytest.mark.parametrize("compression", ["lz4", "zstd"])
+@patch("orchest.transfer.get_step_uuid")
+@patch("orchest.Config.STEP_DATA_DIR", "tests/userdir/.data/{step_uuid}")
+def test_disk_compression(mock_get_step_uuid, data_1, compression, plasma_store):
+    orchest.Config.PIPELINE_DEFINITION_PATH = "tests/userdir/pipeline-basic.json"
+
+    mock_get_step_uuid.return_value = "uuid-1______________"
+    transfer.output_to_disk(data_1, name=None, compression=compression)
+
+    with open("tests/userdir/.data/uuid-1______________/HEAD", "r") as f:
+        *_, head_compression = transfer._interpret_metadata(f.read())
+    assert head_compression == compression
+
+    mock_get_step_uuid.return_value = "uuid-2______________"
+    input_data = transfer.get_inputs()
+    input_data = input_data[orchest.Config._RESERVED_UNNAMED_OUTPUTS_STR][0]
+
+    if isinstance(data_1, (pa.RecordBatch, pa.Table)):
+        assert input_data.equals(data_1)
+    else:
+        assert (input_data == data_1).all()
+
+
+@pytest.mark.parametrize(
+    "data_1",
+    [
+        pd.DataFrame({"C1": np.arange(20), "C2": np.random.randn(20)}),
+        get_test_record_batch(),
+        get_test_table(),
+    ],
+    ids=["pandas", "record_batch", "table"],
+)
+@patch("orchest.transfer.get_step_uuid")
+@patch("orchest.Config.STEP_DATA_DIR", "tests/userdir/.data/{step_uuid}")
+def test_disk_parquet(mock_get_step_uuid, data_1, plasma_store):
+    orchest.Config.PIPELINE_DEFINITION_PATH = "tests/userdir/pipeline-basic.json"
+
+    mock_get_step_uuid.return_value = "uuid-1______________"
+    transfer.output_to_disk(data_1, name="myname", parquet=True)
+
+    mock_get_step_uuid.return_value = "uuid-2______________"
+    input_data = transfer.get_inputs()["myname"]
+    assert type(input_data) is type(data_1)
+    assert input_data.equals(data_1)
+
+    if isinstance(data_1, pd.DataFrame):
+        assert input_data["C2"].to_numpy().flags.writeable
+        input_data.loc[0, "C2"] = -1.0
+        assert input_data.loc[0, "C2"] == -1.0
+
+
+@patch("orchest.transfer.get_step_uuid")
+@patch("orchest.Config.STEP_DATA_DIR", "tests/userdir/.data/{step_uuid}")
+def test_disk_parquet_columns_filters(mock_get_step_uuid, plasma_store):
+    orchest.Config.PIPELINE_DEFINITION_PATH = "tests/userdir/pipeline-basic.json"
+
+    data_1 = pd.DataFrame(
+        {"C1": np.arange(20), "C2": np.random.randn(20), "C3": np.random.randn(20)}
+    )
+    mock_get_step_uuid.return_value = "uuid-1______________"
+    transfer.output_to_disk(data_1, name="myname", parquet=True)
+
+    mock_get_step_uuid.return_value = "uuid-2______________"
+    input_data = transfer.get_inputs(
+        columns={"myname": ["C1", "C2"]}, filters={"myname": [("C1", ">=", 10)]}
+    )["myname"]
+
+    expected = data_1[data_1["C1"] >= 10][["C1", "C2"]]
+    assert list(input_data.columns) == ["C1", "C2"]
+    assert (input_data.values == expected.values).all()
+
+
+@patch("orchest.transfer.get_step_uuid")
+@patch("orchest.Config.STEP_DATA_DIR", "tests/userdir/.data/{step_uuid}")
+def test_output_stream(mock_get_step_uuid, plasma_store):
+    orchest.Config.PIPELINE_DEFINITION_PATH = "tests/userdir/pipeline-basic.json"
+
+    batches = [get_test_record_batch() for _ in range(3)]
+    mock_get_step_uuid.return_value = "uuid-1______________"
+    with transfer.output_stream(name="myname") as stream:
+        for batch in batches:
+            stream.write(batch)
+
+    mock_get_step_uuid.return_value = "uuid-2______________"
+    input_data = transfer.get_inputs()["myname"]
+    assert input_data.equals(pa.Table.from_batches(batches))
+
+    input_batches = list(transfer.iter_input_batches("myname"))
+    assert len(input_batches) == len(batches)
+    for input_batch, batch in zip(input_batches, batches):
+        assert input_batch.equals(batch)
+
+
+@patch("orchest.transfer.get_step_uuid")
+@patch("orchest.Config.STEP_DATA_DIR", "tests/userdir/.data/{step_uuid}")
+def test_output_stream_concurrent(mock_get_step_uuid, plasma_store):
+    orchest.Config.PIPELINE_DEFINITION_PATH = "tests/userdir/pipeline-basic.json"
+
+    # Like two processes of the same step that write the same output,
+    # the streams do not truncate each other's data.
+    batch_1, batch_2 = get_test_record_batch(), get_test_record_batch()
+    mock_get_step_uuid.return_value = "uuid-1______________"
+    with transfer.output_stream(name="myname") as stream_1:
+        stream_1.write(batch_1)
+        with transfer.output_stream(name="myname") as stream_2:
+            stream_2.write(batch_2)
+        stream_1.write(batch_1)
+
+    mock_get_step_uuid.return_value = "uuid-2______________"
+    input_data = transfer.get_inputs()["myname"]
+    assert input_data.equals(pa.Table.from_batches([batch_1, batch_1]))
+
+
+@patch("orchest.transfer.get_step_uuid")
+@patch("orchest.Config.STEP_DATA_DIR", "tests/userdir/.data/{step_uuid}")
+def test_output_stream_failure(mock_get_step_uuid, plasma_store):
+    orchest.Config.PIPELINE_DEFINITION_PATH = "tests/userdir/pipeline-basic.json"
+
+    mock_get_step_uuid.return_value = "uuid-1______________"
+    with pytest.raises(RuntimeError):
+        with transfer.output_stream(name="myname") as stream:
+            stream.write(get_test_record_batch())
+            raise RuntimeError()
+
+    mock_get_step_uuid.return_value = "uuid-2______________"
+    with pytest.raises(orchest.error.OutputNotFoundError):
+        transfer.get_inputs()
+
+
+@patch("orchest.transfer.get_step_uuid")
+@patch("orchest.Config.STEP_DATA_DIR", "tests/userdir/.data/{step_uuid}")
+def test_iter_input_batches_memory(mock_get_step_uuid, plasma_store):
+    orchest.Config.PIPELINE_DEFINITION_PATH = "tests/userdir/pipeline-basic.json"
+
+    data_1 = get_test_table()
+    mock_get_step_uuid.return_value = "uuid-1______________"
+    transfer.output_to_memory(data_1, name="myname", disk_fallback=False)
+
+    mock_get_step_uuid.return_value = "uuid-2______________"
+    input_batches = list(transfer.iter_input_batches("myname"))
+    assert pa.Table.from_batches(input_batches).equals(data_1)
+
+    # A missing input is reported before iterating.
+    with pytest.raises(orchest.error.OutputNotFoundError):
+        transfer.iter_input_batches("othername")
+
+
+@patch("orchest.transfer.get_step_uuid")
+@patch("orchest.Config.STEP_DATA_DIR", "tests/userdir/.data/{step_uuid}")
+def test_receive_inputs_lazy(mock_get_step_uuid, plasma_store):
+    orchest.Config.PIPELINE_DEFINITION_PATH = "tests/userdir/pipeline-order.json"
+
+    data_3 = generate_data(KILOBYTE)
+    mock_get_step_uuid.return_value = "uuid-3______________"
+    transfer.output_to_memory(data_3, name="output3")
+
+    data_1 = generate_data(KILOBYTE)
+    mock_get_step_uuid.return_value = "uuid-1______________"
+    transfer.output_to_disk(data_1, name="output1")
+
+    mock_get_step_uuid.return_value = "uuid-2______________"
+    input_data = transfer.get_inputs(lazy=True)
+    assert set(input_data) == {
+        orchest.Config._RESERVED_UNNAMED_OUTPUTS_STR,
+        "output1",
+        "output3",
+    }
+    assert not input_data.is_retrieved("output1")
+    assert not input_data.is_retrieved("output3")
+
+    assert (input_data["output3"] == data_3).all()
+    assert input_data.is_retrieved("output3")
+    assert not input_data.is_retrieved("output1")
+
+    input_data.prefetch().join()
+    assert input_data.is_retrieved("output1")
+    assert (input_data["output1"] == data_1).all()
+    assert input_data[orchest.Config._RESERVED_UNNAMED_OUTPUTS_STR] == []
+
+
+@patch("orchest.transfer.get_step_uuid")
+@patch("orchest.Config.STEP_DATA_DIR", "tests/userdir/.data/{step_uuid}")
+def test_receive_selected_inputs(mock_get_step_uuid, plasma_store):
+    orchest.Config.PIPELINE_DEFINITION_PATH = "tests/userdir/pipeline-order.json"
+
+    data_3 = generate_data(KILOBYTE)
+    mock_get_step_uuid.return_value = "uuid-3______________"
+    transfer.output_to_memory(data_3, name="output3")
+
+    data_1 = generate_data(KILOBYTE)
+    mock_get_step_uuid.return_value = "uuid-1______________"
+    transfer.output_to_memory(data_1, name="output1")
+
+    mock_get_step_uuid.return_value = "uuid-2______________"
+    with patch(
+        "orchest.transfer._get_outputs_memory", wraps=transfer._get_outputs_memory
+    ) as mock_get_outputs_memory:
+        input_data = transfer.get_inputs(names=["output1"])
+
+    obj_id = transfer._convert_uuid_to_object_id("uuid-1______________", "output1")
+    mock_get_outputs_memory.assert_called_once_with(
+        [("uuid-1______________", obj_id)], consumer="uuid-2______________"
+    )
+    assert "output3" not in input_data
+    assert (input_data["output1"] == data_1).all()
+
+    assert (transfer.get_input("output3") == data_3).all()
+
+    with pytest.raises(orchest.error.OutputNotFoundError):
+        transfer.get_input("output2")
+
+
+@patch("orchest.transfer.get_step_uuid")
+@patch("orchest.Config.STEP_DATA_DIR", "tests/userdir/.data/{step_uuid}")
+def test_multiple_outputs(mock_get_step_uuid, plasma_store, monkeypatch):
+    orchest.Config.PIPELINE_DEFINITION_PATH = "tests/userdir/pipeline-basic.json"
+
+    # Do as if we are in a Jupyter kernel, executing the first cell.
+    monkeypatch.delenv("ORCHEST_STEP_RUN_UUID", raising=False)
+    monkeypatch.setattr(transfer, "_get_kernel_execution_count", lambda: 1)
+
+    data_1 = generate_data(KILOBYTE)
+    data_2 = generate_data(KILOBYTE)
+    data_3 = generate_data(KILOBYTE)
+    mock_get_step_uuid.return_value = "uuid-1______________"
+    transfer.output_to_memory(data_1, name="output1")
+    transfer.output_to_disk(data_2, name="output2")
+    transfer.output_to_memory(data_3, name=None)
+
+    mock_get_step_uuid.return_value = "uuid-2______________"
+    input_data = transfer.get_inputs()
+    assert (input_data["output1"] == data_1).all()
+    assert (input_data["output2"] == data_2).all()
+    assert len(input_data[orchest.Config._RESERVED_UNNAMED_OUTPUTS_STR]) == 1
+    assert (input_data[orchest.Config._RESERVED_UNNAMED_OUTPUTS_STR][0] == data_3).all()
+
+    # Every output is a separate object in memory.
+    client = plasma.connect(plasma_store)
+    assert client.contains(
+        transfer._convert_uuid_to_object_id("uuid-1______________", "output1")
+    )
+    assert client.contains(transfer._convert_uuid_to_object_id("uuid-1______________"))
+
+    # Another process of the same run of the step, e.g. a child
+    # process, does not remove the outputs.
+    monkeypatch.setattr(transfer, "_cleared_step_runs", {})
+    mock_get_step_uuid.return_value = "uuid-1______________"
+    transfer.output_to_disk(data_1, name="output3")
+
+    mock_get_step_uuid.return_value = "uuid-2______________"
+    assert set(transfer.get_inputs()) == {
+        orchest.Config._RESERVED_UNNAMED_OUTPUTS_STR,
+        "output1",
+        "output2",
+        "output3",
+    }
+
+    # A new execution in the same kernel removes the outputs of the
+    # previous one, including the names it no longer outputs.
+    monkeypatch.setattr(transfer, "_get_kernel_execution_count", lambda: 2)
+    mock_get_step_uuid.return_value = "uuid-1______________"
+    transfer.output_to_memory(data_2, name="output2")
+
+    mock_get_step_uuid.return_value = "uuid-2______________"
+    input_data = transfer.get_inputs()
+    assert set(input_data) == {
+        orchest.Config._RESERVED_UNNAMED_OUTPUTS_STR,
+        "output2",
+    }
+    assert (input_data["output2"] == data_2).all()
+
+    # The run set by the orchest-api takes precedence.
+    monkeypatch.setenv("ORCHEST_STEP_RUN_UUID", uuid.uuid4().hex)
+    mock_get_step_uuid.return_value = "uuid-1______________"
+    transfer.output_to_memory(data_3, name="output3")
+
+    mock_get_step_uuid.return_value = "uuid-2______________"
+    assert set(transfer.get_inputs()) == {
+        orchest.Config._RESERVED_UNNAMED_OUTPUTS_STR,
+        "output3",
+    }
+
+
+@patch("orchest.transfer.get_step_uuid")
+@patch("orchest.Config.STEP_DATA_DIR", "tests/userdir/.data/{step_uuid}")
+def test_output_manifest_in_use(mock_get_step_uuid, plasma_store, monkeypatch):
+    orchest.Config.PIPELINE_DEFINITION_PATH = "tests/userdir/pipeline-basic.json"
+    monkeypatch.setattr(orchest.Config, "OBJECT_REPLACE_TIMEOUT", 0.1)
+
+    data_1 = generate_data(KILOBYTE)
+    data_2 = generate_data(KILOBYTE)
+    mock_get_step_uuid.return_value = "uuid-1______________"
+    transfer.output(data_1, name="output1")
+
+    # Another client, e.g. a receiving step, holds the manifest while a
+    # second name is output. The manifest cannot be replaced, thus the
+    # output falls back to disk.
+    client = plasma.connect(plasma_store)
+    manifest_id = transfer._get_manifest_object_id("uuid-1______________")
+    held = client.get_buffers([manifest_id], with_meta=True, timeout_ms=0)
+    assert held[0][0] is not None
+    transfer.output(data_2, name="output2")
+
+    mock_get_step_uuid.return_value = "uuid-2______________"
+    input_data = transfer.get_inputs()
+    assert (input_data["output1"] == data_1).all()
+    assert (input_data["output2"] == data_2).all()
+
+    # Once released, the manifest is replaced again.
+    del held
+    mock_get_step_uuid.return_value = "uuid-1______________"
+    transfer.output(data_2, name="output3")
+    key = transfer._get_output_key("uuid-1______________", "output3")
+    head_file, _ = transfer._get_output_paths("uuid-1______________", key)
+    assert not os.path.exists(head_file)
+
+    mock_get_step_uuid.return_value = "uuid-2______________"
+    assert (transfer.get_input("output3") == data_2).all()
+
+
+def test_reserve_store_memory_without_usage(plasma_store):
+    client = plasma.connect(plasma_store)
+    assert not os.path.exists(orchest.Config.get_store_usage_file())
+
+    # Exceptions of the body are not chained to the missing usage file.
+    with pytest.raises(RuntimeError) as exc_info:
+        with transfer._reserve_store_memory(
+            client, plasma.ObjectID.from_random(), KILOBYTE
+        ):
+            raise RuntimeError()
+    assert exc_info.value.__context__ is None
+
+
+@patch("orchest.transfer.get_step_uuid")
+@patch("orchest.Config.STEP_DATA_DIR", "tests/userdir/.data/{step_uuid}")
+def test_memory_store_usage(mock_get_step_uuid, plasma_store):
+    orchest.Config.PIPELINE_DEFINITION_PATH = "tests/userdir/pipeline-basic.json"
+
+    # Do as if the memory-server keeps count of the used memory.
+    usage_file = orchest.Config.get_store_usage_file()
+    with open(usage_file, "w") as f:
+        json.dump({"used": 0, "reservations": {}}, f)
+    reservations_dir = orchest.Config.get_store_reservations_dir()
+    os.makedirs(reservations_dir)
+
+    mock_get_step_uuid.return_value = "uuid-1______________"
+    transfer.output_to_memory(
+        generate_data(0.4 * PLASMA_STORE_CAPACITY), name=None, disk_fallback=False
+    )
+
+    # The reservation is only released by the memory-server, thus it
+    # still counts towards the used memory.
+    with open(usage_file, "r") as f:
+        usage = json.load(f)
+    obj_id = transfer._convert_uuid_to_object_id("uuid-1______________")
+    assert obj_id.binary().hex() in usage["reservations"]
+
+    with pytest.raises(MemoryError):
+        transfer.output_to_memory(
+            generate_data(0.6 * PLASMA_STORE_CAPACITY), name=None, disk_fallback=False
+        )
+
+    with open(usage_file, "r") as f:
+        assert json.load(f)["reservations"] == usage["reservations"]
+
+    # The lock of the reservation is released once the object is sealed,
+    # so that the memory-server can tell it apart from one in progress.
+    with open(os.path.join(reservations_dir, obj_id.binary().hex()), "r") as f:
+        fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+    os.remove(usage_file)
+    shutil.rmtree(reservations_dir)
+
+
+@patch("orchest.transfer.get_step_uuid")
+@patch("orchest.Config.STEP_DATA_DIR", "tests/userdir/.data/{step_uuid}")
+def test_prefetch_inputs(mock_get_step_uuid, plasma_store, monkeypatch):
+    orchest.Config.PIPELINE_DEFINITION_PATH = "tests/userdir/pipeline-basic.json"
+    monkeypatch.setenv("ORCHEST_MEMORY_EVICTION", "1")
+    monkeypatch.setattr(transfer, "_prefetch_thread", None)
+    monkeypatch.setattr(transfer, "_prefetch_released", False)
+
+    data_1 = generate_data(KILOBYTE)
+    data_2 = generate_data(KILOBYTE)
+    mock_get_step_uuid.return_value = "uuid-1______________"
+    transfer.output_to_memory(data_1, name="output1")
+    transfer.output_to_disk(data_2, name=None)
+
+    mock_get_step_uuid.return_value = "uuid-2______________"
+    with patch(
+        "orchest.transfer._resolve_inputs", wraps=transfer._resolve_inputs
+    ) as mock_resolve_inputs, patch(
+        "orchest.transfer._notify_eviction", wraps=transfer._notify_eviction
+    ) as mock_notify_eviction:
+        transfer._start_prefetch_inputs()
+        transfer._prefetch_thread.join()
+
+        # Prefetched outputs are not yet received by the step.
+        assert mock_resolve_inputs.call_count == 1
+        assert all(call.args[1] is None for call in mock_notify_eviction.call_args_list)
+        mock_notify_eviction.reset_mock()
+
+        input_data = transfer.get_inputs()
+        assert mock_resolve_inputs.call_count == 1
+        mock_notify_eviction.assert_called_once()
+        assert mock_notify_eviction.call_args.args[:2] == (
+            [
+                (
+                    "uuid-1______________",
+                    transfer._convert_uuid_to_object_id(
+                        "uuid-1______________", "output1"
+                    ),
+                )
+            ],
+            "uuid-2______________",
+        )
+
+        # The prefetched inputs are only returned once.
+        transfer.get_inputs()
+        assert mock_resolve_inputs.call_count == 2
+
+    assert (input_data["output1"] == data_1).all()
+    assert (input_data[orchest.Config._RESERVED_UNNAMED_OUTPUTS_STR][0] == data_2).all()
+
+    # Getting inputs in any other way releases the prefetched inputs.
+    monkeypatch.setattr(transfer, "_prefetch_thread", None)
+    monkeypatch.setattr(transfer, "_prefetch_released", False)
+    transfer._start_prefetch_inputs()
+    transfer._prefetch_thread.join()
+    assert transfer._prefetch_result is not None
+
+    assert (transfer.get_input("output1") == data_1).all()
+    assert transfer._prefetch_result is None
+    with patch(
+        "orchest.transfer._resolve_inputs", wraps=transfer._resolve_inputs
+    ) as mock_resolve_inputs:
+        transfer.get_inputs()
+        assert mock_resolve_inputs.call_count == 1
+
+
+@pytest.mark.parametrize(
+    "method",
+    [transfer.output_to_disk, transfer.output_to_memory],
+    ids=["disk", "memory"],
+)
+@patch("orchest.transfer.get_step_uuid")
+@patch("orchest.Config.STEP_DATA_DIR", "tests/userdir/.data/{step_uuid}")
+@patch("orchest.Config.PICKLE_OOB_MIN_BUFFER_SIZE", KILOBYTE)
+def test_numpy_serializer(mock_get_step_uuid, method, plasma_store):
+    orchest.Config.PIPELINE_DEFINITION_PATH = "tests/userdir/pipeline-basic.json"
+
+    data_1 = np.asfortranarray(np.random.rand(4, 32))
+    data_2 = {"array": np.random.rand(4, KILOBYTE)}
+    _, serialization = transfer._serialize(data_1)
+    assert serialization.name == "NUMPY"
+
+    # Arrays of Python objects and subclasses, which could hold state of
+    # their own, are pickled instead.
+    data_3 = np.array([CustomClass(1), CustomClass(2)])
+    data_4 = np.matrix([[1.0, 2.0], [3.0, 4.0]])
+    data_5 = np.ma.masked_array([1.0, 2.0, 3.0], mask=[False, True, False])
+    for data in [data_3, data_4, data_5]:
+        _, serialization = transfer._serialize(data)
+        assert serialization in [
+            transfer.Serialization.PICKLE,
+            transfer.Serialization.PICKLE5_OOB,
+        ]
+
+    mock_get_step_uuid.return_value = "uuid-1______________"
+    method(data_1, name=None)
+    method(data_2, name="dict")
+    method(data_3, name="objects")
+    method(data_4, name="matrix")
+    method(data_5, name="masked")
+
+    mock_get_step_uuid.return_value = "uuid-2______________"
+    input_data = transfer.get_inputs()
+    array = input_data[orchest.Config._RESERVED_UNNAMED_OUTPUTS_STR][0]
+    assert array.flags.f_contiguous
+    assert (array == data_1).all()
+    assert (input_data["objects"] == data_3).all()
+    assert type(input_data["matrix"]) is np.matrix
+    assert (input_data["matrix"] == data_4).all()
+    assert type(input_data["masked"]) is np.ma.MaskedArray
+    assert (input_data["masked"].mask == data_5.mask).all()
+    assert (input_data["masked"] == data_5).all()
+
+    # Received arrays, also inside other objects, can be modified.
+    for received in [array, input_data["dict"]["array"]]:
+        assert received.flags.writeable
+        received[0, 0] = -1
+        assert received[0, 0] == -1
+
+    # Without copying, arrays are read-only views on the output.
+    input_data = transfer.get_inputs(copy=False)
+    array = input_data[orchest.Config._RESERVED_UNNAMED_OUTPUTS_STR][0]
+    assert (array == data_1).all()
+    assert not array.flags.writeable
+    with pytest.raises(ValueError):
+        array[0, 0] = -1
+
+
+@patch("orchest.transfer.get_step_uuid")
+@patch("orchest.Config.STEP_DATA_DIR", "tests/userdir/.data/{step_uuid}")
+def test_scipy_sparse_serializer(mock_get_step_uuid, plasma_store):
+    sparse = pytest.importorskip("scipy.sparse")
+    orchest.Config.PIPELINE_DEFINITION_PATH = "tests/userdir/pipeline-basic.json"
+
+    data_1 = sparse.random(64, 32, density=0.1, format="csr")
+    data_2 = sparse.random(64, 32, density=0.1, format="coo")
+    assert transfer._serialize(data_1)[1].name == "SCIPY_SPARSE"
+
+    mock_get_step_uuid.return_value = "uuid-1______________"
+    transfer.output_to_memory(data_1, name="csr")
+    transfer.output_to_disk(data_2, name="coo")
+
+    mock_get_step_uuid.return_value = "uuid-2______________"
+    input_data = transfer.get_inputs()
+    assert input_data["csr"].format == "csr"
+    assert (input_data["csr"] != data_1).nnz == 0
+    assert input_data["coo"].format == "coo"
+    assert (input_data["coo"].tocsr() != data_2.tocsr()).nnz == 0
+
+
+@patch("orchest.transfer.get_step_uuid")
+@patch("orchest.Config.STEP_DATA_DIR", "tests/userdir/.data/{step_uuid}")
+def test_register_serializer(mock_get_step_uuid, plasma_store, monkeypatch):
+    orchest.Config.PIPELINE_DEFINITION_PATH = "tests/userdir/pipeline-basic.json"
+    monkeypatch.setattr(transfer, "_serializers", dict(transfer._serializers))
+
+    transfer.register_serializer(
+        CustomClass,
+        dumps=lambda obj: [str(obj.x).encode()],
+        loads=lambda buffers: CustomClass(buffers[0].to_pybytes().decode()),
+        name="custom",
+    )
+    with pytest.raises(ValueError):
+        transfer.register_serializer(
+            CustomClass, lambda obj: None, lambda buffers: None, name="PICKLE"
+        )
+
+    mock_get_step_uuid.return_value = "uuid-1______________"
+    transfer.output_to_memory(CustomClass("memory"), name="memory")
+    transfer.output_to_disk(CustomClass("disk"), name="disk", compression="lz4")
+
+    mock_get_step_uuid.return_value = "uuid-2______________"
+    input_data = transfer.get_inputs()
+    assert input_data["memory"] == CustomClass("memory")
+    assert input_data["disk"] == CustomClass("disk")
+
+
+@patch("orchest.transfer.get_step_uuid")
+@patch("orchest.Config.STEP_DATA_DIR", "tests/userdir/.data/{step_uuid}")
+def test_aio(mock_get_step_uuid, plasma_store):
+    orchest.Config.PIPELINE_DEFINITION_PATH = "tests/userdir/pipeline-basic.json"
+
+    data = {f"output{i}": generate_data(KILOBYTE) for i in range(4)}
+    batches = [get_test_record_batch() for _ in range(3)]
+
+    async def output():
+        # The concurrent outputs all end up in the manifest of the step.
+        await asyncio.gather(
+            *[aio.output(data_i, name=name) for name, data_i in data.items()]
+        )
+        async with aio.output_stream(name="stream") as stream:
+            for batch in batches:
+                await stream.write(batch)
+
+    mock_get_step_uuid.return_value = "uuid-1______________"
+    asyncio.run(output())
+
+    mock_get_step_uuid.return_value = "uuid-2______________"
+    input_data = asyncio.run(aio.get_inputs())
+    assert set(input_data) == set(data) | {
+        "stream",
+        orchest.Config._RESERVED_UNNAMED_OUTPUTS_STR,
+    }
+    for name, data_i in data.items():
+        assert (input_data[name] == data_i).all()
+    assert input_data["stream"].equals(pa.Table.from_batches(batches))
+
+
+@patch("orchest.transfer.get_step_uuid")
+@patch("orchest.Config.STEP_DATA_DIR", "tests/userdir/.data/{step_uuid}")
+def test_mmap_store(mock_get_step_uuid, mmap_store):
+    orchest.Config.PIPELINE_DEFINITION_PATH = "tests/userdir/pipeline-basic.json"
+
+    data = generate_data(KILOBYTE)
+    table = get_test_table()
+
+    mock_get_step_uuid.return_value = "uuid-1______________"
+    transfer.output_to_memory(data, name="array", disk_fallback=False)
+    transfer.output_to_memory(table, name="table", disk_fallback=False)
+
+    # The outputs and the manifest of the step are in the store. The
+    # manifest is overwritten by the second output, which is notified as
+    # a deletion and a new object.
+    assert len(os.listdir(mmap_store / "objects")) == 3
+    notifications = (mmap_store / "notifications").read_text().splitlines()
+    assert [line.split()[1] for line in notifications].count("-1") == 1
+    assert len(notifications) == 5
+
+    mock_get_step_uuid.return_value = "uuid-2______________"
+    input_data = transfer.get_inputs()
+    assert (input_data["array"] == data).all()
+    assert input_data["table"].equals(table)
+
+    with pytest.raises(MemoryError):
+        transfer.output_to_memory(
+            generate_data(PLASMA_STORE_CAPACITY), name=None, disk_fallback=False
+        )
+
+
+@patch("orchest.transfer.get_step_uuid")
+@patch("orchest.Config.STEP_DATA_DIR", "tests/userdir/.data/{step_uuid}")
+def test_get_spilled_output(mock_get_step_uuid, plasma_store):
+    orchest.Config.PIPELINE_DEFINITION_PATH = "tests/userdir/pipeline-basic.json"
+
+    # An output that was resolved to memory, but was spilled to disk by
+    # the memory-server before it was retrieved.
+    data = generate_data(KILOBYTE)
+    mock_get_step_uuid.return_value = "uuid-1______________"
+    transfer.output_to_disk(data, name="spilled")
+
+    obj_id = transfer._convert_uuid_to_object_id("uuid-1______________", "spilled")
+    assert (transfer._get_output_memory("uuid-1______________", obj_id) == data).all()
+
+    with pytest.raises(orchest.error.MemoryOutputNotFoundError):
+        transfer._get_output_memory("uuid-1______________")
+
+
+@patch("orchest.transfer.get_step_uuid")
+@patch("orchest.Config.STEP_DATA_DIR", "tests/userdir/.data/{step_uuid}")
+def test_iter_spilled_batches(mock_get_step_uuid, plasma_store):
+    orchest.Config.PIPELINE_DEFINITION_PATH = "tests/userdir/pipeline-basic.json"
+
+    table = get_test_table()
+    mock_get_step_uuid.return_value = "uuid-1______________"
+    transfer.output_to_disk(table, name="spilled")
+
+    obj_id = transfer._convert_uuid_to_object_id("uuid-1______________", "spilled")
+    input_batches = list(
+        transfer._iter_batches_memory("uuid-1______________", obj_id, "ARROW_TABLE")
+    )
+    assert pa.Table.from_batches(input_batches).equals(table)
+
+    obj_id = transfer._convert_uuid_to_object_id("uuid-1______________", "other")
+    with pytest.raises(orchest.error.MemoryOutputNotFoundError):
+        list(
+            transfer._iter_batches_memory("uuid-1______________", obj_id, "ARROW_TABLE")
+        )
+
+
+@patch("orchest.transfer.get_step_uuid")
+def test_disk_deduplication(mock_get_step_uuid, plasma_store, monkeypatch, tmp_path):
+    orchest.Config.PIPELINE_DEFINITION_PATH = "tests/userdir/pipeline-order.json"
+
+    # Like the runs of a job, the data directories are on the same mount
+    # as the blob store.
+    blob_store = tmp_path / "blobs"
+    monkeypatch.setattr(orchest.Config, "BLOB_STORE_DIR", str(blob_store))
+    monkeypatch.setattr(
+        orchest.Config, "STEP_DATA_DIR", str(tmp_path / "run-1" / "{step_uuid}")
+    )
+
+    data = generate_data(KILOBYTE)
+    for step_uuid in ["uuid-1______________", "uuid-3______________"]:
+        mock_get_step_uuid.return_value = step_uuid
+        transfer.output_to_disk(data, name=step_uuid[:6], deduplicate=True)
+
+    # Both outputs are links to the same blob.
+    [blob] = os.listdir(blob_store)
+    assert os.stat(blob_store / blob).st_nlink == 3
+
+    mock_get_step_uuid.return_value = "uuid-2______________"
+    input_data = transfer.get_inputs()
+    assert (input_data["uuid-1"] == data).all()
+    assert (input_data["uuid-3"] == data).all()
+
+    # Overwriting an output does not modify the blob.
+    mock_get_step_uuid.return_value = "uuid-1______________"
+    transfer.output_to_disk(generate_data(KILOBYTE), name="uuid-1")
+    assert os.stat(blob_store / blob).st_nlink == 2
+
+    mock_get_step_uuid.return_value = "uuid-2______________"
+    assert (transfer.get_inputs()["uuid-3"] == data).all()
+
+    # Another run that shares the blob store links to the same blob.
+    monkeypatch.setattr(
+        orchest.Config, "STEP_DATA_DIR", str(tmp_path / "run-2" / "{step_uuid}")
+    )
+    mock_get_step_uuid.return_value = "uuid-3______________"
+    transfer.output_to_disk(data, name="uuid-3", deduplicate=True)
+    assert os.listdir(blob_store) == [blob]
+    assert os.stat(blob_store / blob).st_nlink == 3
+
+
+def test_send_control_message(monkeypatch, tmp_path):
+    monkeypatch.setattr(orchest.Config, "STORE_SOCKET_NAME", str(tmp_path / "s.sock"))
+    monkeypatch.setattr(orchest.Config, "CONTROL_MESSAGE_MAX_SIZE", 64)
+
+    # No memory-server listens on the control socket.
+    assert not transfer._send_control_message(2, ["uuid-1,uuid-2"])
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sock:
+        sock.bind(orchest.Config.get_control_socket())
+
+        # The pairs do not fit in one message.
+        pairs = [f"uuid-{i},uuid-9" for i in range(6)]
+        assert transfer._send_control_message(2, pairs)
+
+        messages = [sock.recv(1024), sock.recv(1024)]
+        assert all(len(message) <= 64 for message in messages)
+        assert messages[0].startswith(b"2;") and messages[1].startswith(b"2;")
+        received = [message[2:].decode().split(";") for message in messages]
+        assert received[0] + received[1] == pairs
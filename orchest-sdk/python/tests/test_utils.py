@@ -0,0 +1,53 @@
+import json
+from unittest.mock import patch
+
+import orchest
+from orchest.pipeline import read_pipeline
+from orchest.utils import get_step_uuid
+
+
+def write_pipeline(pipeline_fname, file_path):
+    description = {
+        "name": "my-pipeline",
+        "uuid": "pipeline-uuid",
+        "settings": {},
+        "steps": {
+            "uuid-1______________": {
+                "title": "step-1",
+                "uuid": "uuid-1______________",
+                "file_path": file_path,
+                "incoming_connections": [],
+            },
+        },
+    }
+    with open(pipeline_fname, "w") as f:
+        json.dump(description, f)
+
+
+@patch("orchest.utils._request_json")
+def test_get_step_uuid_cache(mock_request_json, tmp_path, monkeypatch):
+    pipeline_fname = str(tmp_path / "pipeline.json")
+    write_pipeline(pipeline_fname, "my-notebook.ipynb")
+    monkeypatch.setattr(orchest.Config, "PIPELINE_DEFINITION_PATH", pipeline_fname)
+    monkeypatch.setenv("KERNEL_ID", "kernel-1")
+    monkeypatch.delenv("ORCHEST_STEP_UUID", raising=False)
+
+    launch_data = {
+        "jupyter_server_ip": "127.0.0.1",
+        "notebook_server_info": {"port": 8888, "base_url": "/jupyter"},
+    }
+    jupyter_sessions = [
+        {"kernel": {"id": "kernel-1"}, "notebook": {"path": "my-notebook.ipynb"}}
+    ]
+    mock_request_json.side_effect = [launch_data, jupyter_sessions] * 2
+
+    pipeline = read_pipeline(pipeline_fname)
+    assert get_step_uuid(pipeline) == "uuid-1______________"
+    assert get_step_uuid(pipeline) == "uuid-1______________"
+    assert mock_request_json.call_count == 2
+
+    # Changing the pipeline definition invalidates the cache.
+    write_pipeline(pipeline_fname, "./my-notebook.ipynb")
+    pipeline = read_pipeline(pipeline_fname)
+    assert get_step_uuid(pipeline) == "uuid-1______________"
+    assert mock_request_json.call_count == 4
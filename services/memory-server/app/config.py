@@ -5,7 +5,53 @@ from _orchest.internals import config as _config
 # Default location where the socket is created.
 STORE_SOCKET_NAME = os.path.join(_config.MEMORY_SERVER_SOCK_PATH, "plasma.sock")
 
+# Printed once the store and the manager are ready.
+READY_MESSAGE = _config.MEMORY_SERVER_READY_MESSAGE
+
+# Seconds to wait for the plasma store to accept connections.
+STORE_READY_TIMEOUT = 30
+
+# Default location of the store of the mmap backend.
+MMAP_STORE_DIR = os.path.join(_config.MEMORY_SERVER_SOCK_PATH, "mmap-store")
+
+# Where objects are spilled to, which is where the Orchest SDK outputs
+# data to disk. Formatted with the UUIDs of the pipeline and step.
+STEP_DATA_DIR = os.path.join(
+    _config.PROJECT_DIR, ".orchest/pipelines/{pipeline_uuid}/data/{step_uuid}"
+)
+
 # Used to determine whether objects need to be evicted.
 PIPELINE_FNAME = os.path.join(
     _config.PROJECT_DIR, os.environ.get("ORCHEST_PIPELINE_PATH", "")
 )
+
+# History of the memory usage of previous sessions of a pipeline, which
+# is used if the `data_passing_memory_size` is "auto". Formatted with
+# the UUID of the pipeline. The orchest-api sets it to a file in the
+# job directory for the runs of a job.
+MEMORY_HISTORY_FNAME = os.environ.get(
+    "ORCHEST_MEMORY_HISTORY_FNAME",
+    os.path.join(
+        _config.PROJECT_DIR, ".orchest/pipelines/{pipeline_uuid}/memory-history.json"
+    ),
+)
+
+# Sizing of the store if the `data_passing_memory_size` is "auto". The
+# store takes at most the memory limit of the container minus a relative
+# safety margin, and at least the minimum size. The size is based on the
+# peak usage of the last sessions (plus headroom), or on their capacity
+# times the growth factor if the store was full.
+AUTO_MEMORY_SIZE_MARGIN = 0.2
+AUTO_MEMORY_SIZE_MIN = 100 * 1000 ** 2
+AUTO_MEMORY_SIZE_DEFAULT = 1000 ** 3
+AUTO_MEMORY_SIZE_HEADROOM = 1.5
+AUTO_MEMORY_SIZE_GROWTH = 2
+# Relative usage of the capacity from which the store is considered to
+# be full.
+AUTO_MEMORY_SIZE_FULL = 0.9
+# Number of sessions to keep in the history.
+MEMORY_HISTORY_LENGTH = 5
+
+# Number of seconds between checks for reservations of memory in the
+# store of which the process died, see `manager.expire_reservations`.
+RESERVATION_CHECK_INTERVAL = 1
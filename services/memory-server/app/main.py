@@ -1,6 +1,7 @@
 import argparse
 import contextlib
 import os
+import socket
 import subprocess
 import time
 from typing import Tuple
@@ -9,6 +10,7 @@ import config
 import pyarrow as pa
 import utils
 from manager import start_manager
+from mmap_store import MmapStore
 
 
 def get_command_line_args():
@@ -35,11 +37,79 @@ def get_command_line_args():
         default=config.PIPELINE_FNAME,
         help="file containing pipeline definition",
     )
+    parser.add_argument(
+        "-b",
+        "--backend",
+        required=False,
+        default=None,
+        choices=["plasma", "mmap"],
+        help="store to pass data in memory",
+    )
+    parser.add_argument(
+        "-d",
+        "--mmap_store_dir",
+        required=False,
+        default=config.MMAP_STORE_DIR,
+        help="directory of the store of the mmap backend",
+    )
+    parser.add_argument(
+        "-t",
+        "--step_data_dir",
+        required=False,
+        default=config.STEP_DATA_DIR,
+        help="directory to spill objects to, formatted with the step UUID",
+    )
+    parser.add_argument(
+        "-y",
+        "--memory_history_fname",
+        required=False,
+        default=config.MEMORY_HISTORY_FNAME,
+        help="memory usage history, formatted with the pipeline UUID",
+    )
 
     args = parser.parse_args()
     return args
 
 
+def wait_for_plasma_store(
+    store_socket_name: str, proc: subprocess.Popen, timeout: float
+) -> None:
+    """Waits until the plasma store accepts connections on its socket.
+
+    The socket is probed with an exponential backoff, so that the store
+    is used as soon as it is up, also on a loaded host.
+
+    Args:
+        store_socket_name: The socket of the store.
+        proc: The process in which the store was started.
+        timeout: The number of seconds to wait at most.
+
+    Raises:
+        RuntimeError: If the store exited or did not accept connections
+            within the `timeout`.
+
+    """
+    deadline = time.monotonic() + timeout
+    delay = 0.01
+    while True:
+        rc = proc.poll()
+        if rc is not None:
+            raise RuntimeError(f'Plasma store exited unexpectedly with code "{rc}".')
+
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.connect(store_socket_name)
+            return
+        except OSError:
+            pass
+
+        if time.monotonic() > deadline:
+            raise RuntimeError(f"Plasma store not ready after {timeout} seconds.")
+
+        time.sleep(delay)
+        delay = min(2 * delay, 0.5)
+
+
 @contextlib.contextmanager
 def start_plasma_store(
     memory: int,
@@ -62,11 +132,7 @@ def start_plasma_store(
 
         proc = subprocess.Popen(command)
 
-        time.sleep(0.5)
-
-        rc = proc.poll()
-        if rc is not None:
-            raise RuntimeError(f'Plasma store exited unexpectedly with code "{rc}".')
+        wait_for_plasma_store(store_socket_name, proc, config.STORE_READY_TIMEOUT)
 
         yield store_socket_name, proc
 
@@ -77,12 +143,56 @@ def start_plasma_store(
         os.remove(store_socket_name)
 
 
+@contextlib.contextmanager
+def start_mmap_store(memory: int, store_dir: str) -> MmapStore:
+    """Creates a store of memory-mapped files.
+
+    Contrary to the plasma store it does not run in a separate process,
+    the Orchest SDK reads and writes the files of the store directly.
+
+    Args:
+        memory: The capacity of the store in bytes.
+        store_dir: The directory in which to create the store.
+
+    Yields:
+        The store.
+
+    """
+    store = MmapStore(store_dir, memory)
+    try:
+        yield store
+    finally:
+        store.close()
+
+
 def main():
     args = get_command_line_args()
 
+    # The memory usage is only recorded if the store is sized based on
+    # the history of the pipeline.
     memory = args.memory
+    history_fname = None
     if memory is None:
-        memory = utils.get_store_memory_size(args.pipeline_fname)
+        memory = utils.get_store_memory_size(
+            args.pipeline_fname, args.memory_history_fname
+        )
+        if utils.is_auto_memory_size(args.pipeline_fname):
+            history_fname = args.memory_history_fname
+
+    backend = args.backend
+    if backend is None:
+        backend = utils.get_store_backend(args.pipeline_fname)
+
+    if backend == "mmap":
+        with start_mmap_store(memory, args.mmap_store_dir) as store:
+            start_manager(
+                args.store_socket_name,
+                pipeline_fname=args.pipeline_fname,
+                step_data_dir=args.step_data_dir,
+                client=store,
+                history_fname=history_fname,
+            )
+        return
 
     with start_plasma_store(
         memory=memory,
@@ -95,7 +205,12 @@ def main():
 
         # Start the manager that handles eviction by listening to the
         # notification socket of the store.
-        start_manager(store_socket_name, pipeline_fname=args.pipeline_fname)
+        start_manager(
+            store_socket_name,
+            pipeline_fname=args.pipeline_fname,
+            step_data_dir=args.step_data_dir,
+            history_fname=history_fname,
+        )
 
 
 if __name__ == "__main__":
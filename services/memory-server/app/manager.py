@@ -1,7 +1,34 @@
+import contextlib
+import fcntl
+import hashlib
 import json
-
+import os
+import queue
+import socket
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+import config
 import networkx as nx
 import pyarrow.plasma as plasma
+import utils
+from metrics import WRITE_INTERVAL, Metrics
+
+# NOTE: have to match the Config of the Orchest SDK.
+METADATA_SEPARATOR = "; "
+UNNAMED_OUTPUT = "unnamed"
+CONTROL_MESSAGE_MAX_SIZE = 1 << 16
+
+# Relative growth of the peak memory usage from which the history is
+# updated, so that it is not written for every new object.
+MEMORY_HISTORY_MIN_GROWTH = 1.05
+
+# The kinds of events that are processed by the manager.
+NOTIFICATION = "notification"
+CONTROL_MESSAGES = "control_messages"
+SPILLED = "spilled"
 
 
 def construct_pipeline(pipeline_fname):
@@ -11,10 +38,14 @@ def construct_pipeline(pipeline_fname):
 
     try:
         auto_eviction = description["settings"].get("auto_eviction", False)
+        spill = description["settings"].get("data_passing_memory_spill", False)
     except KeyError:
         auto_eviction = False
+        spill = False
 
-    pipeline = nx.DiGraph(auto_eviction=auto_eviction)
+    pipeline = nx.DiGraph(
+        uuid=description.get("uuid"), auto_eviction=auto_eviction, spill=spill
+    )
 
     # If an interactive session is started the first time on a newly
     # created pipeline. Then the `pipeline.json` will not have a `steps`
@@ -53,6 +84,45 @@ def propagate_weights(old, new):
             pass
 
 
+def init_outstanding_receivers(pipeline):
+    """Counts per step the receiving steps that did not read its output.
+
+    The count is kept in the "outstanding" attribute of the node of the
+    step, so that `mark_received` can update it in constant time.
+    """
+    for uuid in pipeline.nodes:
+        num_receivers = pipeline.out_degree(uuid)
+        num_received = pipeline.out_degree(uuid, weight="weight")
+        pipeline.nodes[uuid]["outstanding"] = num_receivers - num_received
+
+
+def mark_received(pipeline, source, target):
+    """Sets that the `target` step has read the output of `source`.
+
+    Returns:
+        Whether all receiving steps of `source` have now read its
+        output, i.e. whether it just became evictable.
+    """
+    if not pipeline.has_edge(source, target) or pipeline[source][target]["weight"]:
+        return False
+
+    pipeline[source][target]["weight"] = 1
+    pipeline.nodes[source]["outstanding"] -= 1
+    return pipeline.nodes[source]["outstanding"] == 0
+
+
+def is_object_evictable(pipeline, uuid, receivers):
+    """Whether all receiving steps of `uuid` are in `receivers`."""
+    return uuid in pipeline and set(pipeline.successors(uuid)) <= receivers
+
+
+def get_pipeline_mtime(pipeline_fname):
+    try:
+        return os.stat(pipeline_fname).st_mtime_ns
+    except OSError:
+        return None
+
+
 def get_uuids_to_evict(pipeline):
     """Go over entire pipeline and check for objects to evict."""
     uuids = []
@@ -67,6 +137,25 @@ def get_uuids_to_evict(pipeline):
     return uuids
 
 
+def get_evictable_steps(pipeline):
+    """Maps the object IDs of the outputs to evict to their uuids."""
+    return {_convert_uuid_to_object_id(u): u for u in get_uuids_to_evict(pipeline)}
+
+
+def get_object_ids_to_evict(pipeline, object_receivers):
+    """Check for objects of named outputs to evict.
+
+    Such an object is evicted once all the steps that receive from the
+    step that output it have read it.
+    """
+    obj_ids = []
+    for obj_id, (uuid, receivers) in object_receivers.items():
+        if is_object_evictable(pipeline, uuid, receivers):
+            obj_ids.append(obj_id)
+
+    return obj_ids
+
+
 # TODO: could actually import this from orchest.transfer
 def _convert_uuid_to_object_id(uuid):
     bin_uuid = str.encode(uuid)
@@ -83,80 +172,776 @@ def delete(client, uuids):
     client.delete(bin_uuids)
 
 
-def start_manager(store_socket_name, pipeline_fname):
-    # Connect to the plasma store and subscribe to its notification
-    # socket.
-    client = plasma.connect(store_socket_name)
-    client.subscribe()
+@contextlib.contextmanager
+def open_usage(usage_fname):
+    """Opens the usage file with an exclusive lock.
+
+    The Orchest SDK adds reservations to the same file, under the same
+    lock, before it creates an object in the store.
+    """
+    with open(usage_fname, "r+") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        usage = json.load(f)
+        yield usage
+        f.seek(0)
+        f.truncate()
+        json.dump(usage, f)
+
+
+def init_usage(usage_fname, reservations_dir, obj_sizes, spill=False):
+    """Writes the usage file with the objects already in the store.
+
+    The Orchest SDK requests objects to be spilled if `spill` is set,
+    see `spill_objects`. It locks a file in `reservations_dir` for
+    every reservation, see `expire_reservations`.
+    """
+    os.makedirs(reservations_dir, exist_ok=True)
+    os.chmod(reservations_dir, 0o777)
+
+    with open(usage_fname, "w") as f:
+        json.dump(
+            {"used": sum(obj_sizes.values()), "reservations": {}, "spill": spill}, f
+        )
+
+    # Make the file writeable to all who have access to the path through
+    # the volume mount, just like the socket of the store.
+    os.chmod(usage_fname, 0o666)
+
+
+# NOTE: changes `obj_sizes` in place.
+def update_usage(usage_fname, obj_sizes, obj_id, data_size, mdata_size):
+    """Update the memory used by objects in the store.
+
+    The notification of a deleted object has negative sizes, the size of
+    the object is therefore kept in `obj_sizes`.
+    """
+    if data_size < 0:
+        size = -obj_sizes.pop(obj_id, 0)
+    else:
+        size = data_size + mdata_size
+        obj_sizes[obj_id] = size
+
+    with open_usage(usage_fname) as usage:
+        usage["used"] += size
 
-    # Keeps a `pipeline` in memory to maintain state. Everytime a step
-    # retrieves the output from another the weight of that connection
-    # (aka edge) is set to 1. If the outdegree of a step is equal to the
-    # sum of the weight of its outgoing edges, then we know that all the
-    # receiving steps have already read the output. If the
-    # `auto_eviction` is set in the `pipeline.json`, then this will
-    # cause that output to be removed from the store.
-    pipeline = construct_pipeline(pipeline_fname=pipeline_fname)
+        # The object is sealed, thus its reservation is accounted for in
+        # the used memory.
+        usage["reservations"].pop(obj_id.binary().hex(), None)
 
+    return usage["used"]
+
+
+def is_reservation_locked(reservations_dir, obj_hex):
+    """Returns whether the file of a reservation is locked.
+
+    The Orchest SDK holds a shared lock on the file for as long as it
+    makes the reservation, which is released by the kernel once its
+    process dies, also if it runs in another container.
+    """
+    try:
+        with open(os.path.join(reservations_dir, obj_hex), "r") as f:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except FileNotFoundError:
+        return False
+    except BlockingIOError:
+        return True
+    return False
+
+
+def expire_reservations(client, usage_fname, reservations_dir):
+    """Removes reservations for objects that will never be sealed.
+
+    The Orchest SDK reserves memory before it creates an object, which
+    is released once the object is sealed, see `update_usage`. If the
+    process that made the reservation dies in between, then it is never
+    released. A reservation is therefore expired once its file is no
+    longer locked and its object is not in the store, i.e. it was not
+    sealed before the lock was released. The files of reservations that
+    are released are removed as well, unless they are locked again.
+
+    Returns:
+        The (hex) IDs of the objects of the expired reservations.
+    """
+    with open_usage(usage_fname) as usage:
+        expired = [
+            obj_hex
+            for obj_hex in usage["reservations"]
+            if not is_reservation_locked(reservations_dir, obj_hex)
+            and not client.contains(plasma.ObjectID(bytes.fromhex(obj_hex)))
+        ]
+        for obj_hex in expired:
+            del usage["reservations"][obj_hex]
+
+        # The Orchest SDK only creates files under the lock of the usage
+        # file, thus they cannot be removed while they are locked.
+        for obj_hex in os.listdir(reservations_dir):
+            if obj_hex not in usage["reservations"] and not is_reservation_locked(
+                reservations_dir, obj_hex
+            ):
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(os.path.join(reservations_dir, obj_hex))
+
+    return expired
+
+
+def record_memory_usage(history_fname, session):
+    """Records the memory usage of the current session in the history.
+
+    The history of the pipeline is used to size the store of its next
+    sessions, see `utils.get_auto_memory_size`. Only the last sessions
+    are kept.
+    """
+    sessions = utils.read_memory_history(history_fname)
+    sessions = [s for s in sessions if s["started"] != session["started"]]
+    sessions.append(session)
+
+    # The history only improves the sizing of the store, thus failing to
+    # write it should not stop the manager.
+    try:
+        os.makedirs(os.path.dirname(history_fname), exist_ok=True)
+        with open(f"{history_fname}.tmp", "w") as f:
+            json.dump(sessions[-config.MEMORY_HISTORY_LENGTH :], f)
+        os.replace(f"{history_fname}.tmp", history_fname)
+    except OSError as e:
+        print("Failed to record memory usage:", e)
+
+
+def _get_object_step(pipeline, obj_id, name):
+    """Returns the uuid of the step that output an object, if any.
+
+    The ID of the unnamed output of a step is the first 20 bytes of its
+    uuid, the ID of a named output is the SHA-1 digest of its uuid and
+    name. See ``orchest.transfer._convert_uuid_to_object_id``.
+    """
+    for uuid in pipeline.nodes:
+        if name == UNNAMED_OUTPUT:
+            if _convert_uuid_to_object_id(uuid) == obj_id:
+                return uuid
+        else:
+            key = f"{uuid}{METADATA_SEPARATOR}{name}"
+            if hashlib.sha1(str.encode(key)).digest() == obj_id.binary():
+                return uuid
+
+    return None
+
+
+def _chown_like(path, reference):
+    """Gives `path` the owner and group of the `reference` path.
+
+    Only the owner is changed, the permissions are left as is. If the
+    manager is not allowed to change the owner, then `path` is kept as
+    it is.
+    """
+    stat = os.stat(reference)
+    try:
+        os.chown(path, stat.st_uid, stat.st_gid)
+    except PermissionError:
+        pass
+
+
+def spill_object(client, pipeline, step_data_dir, obj_id):
+    """Moves an object from the store to the data directory of its step.
+
+    The data and HEAD file are written just like the Orchest SDK outputs
+    data to disk, with the timestamp of the object. Thus the SDK gets
+    the data from disk once the object is deleted from the store. The
+    object is not spilled if the step output data with the same name to
+    disk at the same time or later, which must not be overwritten.
+
+    Returns:
+        Whether the object was spilled.
+    """
+    [(mdata, buffer)] = client.get_buffers([obj_id], timeout_ms=0, with_meta=True)
+    if buffer is None:
+        return False
+
+    # E.g. "1; 2021-01-01T00:00:00; ARROW_TABLE; name", the HEAD file
+    # is the metadata without the identifier.
+    _, _, head = bytes(mdata).decode("utf-8").partition(METADATA_SEPARATOR)
+    timestamp, serialization, name = head.split(METADATA_SEPARATOR)[:3]
+
+    uuid = _get_object_step(pipeline, obj_id, name)
+    if uuid is None:
+        return False
+
+    data_dir = step_data_dir.format(
+        pipeline_uuid=pipeline.graph["uuid"], step_uuid=uuid
+    )
+    if not os.path.isdir(data_dir):
+        os.makedirs(data_dir)
+        _chown_like(data_dir, os.path.dirname(data_dir))
+
+    if name == UNNAMED_OUTPUT:
+        head_fname, data_fname = "HEAD", f"{uuid}.{serialization}"
+    else:
+        key = obj_id.binary().hex()
+        head_fname, data_fname = f"HEAD.{key}", f"{uuid}.{key}.{serialization}"
+
+    # The timestamps are in ISO format with the same precision, thus
+    # they are ordered like strings.
+    try:
+        with open(os.path.join(data_dir, head_fname), "r") as f:
+            if f.read().split(METADATA_SEPARATOR)[0] >= timestamp:
+                return False
+    except FileNotFoundError:
+        pass
+
+    # The HEAD file is written last, because it makes the SDK consider
+    # the data on disk. The files are owned by the owner of the data
+    # directory, so that the step can remove them when it runs again.
+    for fname, content in [(data_fname, buffer), (head_fname, head.encode("utf-8"))]:
+        path = os.path.join(data_dir, fname)
+        with open(f"{path}.tmp", "wb") as f:
+            f.write(content)
+        _chown_like(f"{path}.tmp", data_dir)
+        os.replace(f"{path}.tmp", path)
+
+    # The store does not delete objects that are referenced.
+    del mdata, buffer
+    client.delete([obj_id])
+
+    return True
+
+
+def get_object_ids_to_spill(consumed, lru_obj_ids, obj_sizes, size):
+    """Selects the objects to spill to free at least `size` bytes.
+
+    Objects that have been read by all the steps that receive from their
+    step, i.e. the IDs in `consumed`, are selected first, then the least
+    recently used objects.
+    """
+    candidates = [obj_id for obj_id in lru_obj_ids if obj_id in consumed]
+    candidates += [obj_id for obj_id in lru_obj_ids if obj_id not in consumed]
+
+    obj_ids = []
+    for obj_id in candidates:
+        if size <= 0:
+            break
+
+        obj_ids.append(obj_id)
+        size -= obj_sizes.get(obj_id, 0)
+
+    return obj_ids
+
+
+def spill_objects(client, step_data_dir, requests, events):
+    """Spills the objects of the `requests` queue to disk.
+
+    Runs in a thread, so that the manager keeps processing events while
+    the objects are written, in particular the notifications of the
+    spilled objects. Every object is deleted from the store as soon as
+    it is written, thus its memory is released before the next object
+    is spilled. Whether it was spilled is put in the `events` queue.
+    """
+    while True:
+        pipeline, obj_ids = requests.get()
+        for obj_id in obj_ids:
+            try:
+                spilled = spill_object(client, pipeline, step_data_dir, obj_id)
+            except Exception as e:
+                # The thread has to keep running for later requests.
+                print("Failed to spill object:", obj_id, e)
+                spilled = False
+
+            events.put((SPILLED, (obj_id, spilled)))
+
+
+def receive_notifications(client, events):
+    """Puts the notifications of the store in the `events` queue.
+
+    Runs in a thread, with a `client` that is used for nothing else,
+    because the plasma client holds a lock while it waits for the next
+    notification.
+    """
     while True:
         try:
-            obj_id, data_size, mdata_size = client.get_next_notification()
-            print("Got new notification")
+            notification = client.get_next_notification()
         except OSError:
             # "Failed to read object notification from Plasma socket"
             print("Failed to read object notification from Plasma socket")
             continue
 
-        mdata = client.get_metadata([obj_id], timeout_ms=1000)
+        events.put((NOTIFICATION, notification))
 
-        # Whenever a sealed object is deleted, it also triggers a
-        # notification. However, we do not need to check for eviction in
-        # that case.
-        if mdata[0] is None:
-            continue
 
-        # TODO: change print to logging to stdout
-        print("Received:", obj_id)
-        mdata = bytes(mdata[0])
+def receive_control_messages(sock, events):
+    """Puts the messages of the control channel in the `events` queue.
 
-        # An example message: b'2;uuid-1,uuid-2'. Meaning that step with
-        # 'uuid-2' has retrieved the output from step with 'uuid-1'.
-        identifier, _, mdata = mdata.partition(b";")
-        if identifier != b"2":
-            continue
+    All messages that are pending at once are put in the queue together,
+    so that they are processed as one batch. Every message is put with
+    the address of its sender, which is `None` unless the sender expects
+    a reply.
+    """
+    while True:
+        messages = [sock.recvfrom(CONTROL_MESSAGE_MAX_SIZE)]
+        while True:
+            try:
+                messages.append(
+                    sock.recvfrom(CONTROL_MESSAGE_MAX_SIZE, socket.MSG_DONTWAIT)
+                )
+            except BlockingIOError:
+                break
+
+        events.put((CONTROL_MESSAGES, messages))
 
-        decoded_mdata = mdata.decode(encoding="utf-8")
-        source, target = decoded_mdata.split(",")
 
-        # Create new pipeline and propagate weights. A new pipeline is
-        # created to account for a possible change in the pipeline. A
-        # user might have added or removed multiple steps or
-        # connections.
-        new_pipeline = construct_pipeline(pipeline_fname=pipeline_fname)
-        propagate_weights(pipeline, new_pipeline)
+def open_control_channel(control_socket_name):
+    """Opens the socket that the Orchest SDK sends messages to.
 
-        # The `pipeline` instance is kept in memory so that the state of
-        # the eviction manager is maintained during the lifecycle of the
-        # store.
-        pipeline = new_pipeline
+    Messages are datagrams that are formatted just like the metadata of
+    the "ping" objects that the SDK puts in the store otherwise, e.g.
+    b'2;uuid-1,uuid-2'. Thus the store is only used for data.
+    """
+    try:
+        os.remove(control_socket_name)
+    except FileNotFoundError:
+        pass
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    sock.bind(control_socket_name)
+
+    # Make the socket writeable to all who have access to the path
+    # through the volume mount, just like the socket of the store.
+    os.chmod(control_socket_name, 0o666)
+
+    return sock
+
+
+class ManagerState:
+    """The state of the manager, which is kept across events.
+
+    Args:
+        client: The client of the store.
+        store_socket_name: The socket of the store, next to which the
+            usage file, the reservations and the metrics are kept.
+        pipeline_fname: The pipeline definition, which determines when
+            objects are evicted and whether they are spilled.
+        step_data_dir: Where objects are spilled to, formatted with the
+            UUIDs of the pipeline and step.
+        history_fname: The history of the memory usage of the pipeline,
+            formatted with its UUID. The memory usage is not recorded if
+            it is `None`.
+
+    """
+
+    def __init__(
+        self,
+        client,
+        store_socket_name,
+        pipeline_fname,
+        step_data_dir,
+        history_fname=None,
+    ):
+        self.pipeline_fname = pipeline_fname
+        self.step_data_dir = step_data_dir
+
+        # Keeps count of the memory that is used by objects in the
+        # store, so that the Orchest SDK does not have to list all
+        # objects to check whether an object fits in the store.
+        # NOTE: the Orchest SDK looks for the usage file at this
+        # location, also when the store is not a plasma store.
+        self.usage_fname = f"{store_socket_name}.usage"
+        self.reservations_dir = f"{store_socket_name}.reservations"
+        self.obj_sizes = {
+            obj_id: info["data_size"] + info["metadata_size"]
+            for obj_id, info in client.list().items()
+        }
+
+        # Keeps a `pipeline` in memory to maintain state. Everytime a
+        # step retrieves the output from another the weight of that
+        # connection (aka edge) is set to 1. If the outdegree of a step
+        # is equal to the sum of the weight of its outgoing edges, then
+        # we know that all the receiving steps have already read the
+        # output. If the `auto_eviction` is set in the `pipeline.json`,
+        # then this will cause that output to be removed from the store.
+        # The pipeline is only reconstructed if the `pipeline.json`
+        # changed, otherwise a notification updates just the edges that
+        # it concerns.
+        self.pipeline_mtime = get_pipeline_mtime(pipeline_fname)
+        self.pipeline = construct_pipeline(pipeline_fname=pipeline_fname)
+        init_outstanding_receivers(self.pipeline)
+        init_usage(
+            self.usage_fname,
+            self.reservations_dir,
+            self.obj_sizes,
+            spill=self.pipeline.graph["spill"],
+        )
+
+        # The IDs of the objects that contain output data, from least to
+        # most recently written or read. If the
+        # `data_passing_memory_spill` is set in the `pipeline.json`,
+        # then objects are spilled to disk in this order (after the ones
+        # that have been read by all receivers) when the Orchest SDK
+        # requests room for a new object.
+        self.lru_obj_ids = OrderedDict()
+
+        # The requests for the thread that spills objects to disk, see
+        # `spill`, and the objects that it has yet to spill mapped to
+        # their size.
+        self.spill_requests = queue.Queue()
+        self.spilling = {}
+
+        # Every named output of a step is a separate object, which is
+        # evicted independently of the other outputs of the step. Maps
+        # the (hex) ID of such an object to the uuid of its step and the
+        # set of uuids of the steps that have read it.
+        self.object_receivers = {}
+
+        # Maps the object ID of the unnamed output of a step to its
+        # uuid, for the steps whose output has been read by all their
+        # receiving steps. The uuids of the steps that became evictable,
+        # or that output again while evictable, since the last eviction
+        # and the (hex) IDs of the objects of named outputs that have
+        # been read by all their receiving steps are evicted if
+        # `auto_eviction` is set. Thus every object is deleted once.
+        self.evictable_steps = get_evictable_steps(self.pipeline)
+        self.uuids_to_evict = set(self.evictable_steps.values())
+        self.evictable_obj_hexes = set()
+
+        # The memory usage of this session, which is recorded in the
+        # history of the pipeline if the store is sized automatically.
+        self.history_fname = None
+        if history_fname is not None:
+            self.history_fname = history_fname.format(
+                pipeline_uuid=self.pipeline.graph["uuid"]
+            )
+        self.session = {
+            "started": datetime.utcnow().isoformat(),
+            "capacity": client.store_capacity(),
+            "peak": sum(self.obj_sizes.values()),
+            "spilled": False,
+        }
+
+        # Metrics of the store, which are written next to its socket and
+        # sent in reply to a query over the control channel.
+        # NOTE: the orchest-api looks for the metrics file at this
+        # location.
+        self.metrics = Metrics(
+            f"{store_socket_name}.metrics.prom", client.store_capacity()
+        )
+        self.metrics.set("used_bytes", sum(self.obj_sizes.values()))
+
+
+def handle_notification(client, state, obj_id, data_size, mdata_size):
+    """Processes the notification of a sealed or deleted object.
+
+    The Orchest SDK puts "ping" objects in the store, of which the
+    metadata is a message, if the control channel is unavailable.
+
+    Returns:
+        The message of a "ping" object, as the list of messages that
+        `handle_control_messages` takes, or `None`.
+    """
+    used = update_usage(
+        state.usage_fname, state.obj_sizes, obj_id, data_size, mdata_size
+    )
+    if data_size < 0:
+        state.lru_obj_ids.pop(obj_id, None)
+    state.metrics.set("used_bytes", used)
+    state.metrics.set("objects", len(state.lru_obj_ids))
+
+    if used > state.session["peak"] * MEMORY_HISTORY_MIN_GROWTH:
+        state.session["peak"] = used
+        if state.history_fname is not None:
+            record_memory_usage(state.history_fname, state.session)
+
+    # Whenever a sealed object is deleted, it also triggers a
+    # notification. However, we do not need to check for eviction in
+    # that case, and getting the metadata of the deleted object would
+    # block until the timeout.
+    if data_size < 0:
+        return None
+
+    mdata = client.get_metadata([obj_id], timeout_ms=1000)
+
+    # The object could already be deleted by its step.
+    if mdata[0] is None:
+        return None
+
+    mdata = bytes(mdata[0])
+    identifier = mdata.partition(b";")[0]
+    if identifier == b"1":
+        if obj_id in state.evictable_steps:
+            state.uuids_to_evict.add(state.evictable_steps[obj_id])
+        state.lru_obj_ids[obj_id] = None
+        state.lru_obj_ids.move_to_end(obj_id)
+        state.metrics.set("objects", len(state.lru_obj_ids))
+        state.metrics.inc("written_objects_total")
+        state.metrics.inc("written_bytes_total", data_size)
+        return None
+    elif identifier not in [b"2", b"4"]:
+        return None
+
+    return [(mdata, None)]
+
+
+def handle_control_messages(client, state, control_sock, messages):
+    """Processes messages of the control channel.
+
+    An example message: b'2;uuid-1,uuid-2'. Meaning that step with
+    'uuid-2' has retrieved the output from step with 'uuid-1'. A step
+    that retrieves multiple outputs at once sends all of the pairs in
+    one message, e.g. b'2;uuid-1,uuid-3;uuid-2,uuid-3'. Pairs of named
+    outputs also contain the hex ID of the object that was read, e.g.
+    b'2;uuid-1,uuid-2,<object ID>'.
+
+    A request to spill objects, e.g. b'4;1024', states the number of
+    bytes to free. An output of 1024 bytes that did not fit in the store
+    is reported as b'5;1024'. The metrics are queried with b'6', to
+    which the JSON of the metrics is the reply.
+
+    Args:
+        messages: The messages with the address of their sender, which
+            is `None` unless the sender expects a reply.
+
+    Returns:
+        The pairs of steps (and objects) of which the outputs are read,
+        see `handle_received_outputs`.
+    """
+    pairs = []
+    spill_size = 0
+    for message, address in messages:
+        identifier, _, mdata = message.partition(b";")
+        if identifier == b"2":
+            pairs.extend(mdata.decode(encoding="utf-8").split(";"))
+        elif identifier == b"4":
+            spill_size = max(spill_size, int(mdata))
+            state.metrics.inc("spill_requests_total")
+        elif identifier == b"5":
+            state.metrics.inc("disk_fallbacks_total")
+            state.metrics.inc("disk_fallback_bytes_total", int(mdata))
+        elif identifier == b"6" and address is not None:
+            try:
+                control_sock.sendto(state.metrics.to_json().encode("utf-8"), address)
+            except OSError:
+                # The sender no longer waits for the reply.
+                pass
+
+    if spill_size and state.pipeline.graph.get("spill", False):
+        spill(state, spill_size)
+
+    return pairs
+
+
+def spill(state, size):
+    """Requests objects to be spilled to free at least `size` bytes.
+
+    The objects are spilled by the thread that runs `spill_objects`.
+    Objects that are already being spilled count towards the `size`.
+    """
+    size -= sum(state.spilling.values())
+    if size <= 0:
+        return
+
+    consumed = set(state.evictable_steps)
+    consumed.update(
+        plasma.ObjectID(bytes.fromhex(h)) for h in state.evictable_obj_hexes
+    )
+    obj_ids = get_object_ids_to_spill(
+        consumed, state.lru_obj_ids, state.obj_sizes, size
+    )
+    for obj_id in obj_ids:
+        state.spilling[obj_id] = state.obj_sizes.get(obj_id, 0)
+
+        # An object that could not be spilled is not selected again.
+        state.lru_obj_ids.pop(obj_id, None)
+
+    print("Spilling objects:", obj_ids)
+    state.spill_requests.put((state.pipeline, obj_ids))
+
+    # The store was too small for this session.
+    if not state.session["spilled"]:
+        state.session["spilled"] = True
+        if state.history_fname is not None:
+            record_memory_usage(state.history_fname, state.session)
+
+
+def handle_spilled(state, obj_id, spilled):
+    """Processes an object of which the spill thread is done."""
+    size = state.spilling.pop(obj_id, 0)
+    if spilled:
+        state.metrics.inc("spilled_objects_total")
+        state.metrics.inc("spilled_bytes_total", size)
+
+
+def reload_pipeline(state):
+    """Reconstructs the pipeline if its definition changed.
+
+    A user might have added or removed multiple steps or connections.
+    The weights of the edges are propagated to the new pipeline, so that
+    the state of the eviction manager is maintained during the lifecycle
+    of the store.
+    """
+    mtime = get_pipeline_mtime(state.pipeline_fname)
+    if mtime == state.pipeline_mtime:
+        return
+
+    new_pipeline = construct_pipeline(pipeline_fname=state.pipeline_fname)
+    propagate_weights(state.pipeline, new_pipeline)
+    init_outstanding_receivers(new_pipeline)
+
+    if new_pipeline.graph["spill"] != state.pipeline.graph["spill"]:
+        with open_usage(state.usage_fname) as usage:
+            usage["spill"] = new_pipeline.graph["spill"]
+    state.pipeline, state.pipeline_mtime = new_pipeline, mtime
+
+    new_evictable_steps = get_evictable_steps(state.pipeline)
+    state.uuids_to_evict.update(
+        uuid
+        for obj_id, uuid in new_evictable_steps.items()
+        if obj_id not in state.evictable_steps
+    )
+    state.uuids_to_evict.intersection_update(new_evictable_steps.values())
+    state.evictable_steps = new_evictable_steps
+    state.evictable_obj_hexes = set(
+        get_object_ids_to_evict(state.pipeline, state.object_receivers)
+    )
+
+
+def handle_received_outputs(state, pairs):
+    """Marks the outputs of the `pairs` as read by their target steps.
+
+    Every pair is formatted as "source,target" for the unnamed output of
+    the source step, or as "source,target,<object ID>" for one of its
+    named outputs.
+    """
+    reload_pipeline(state)
+
+    for pair in pairs:
+        source, target, *obj_hex = pair.split(",")
+        if obj_hex:
+            _, receivers = state.object_receivers.setdefault(
+                obj_hex[0], (source, set())
+            )
+            receivers.add(target)
+            if is_object_evictable(state.pipeline, source, receivers):
+                state.evictable_obj_hexes.add(obj_hex[0])
+            read_obj_id = plasma.ObjectID(bytes.fromhex(obj_hex[0]))
+        else:
+            read_obj_id = _convert_uuid_to_object_id(source)
+            if mark_received(state.pipeline, source, target):
+                state.evictable_steps[read_obj_id] = source
+                state.uuids_to_evict.add(source)
+
+        if read_obj_id in state.lru_obj_ids:
+            state.lru_obj_ids.move_to_end(read_obj_id)
+            state.metrics.inc("read_objects_total")
+            state.metrics.inc("read_bytes_total", state.obj_sizes.get(read_obj_id, 0))
+
+
+def evict(client, state):
+    """Deletes the objects that are read by all receiving steps."""
+    evicted = {_convert_uuid_to_object_id(u) for u in state.uuids_to_evict}
+    evicted.update(plasma.ObjectID(bytes.fromhex(h)) for h in state.evictable_obj_hexes)
+    evicted = [obj_id for obj_id in evicted if obj_id in state.lru_obj_ids]
+    state.metrics.inc("evicted_objects_total", len(evicted))
+    state.metrics.inc(
+        "evicted_bytes_total", sum(state.obj_sizes.get(o, 0) for o in evicted)
+    )
+
+    delete(client, state.uuids_to_evict)
+
+    print("Evicting:", state.uuids_to_evict)
+    state.uuids_to_evict = set()
+
+    client.delete(
+        [plasma.ObjectID(bytes.fromhex(h)) for h in state.evictable_obj_hexes]
+    )
+    for obj_hex in state.evictable_obj_hexes:
+        del state.object_receivers[obj_hex]
+
+    print("Evicting objects:", state.evictable_obj_hexes)
+    state.evictable_obj_hexes = set()
+
+
+def start_manager(
+    store_socket_name, pipeline_fname, step_data_dir, client=None, history_fname=None
+):
+    # Connect to the plasma store, unless the client of another store is
+    # given, and subscribe to its notification socket. Notifications are
+    # read by a separate client of the plasma store, see
+    # `receive_notifications`.
+    if client is None:
+        client = plasma.connect(store_socket_name)
+        notification_client = plasma.connect(store_socket_name)
+        spill_client = plasma.connect(store_socket_name)
+    else:
+        notification_client = spill_client = client
+    notification_client.subscribe()
+
+    # The notifications of the store and the messages of the control
+    # channel are processed one at a time, in the order they arrive.
+    # NOTE: the Orchest SDK looks for the control socket at this
+    # location, also when the store is not a plasma store.
+    events = queue.Queue()
+    control_sock = open_control_channel(f"{store_socket_name}.control")
+    state = ManagerState(
+        client, store_socket_name, pipeline_fname, step_data_dir, history_fname
+    )
+    for target, args in [
+        (receive_notifications, (notification_client, events)),
+        (receive_control_messages, (control_sock, events)),
+        (spill_objects, (spill_client, step_data_dir, state.spill_requests, events)),
+    ]:
+        threading.Thread(target=target, args=args, daemon=True).start()
+
+    # The orchest-api waits for this message before the steps of the
+    # pipeline are run.
+    print(config.READY_MESSAGE, flush=True)
+
+    reservations_checked_at = time.monotonic()
+    while True:
+        if (
+            time.monotonic() - reservations_checked_at
+            > config.RESERVATION_CHECK_INTERVAL
+        ):
+            expired = expire_reservations(
+                client, state.usage_fname, state.reservations_dir
+            )
+            if expired:
+                print("Expired reservations:", expired)
+            reservations_checked_at = time.monotonic()
+
+        # The metrics file is written at most every `WRITE_INTERVAL`,
+        # thus the latest changes are written once no events arrive.
+        state.metrics.write()
+        try:
+            kind, event = events.get(timeout=WRITE_INTERVAL)
+        except queue.Empty:
+            continue
 
-        # Set that the target uuid has received from the source.
-        pipeline[source][target]["weight"] = 1
+        # The messages of the control channel, or the metadata of the
+        # "ping" object that triggered the notification.
+        if kind == SPILLED:
+            handle_spilled(state, *event)
+            continue
+        elif kind == CONTROL_MESSAGES:
+            messages, ping_obj_id = event, None
+        else:
+            messages = handle_notification(client, state, *event)
+            if messages is None:
+                continue
+            ping_obj_id = event[0]
+
+        pairs = handle_control_messages(client, state, control_sock, messages)
+        if not pairs:
+            if ping_obj_id is not None:
+                client.delete([ping_obj_id])
+            continue
+
+        handle_received_outputs(state, pairs)
 
         # TODO: should we check for this options earlier, because
         #       probably we want to start counting the moment the user
         #       selects the options (and by deselect maybe reset all
         #       weights to zero).
         # Only consider evicting objects if the option is set.
-        if not pipeline.graph.get("auto_eviction", False):
+        if not state.pipeline.graph.get("auto_eviction", False):
             continue
 
-        # Delete the objects corresponding to the `uuids_to_evict`.
-        uuids_to_evict = get_uuids_to_evict(new_pipeline)
-        delete(client, uuids_to_evict)
-
-        print("Evicting:", uuids_to_evict)
+        evict(client, state)
 
         # Need to also delete the "ping" object that contained the
         # metadata.
-        client.delete([obj_id])
+        if ping_obj_id is not None:
+            client.delete([ping_obj_id])
@@ -0,0 +1,99 @@
+"""Metrics of the store and its manager.
+
+The metrics are exported as a file in the Prometheus text format next
+to the socket of the store, and as JSON in reply to a query over the
+control channel, see `manager.handle_control_messages`.
+"""
+import json
+import os
+import time
+
+PREFIX = "orchest_memory_server"
+
+# Name, type and help of every metric, in the order they are exported.
+METRICS = [
+    ("capacity_bytes", "gauge", "Capacity of the store."),
+    ("used_bytes", "gauge", "Memory used by the objects in the store."),
+    ("objects", "gauge", "Number of objects in the store."),
+    ("written_objects_total", "counter", "Outputs written to the store."),
+    ("written_bytes_total", "counter", "Bytes of outputs written to the store."),
+    ("read_objects_total", "counter", "Outputs read from the store by steps."),
+    ("read_bytes_total", "counter", "Bytes of outputs read from the store by steps."),
+    ("evicted_objects_total", "counter", "Outputs evicted from the store."),
+    ("evicted_bytes_total", "counter", "Bytes of outputs evicted from the store."),
+    ("spill_requests_total", "counter", "Requests to spill outputs to disk."),
+    ("spilled_objects_total", "counter", "Outputs spilled to disk."),
+    ("spilled_bytes_total", "counter", "Bytes of outputs spilled to disk."),
+    ("disk_fallbacks_total", "counter", "Outputs that did not fit in the store."),
+    (
+        "disk_fallback_bytes_total",
+        "counter",
+        "Bytes of outputs that did not fit in the store.",
+    ),
+]
+
+# Minimum number of seconds between writes of the metrics file.
+WRITE_INTERVAL = 1
+
+
+class Metrics:
+    """Keeps the metrics of the store.
+
+    Args:
+        fname: The file to write the metrics to.
+        capacity: The capacity of the store in bytes.
+
+    """
+
+    def __init__(self, fname: str, capacity: int) -> None:
+        self.fname = fname
+        self.values = {name: 0 for name, _, _ in METRICS}
+        self.values["capacity_bytes"] = capacity
+
+        self._written_at = None
+        self._changed = True
+
+    def inc(self, name: str, value: int = 1) -> None:
+        self.values[name] += value
+        self._changed = True
+
+    def set(self, name: str, value: int) -> None:
+        self.values[name] = value
+        self._changed = True
+
+    def to_json(self) -> str:
+        return json.dumps(self.values)
+
+    def to_prometheus(self) -> str:
+        lines = []
+        for name, kind, description in METRICS:
+            lines.append(f"# HELP {PREFIX}_{name} {description}")
+            lines.append(f"# TYPE {PREFIX}_{name} {kind}")
+            lines.append(f"{PREFIX}_{name} {self.values[name]}")
+
+        return "\n".join(lines) + "\n"
+
+    def write(self) -> None:
+        """Writes the metrics file if the metrics changed.
+
+        The file is written at most every `WRITE_INTERVAL` seconds, thus
+        this has to be called again after that time to write the latest
+        changes.
+        """
+        now = time.monotonic()
+        if not self._changed:
+            return
+        elif self._written_at is not None and now - self._written_at < WRITE_INTERVAL:
+            return
+
+        # Readers never see a partially written file.
+        try:
+            with open(f"{self.fname}.tmp", "w") as f:
+                f.write(self.to_prometheus())
+            os.chmod(f"{self.fname}.tmp", 0o644)
+            os.replace(f"{self.fname}.tmp", self.fname)
+        except OSError as e:
+            print("Failed to write metrics:", e)
+
+        self._written_at = now
+        self._changed = False
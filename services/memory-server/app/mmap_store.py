@@ -0,0 +1,171 @@
+"""Server side of the store of memory-mapped files.
+
+An alternative to the plasma store, which is deprecated by Apache
+Arrow. See ``orchest.transfer._mmap_store`` of the Orchest SDK for the
+layout of the store directory, which has to be kept in sync with this
+module. Deleted objects are unlinked files, which stay valid for the
+steps that still have them memory-mapped, thus no reference counts are
+kept.
+"""
+import json
+import mmap
+import os
+import shutil
+import struct
+import time
+
+import pyarrow.plasma as plasma
+
+STORE_FILE = "store.json"
+NOTIFICATIONS_FILE = "notifications"
+OBJECTS_DIR = "objects"
+ALIGNMENT = 64
+
+_HEADER = struct.Struct("<QQ")
+
+# Seconds to wait before checking the notifications file again.
+_POLL_INTERVAL = 0.05
+
+
+class MmapStore:
+    """Creates the store and reads its notifications.
+
+    Exposes the subset of the interface of a PlasmaClient that is used
+    by the manager, so that the manager works with either store.
+
+    Args:
+        store_dir: The directory of the store. Objects of a previous
+            store in the same directory are removed.
+        capacity: The capacity of the store in bytes.
+
+    """
+
+    def __init__(self, store_dir: str, capacity: int) -> None:
+        self.store_dir = store_dir
+        self._objects_dir = os.path.join(store_dir, OBJECTS_DIR)
+        self._notifications_fname = os.path.join(store_dir, NOTIFICATIONS_FILE)
+        self._store_fname = os.path.join(store_dir, STORE_FILE)
+        self._capacity = capacity
+
+        shutil.rmtree(store_dir, ignore_errors=True)
+        os.makedirs(self._objects_dir)
+        open(self._notifications_fname, "w").close()
+
+        # Set flexible permissions to make the store writeable to all
+        # who have access to the path through the volume mount.
+        for path in [store_dir, self._objects_dir]:
+            os.chmod(path, 0o777)
+        os.chmod(self._notifications_fname, 0o666)
+
+        self._notifications = None
+
+        # The store file is written last, because the Orchest SDK
+        # considers the store to be ready once it exists.
+        tmp_fname = f"{self._store_fname}.tmp"
+        with open(tmp_fname, "w") as f:
+            json.dump({"capacity": capacity}, f)
+        os.chmod(tmp_fname, 0o644)
+        os.replace(tmp_fname, self._store_fname)
+
+    def _get_path(self, obj_id: plasma.ObjectID) -> str:
+        return os.path.join(self._objects_dir, obj_id.binary().hex())
+
+    def store_capacity(self) -> int:
+        return self._capacity
+
+    def subscribe(self) -> None:
+        self._notifications = open(self._notifications_fname, "r")
+
+    def get_next_notification(self):
+        """Waits for the next notification.
+
+        Returns:
+            A tuple of the ID, data size and metadata size of the
+            object. The sizes are negative if the object was deleted.
+
+        """
+        line = ""
+        while True:
+            line += self._notifications.readline()
+            # A line without a newline is still being written.
+            if line.endswith("\n"):
+                break
+            time.sleep(_POLL_INTERVAL)
+
+        obj_hex, data_size, mdata_size = line.split()
+        return plasma.ObjectID(bytes.fromhex(obj_hex)), int(data_size), int(mdata_size)
+
+    def list(self):
+        objects = {}
+        for file_name in os.listdir(self._objects_dir):
+            if "." in file_name:
+                continue
+
+            try:
+                with open(os.path.join(self._objects_dir, file_name), "rb") as f:
+                    mdata_size, data_size = _HEADER.unpack(f.read(_HEADER.size))
+            except (FileNotFoundError, struct.error):
+                continue
+
+            objects[plasma.ObjectID(bytes.fromhex(file_name))] = {
+                "data_size": data_size,
+                "metadata_size": mdata_size,
+            }
+
+        return objects
+
+    def contains(self, obj_id) -> bool:
+        return os.path.exists(self._get_path(obj_id))
+
+    def get_metadata(self, obj_ids, timeout_ms=-1):
+        metadatas = []
+        for obj_id in obj_ids:
+            try:
+                with open(self._get_path(obj_id), "rb") as f:
+                    mdata_size, _ = _HEADER.unpack(f.read(_HEADER.size))
+                    metadatas.append(f.read(mdata_size))
+            except FileNotFoundError:
+                metadatas.append(None)
+
+        return metadatas
+
+    def get_buffers(self, obj_ids, timeout_ms=-1, with_meta=False):
+        res = []
+        for obj_id in obj_ids:
+            try:
+                with open(self._get_path(obj_id), "rb") as f:
+                    mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except FileNotFoundError:
+                res.append((None, None) if with_meta else None)
+                continue
+
+            mdata_size, data_size = _HEADER.unpack(mm[: _HEADER.size])
+            offset = _HEADER.size + mdata_size
+            offset += -offset % ALIGNMENT
+            data = memoryview(mm)[offset : offset + data_size]
+            if with_meta:
+                res.append((mm[_HEADER.size : _HEADER.size + mdata_size], data))
+            else:
+                res.append(data)
+
+        return res
+
+    def delete(self, obj_ids) -> None:
+        lines = []
+        for obj_id in obj_ids:
+            try:
+                os.remove(self._get_path(obj_id))
+            except FileNotFoundError:
+                continue
+
+            lines.append(f"{obj_id.binary().hex()} -1 -1\n")
+
+        if lines:
+            with open(self._notifications_fname, "a") as f:
+                f.write("".join(lines))
+
+    def close(self) -> None:
+        if self._notifications is not None:
+            self._notifications.close()
+
+        shutil.rmtree(self.store_dir, ignore_errors=True)
@@ -1,5 +1,19 @@
 import json
-from typing import Union
+import os
+from typing import List, Union
+
+import config
+
+# Value of the `data_passing_memory_size` to size the store based on the
+# memory limit and the history of the pipeline.
+AUTO_MEMORY_SIZE = "auto"
+
+# Files that state the memory limit of the cgroup of the container, for
+# cgroup v2 and v1 respectively.
+CGROUP_MEMORY_LIMIT_FNAMES = [
+    "/sys/fs/cgroup/memory.max",
+    "/sys/fs/cgroup/memory/memory.limit_in_bytes",
+]
 
 
 def _parse_string_memory_size(memory_size: Union[str, int]) -> int:
@@ -19,11 +33,121 @@ def _parse_string_memory_size(memory_size: Union[str, int]) -> int:
     return size
 
 
-def get_store_memory_size(pipeline_definition_path: str):
-    """Gets the specified memory size from the pipeline definition."""
+def get_memory_limit() -> int:
+    """Gets the memory limit of the container in bytes.
+
+    The limit is the one of the cgroup of the container, or the physical
+    memory of the host if the cgroup has no (lower) limit.
+    """
+    limit = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    for fname in CGROUP_MEMORY_LIMIT_FNAMES:
+        try:
+            with open(fname, "r") as f:
+                value = f.read().strip()
+        except OSError:
+            continue
+
+        # The limit is "max" (cgroup v2) or a huge number (cgroup v1)
+        # if the cgroup is not limited.
+        if value.isdigit():
+            limit = min(limit, int(value))
+        break
+
+    return limit
+
+
+def read_memory_history(history_fname: str) -> List[dict]:
+    """Reads the memory usage of previous sessions of a pipeline.
+
+    Returns:
+        The sessions from oldest to most recent, see
+        `manager.record_memory_usage`. Empty if there is no history.
+
+    """
+    try:
+        with open(history_fname, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return []
+
+
+def get_auto_memory_size(history_fname: str) -> int:
+    """Gets the memory size of the store based on the history.
+
+    Every one of the last sessions of the pipeline needs its peak usage
+    plus headroom, or more memory than it had if its store was full. The
+    store is sized to the largest need, thus it grows after sessions
+    that filled it and shrinks once sessions use less.
+
+    Returns:
+        The memory size in bytes, bounded by the memory limit of the
+        container minus a safety margin.
+
+    """
+    max_size = int(get_memory_limit() * (1 - config.AUTO_MEMORY_SIZE_MARGIN))
+
+    sessions = read_memory_history(history_fname)[-config.MEMORY_HISTORY_LENGTH :]
+    if not sessions:
+        return min(config.AUTO_MEMORY_SIZE_DEFAULT, max_size)
+
+    needs = []
+    for session in sessions:
+        full = session["peak"] >= config.AUTO_MEMORY_SIZE_FULL * session["capacity"]
+        if session["spilled"] or full:
+            needs.append(session["capacity"] * config.AUTO_MEMORY_SIZE_GROWTH)
+        else:
+            needs.append(session["peak"] * config.AUTO_MEMORY_SIZE_HEADROOM)
+
+    size = max(int(max(needs)), config.AUTO_MEMORY_SIZE_MIN)
+    return min(size, max_size)
+
+
+def _read_pipeline_definition(pipeline_definition_path: str) -> dict:
     with open(pipeline_definition_path, "r") as f:
         description = json.load(f)
 
+    return description
+
+
+def is_auto_memory_size(pipeline_definition_path: str) -> bool:
+    """Whether the store is sized based on the memory limit and history.
+
+    See `get_auto_memory_size`.
+    """
+    description = _read_pipeline_definition(pipeline_definition_path)
+    mem_size = description["settings"].get("data_passing_memory_size")
+    return mem_size == AUTO_MEMORY_SIZE
+
+
+def get_store_memory_size(
+    pipeline_definition_path: str, history_fname: str = config.MEMORY_HISTORY_FNAME
+):
+    """Gets the specified memory size from the pipeline definition.
+
+    Args:
+        pipeline_definition_path: Path to the pipeline definition.
+        history_fname: Path to the memory history of the pipeline,
+            formatted with its UUID. Only used if the memory size is
+            "auto".
+
+    """
+    description = _read_pipeline_definition(pipeline_definition_path)
+
     mem_size = description["settings"].get("data_passing_memory_size", 1000 ** 3)
+    if mem_size == AUTO_MEMORY_SIZE:
+        return get_auto_memory_size(
+            history_fname.format(pipeline_uuid=description.get("uuid"))
+        )
 
     return _parse_string_memory_size(mem_size)
+
+
+def get_store_backend(pipeline_definition_path: str) -> str:
+    """Gets the specified store backend from the pipeline definition.
+
+    Returns:
+        Either "plasma" (the default) or "mmap".
+
+    """
+    description = _read_pipeline_definition(pipeline_definition_path)
+    return description["settings"].get("data_passing_memory_backend", "plasma")
@@ -1,17 +1,26 @@
+import json
 import os
+import queue
+import shutil
+import socket
 import subprocess
+import sys
+import threading
 import time
 from unittest.mock import patch
 
 import numpy as np
+import pyarrow.plasma as plasma
 import pytest
 
 import orchest
 
 # Add the folder to the path to not break imports. This has to do with
 # imports that work differently when started via a subprocess.
-# import sys
-# sys.path.insert(0, os.path.abspath('app'))
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app")
+)
+import manager  # noqa: E402
 
 KILOBYTE = 1 << 10
 MEGABYTE = KILOBYTE * KILOBYTE
@@ -26,6 +35,48 @@ def generate_data(total_size):
     return np.random.randn(nrows)
 
 
+class FakeStoreClient:
+    """The part of the client of the store that the manager uses."""
+
+    def __init__(self):
+        self.metadata = {}
+        self.buffers = {}
+        self.requested_metadata = []
+        self.deleted = []
+
+    def list(self):
+        return {}
+
+    def store_capacity(self):
+        return PLASMA_STORE_CAPACITY
+
+    def get_metadata(self, obj_ids, timeout_ms=-1):
+        self.requested_metadata.extend(obj_ids)
+        return [self.metadata.get(obj_id) for obj_id in obj_ids]
+
+    def get_buffers(self, obj_ids, timeout_ms=-1, with_meta=False):
+        return [(self.metadata.get(o), self.buffers.get(o)) for o in obj_ids]
+
+    def delete(self, obj_ids):
+        for obj_id in obj_ids:
+            self.buffers.pop(obj_id, None)
+            if self.metadata.pop(obj_id, None) is not None:
+                self.deleted.append(obj_id)
+
+
+@pytest.fixture
+def manager_state(tmp_path):
+    abs_path = os.path.dirname(os.path.abspath(__file__))
+    client = FakeStoreClient()
+    state = manager.ManagerState(
+        client,
+        str(tmp_path / "plasma.sock"),
+        os.path.join(abs_path, "pipeline.json"),
+        str(tmp_path / "{pipeline_uuid}" / "{step_uuid}"),
+    )
+    return client, state
+
+
 @pytest.fixture
 def memory_store(monkeypatch):
     abs_path = os.path.dirname(os.path.abspath(__file__))
@@ -52,6 +103,142 @@ def memory_store(monkeypatch):
         proc.kill()
 
     os.remove(store_socket_name)
+    os.remove(f"{store_socket_name}.usage")
+    os.remove(f"{store_socket_name}.control")
+    shutil.rmtree(f"{store_socket_name}.reservations", ignore_errors=True)
+    if os.path.exists(f"{store_socket_name}.metrics.prom"):
+        os.remove(f"{store_socket_name}.metrics.prom")
+
+
+@pytest.fixture
+def mmap_memory_store(monkeypatch):
+    abs_path = os.path.dirname(os.path.abspath(__file__))
+    script = os.path.join(abs_path, "..", "app", "main.py")
+
+    store_socket_name = os.path.join(abs_path, "plasma.sock")
+    store_dir = os.path.join(abs_path, "mmap-store")
+    pipeline_fname = os.path.join(abs_path, "pipeline.json")
+    command = [
+        "python",
+        script,
+        "-m",
+        str(PLASMA_STORE_CAPACITY),
+        "-s",
+        f"{store_socket_name}",
+        "-p",
+        f"{pipeline_fname}",
+        "-b",
+        "mmap",
+        "-d",
+        f"{store_dir}",
+    ]
+    proc = subprocess.Popen(command, stdout=subprocess.PIPE)
+
+    monkeypatch.setattr(orchest.Config, "STORE_SOCKET_NAME", store_socket_name)
+    monkeypatch.setattr(orchest.Config, "MMAP_STORE_DIR", store_dir)
+
+    # Wait for the store to be ready.
+    while not os.path.exists(orchest.Config.get_mmap_store_file()):
+        time.sleep(0.1)
+
+    yield store_dir, pipeline_fname
+
+    if proc.poll() is None:
+        proc.kill()
+
+    shutil.rmtree(store_dir, ignore_errors=True)
+    os.remove(f"{store_socket_name}.usage")
+    os.remove(f"{store_socket_name}.control")
+    shutil.rmtree(f"{store_socket_name}.reservations", ignore_errors=True)
+    if os.path.exists(f"{store_socket_name}.metrics.prom"):
+        os.remove(f"{store_socket_name}.metrics.prom")
+
+
+@pytest.fixture
+def spill_memory_store(monkeypatch, tmp_path):
+    abs_path = os.path.dirname(os.path.abspath(__file__))
+    script = os.path.join(abs_path, "..", "app", "main.py")
+
+    # Spill objects instead of evicting them.
+    with open(os.path.join(abs_path, "pipeline.json"), "r") as f:
+        description = json.load(f)
+    description["settings"] = {"data_passing_memory_spill": True}
+    pipeline_fname = str(tmp_path / "pipeline.json")
+    with open(pipeline_fname, "w") as f:
+        json.dump(description, f)
+
+    store_socket_name = os.path.join(abs_path, "plasma.sock")
+    command = [
+        "python",
+        script,
+        "-m",
+        str(PLASMA_STORE_CAPACITY),
+        "-s",
+        f"{store_socket_name}",
+        "-p",
+        f"{pipeline_fname}",
+        "-t",
+        "tests/userdir/.data/{step_uuid}",
+    ]
+    proc = subprocess.Popen(command, stdout=subprocess.PIPE)
+
+    monkeypatch.setattr(orchest.Config, "STORE_SOCKET_NAME", store_socket_name)
+    yield store_socket_name, pipeline_fname
+
+    if proc.poll() is None:
+        proc.kill()
+
+    os.remove(store_socket_name)
+    os.remove(f"{store_socket_name}.usage")
+    os.remove(f"{store_socket_name}.control")
+    shutil.rmtree(f"{store_socket_name}.reservations", ignore_errors=True)
+    if os.path.exists(f"{store_socket_name}.metrics.prom"):
+        os.remove(f"{store_socket_name}.metrics.prom")
+    shutil.rmtree("tests/userdir/.data", ignore_errors=True)
+
+
+@pytest.fixture
+def auto_memory_store(monkeypatch, tmp_path):
+    abs_path = os.path.dirname(os.path.abspath(__file__))
+    script = os.path.join(abs_path, "..", "app", "main.py")
+
+    # Size the store automatically.
+    with open(os.path.join(abs_path, "pipeline.json"), "r") as f:
+        description = json.load(f)
+    description["settings"] = {"data_passing_memory_size": "auto"}
+    pipeline_fname = str(tmp_path / "pipeline.json")
+    with open(pipeline_fname, "w") as f:
+        json.dump(description, f)
+
+    # The history is passed like the orchest-api does for the runs of a
+    # job, which record it in the job directory.
+    store_socket_name = os.path.join(abs_path, "plasma.sock")
+    history_fname = str(tmp_path / "{pipeline_uuid}" / "memory-history.json")
+    command = [
+        "python",
+        script,
+        "-s",
+        f"{store_socket_name}",
+        "-p",
+        f"{pipeline_fname}",
+    ]
+    env = dict(os.environ, ORCHEST_MEMORY_HISTORY_FNAME=history_fname)
+    proc = subprocess.Popen(command, stdout=subprocess.PIPE, env=env)
+
+    monkeypatch.setattr(orchest.Config, "STORE_SOCKET_NAME", store_socket_name)
+    yield store_socket_name, pipeline_fname, history_fname.format(
+        pipeline_uuid=description.get("uuid")
+    )
+
+    if proc.poll() is None:
+        proc.kill()
+
+    os.remove(store_socket_name)
+    os.remove(f"{store_socket_name}.usage")
+    os.remove(f"{store_socket_name}.control")
+    shutil.rmtree(f"{store_socket_name}.reservations", ignore_errors=True)
+    if os.path.exists(f"{store_socket_name}.metrics.prom"):
+        os.remove(f"{store_socket_name}.metrics.prom")
 
 
 @patch("orchest.transfer.get_step_uuid")
@@ -154,3 +341,388 @@ def test_memory_eviction_memoryerror(mock_get_step_uuid, memory_store):
             name=None,
             disk_fallback=False,
         )
+
+
+@patch("orchest.transfer.get_step_uuid")
+@patch("orchest.Config.STEP_DATA_DIR", "tests/userdir/.data/{step_uuid}")
+def test_memory_eviction_named_outputs(mock_get_step_uuid, memory_store, monkeypatch):
+    store_socket_name, pipeline_fname = memory_store
+    orchest.Config.PIPELINE_DEFINITION_PATH = pipeline_fname
+
+    # Setup environment variables.
+    envs = {"ORCHEST_MEMORY_EVICTION": "True"}
+    monkeypatch.setattr(os, "environ", envs)
+
+    # Do as if we are uuid-1
+    mock_get_step_uuid.return_value = "uuid-1______________"
+    for name in ["output1", "output2"]:
+        orchest.transfer.output_to_memory(
+            generate_data(0.3 * PLASMA_KILOBYTES * KILOBYTE),
+            name=name,
+            disk_fallback=False,
+        )
+
+    # Do as if we are uuid-2, which reads both outputs.
+    mock_get_step_uuid.return_value = "uuid-2______________"
+    orchest.transfer.get_inputs()
+
+    # Do as if we are uuid-3, which only reads "output1".
+    mock_get_step_uuid.return_value = "uuid-3______________"
+    orchest.transfer.get_inputs(lazy=True)["output1"]
+
+    # Give the memory-server time to evict.
+    time.sleep(1)
+
+    client = plasma.connect(store_socket_name)
+    obj_id_1 = orchest.transfer._convert_uuid_to_object_id(
+        "uuid-1______________", "output1"
+    )
+    obj_id_2 = orchest.transfer._convert_uuid_to_object_id(
+        "uuid-1______________", "output2"
+    )
+    assert not client.contains(obj_id_1)
+    assert client.contains(obj_id_2)
+
+
+@patch("orchest.transfer.get_step_uuid")
+@patch("orchest.Config.STEP_DATA_DIR", "tests/userdir/.data/{step_uuid}")
+def test_memory_eviction_control_channel(mock_get_step_uuid, memory_store, monkeypatch):
+    store_socket_name, pipeline_fname = memory_store
+    orchest.Config.PIPELINE_DEFINITION_PATH = pipeline_fname
+
+    # Setup environment variables.
+    envs = {"ORCHEST_MEMORY_EVICTION": "True"}
+    monkeypatch.setattr(os, "environ", envs)
+
+    # Do as if we are uuid-1
+    data_1 = generate_data(0.6 * PLASMA_KILOBYTES * KILOBYTE)
+    mock_get_step_uuid.return_value = "uuid-1______________"
+    orchest.transfer.output_to_memory(data_1, name=None, disk_fallback=False)
+
+    # Do as if we are uuid-2, the messages for eviction are not put in
+    # the store.
+    mock_get_step_uuid.return_value = "uuid-2______________"
+    with patch("orchest.transfer._output_to_memory") as mock_output_to_memory:
+        orchest.transfer.get_inputs(pipeline_fname)
+    mock_output_to_memory.assert_not_called()
+
+    # Do as if we are uuid-3, which is the last receiver.
+    mock_get_step_uuid.return_value = "uuid-3______________"
+    orchest.transfer.get_inputs(pipeline_fname)
+
+    # Give the memory-server time to evict.
+    time.sleep(1)
+
+    client = plasma.connect(store_socket_name)
+    assert not client.list()
+
+
+@patch("orchest.transfer.get_step_uuid")
+@patch("orchest.Config.STEP_DATA_DIR", "tests/userdir/.data/{step_uuid}")
+def test_mmap_memory_eviction(mock_get_step_uuid, mmap_memory_store, monkeypatch):
+    store_dir, pipeline_fname = mmap_memory_store
+    orchest.Config.PIPELINE_DEFINITION_PATH = pipeline_fname
+
+    # Setup environment variables.
+    envs = {"ORCHEST_MEMORY_EVICTION": "True"}
+    monkeypatch.setattr(os, "environ", envs)
+
+    # Do as if we are uuid-1
+    data_1 = generate_data(0.6 * PLASMA_KILOBYTES * KILOBYTE)
+    mock_get_step_uuid.return_value = "uuid-1______________"
+    orchest.transfer.output_to_memory(data_1, name=None, disk_fallback=False)
+
+    # Do as if we are uuid-2 and uuid-3, which are all the receivers.
+    for uuid in ["uuid-2______________", "uuid-3______________"]:
+        mock_get_step_uuid.return_value = uuid
+        input_data = orchest.transfer.get_inputs(pipeline_fname)
+        assert (
+            input_data[orchest.Config._RESERVED_UNNAMED_OUTPUTS_STR] == data_1
+        ).all()
+
+    # Give the memory-server time to evict.
+    time.sleep(1)
+
+    obj_id = orchest.transfer._convert_uuid_to_object_id("uuid-1______________")
+    assert not os.path.exists(os.path.join(store_dir, "objects", obj_id.binary().hex()))
+
+    # The evicted memory is available again.
+    data_2 = generate_data(0.6 * PLASMA_KILOBYTES * KILOBYTE)
+    orchest.transfer.output_to_memory(data_2, name=None, disk_fallback=False)
+
+
+@patch("orchest.transfer.get_step_uuid")
+@patch("orchest.Config.STEP_DATA_DIR", "tests/userdir/.data/{step_uuid}")
+def test_memory_spill(mock_get_step_uuid, spill_memory_store):
+    store_socket_name, pipeline_fname = spill_memory_store
+    orchest.Config.PIPELINE_DEFINITION_PATH = pipeline_fname
+
+    # Do as if we are uuid-1
+    data_1 = generate_data(0.6 * PLASMA_KILOBYTES * KILOBYTE)
+    mock_get_step_uuid.return_value = "uuid-1______________"
+    orchest.transfer.output_to_memory(data_1, name=None, disk_fallback=False)
+
+    # Do as if we are uuid-2. Its output does not fit next to the one of
+    # uuid-1, which is therefore spilled to disk.
+    mock_get_step_uuid.return_value = "uuid-2______________"
+    data_2 = generate_data(0.6 * PLASMA_KILOBYTES * KILOBYTE)
+    orchest.transfer.output_to_memory(data_2, name=None, disk_fallback=False)
+
+    assert os.path.exists("tests/userdir/.data/uuid-1______________/HEAD")
+    client = plasma.connect(store_socket_name)
+    assert not client.contains(
+        orchest.transfer._convert_uuid_to_object_id("uuid-1______________")
+    )
+
+    # Do as if we are uuid-3, which gets the spilled output from disk.
+    mock_get_step_uuid.return_value = "uuid-3______________"
+    input_data = orchest.transfer.get_inputs()
+    assert (input_data[orchest.Config._RESERVED_UNNAMED_OUTPUTS_STR] == data_1).all()
+
+
+@patch("orchest.transfer.get_step_uuid")
+@patch("orchest.Config.STEP_DATA_DIR", "tests/userdir/.data/{step_uuid}")
+def test_memory_spill_newer_disk_output(
+    mock_get_step_uuid, spill_memory_store, monkeypatch
+):
+    store_socket_name, pipeline_fname = spill_memory_store
+    orchest.Config.PIPELINE_DEFINITION_PATH = pipeline_fname
+    monkeypatch.setattr(orchest.Config, "SPILL_TIMEOUT", 1)
+
+    # Do as if we are uuid-1, which outputs to disk after it output to
+    # memory.
+    data_1 = generate_data(0.6 * PLASMA_KILOBYTES * KILOBYTE)
+    mock_get_step_uuid.return_value = "uuid-1______________"
+    orchest.transfer.output_to_memory(data_1, name=None, disk_fallback=False)
+    data_disk = generate_data(KILOBYTE)
+    orchest.transfer.output_to_disk(data_disk, name=None)
+
+    # Do as if we are uuid-2. The output of uuid-1 in memory is not
+    # spilled, because it would overwrite the newer output on disk.
+    mock_get_step_uuid.return_value = "uuid-2______________"
+    data_2 = generate_data(0.6 * PLASMA_KILOBYTES * KILOBYTE)
+    orchest.transfer.output_to_memory(data_2, name=None, disk_fallback=True)
+
+    obj_id = orchest.transfer._convert_uuid_to_object_id("uuid-1______________")
+    client = plasma.connect(store_socket_name)
+    assert client.contains(obj_id)
+    output = orchest.transfer._get_spilled_output("uuid-1______________", obj_id)
+    assert (output == data_disk).all()
+
+
+@patch("orchest.transfer.get_step_uuid")
+@patch("orchest.Config.STEP_DATA_DIR", "tests/userdir/.data/{step_uuid}")
+def test_memory_history(mock_get_step_uuid, auto_memory_store):
+    store_socket_name, pipeline_fname, history_fname = auto_memory_store
+    orchest.Config.PIPELINE_DEFINITION_PATH = pipeline_fname
+
+    # Do as if we are uuid-1
+    data_1 = generate_data(MEGABYTE)
+    mock_get_step_uuid.return_value = "uuid-1______________"
+    orchest.transfer.output_to_memory(data_1, name=None, disk_fallback=False)
+
+    # Give the memory-server time to record the usage.
+    time.sleep(1)
+
+    with open(history_fname, "r") as f:
+        [session] = json.load(f)
+    assert session["peak"] >= MEGABYTE
+    assert not session["spilled"]
+
+    client = plasma.connect(store_socket_name)
+    assert session["capacity"] == client.store_capacity()
+
+
+@patch("orchest.transfer.get_step_uuid")
+@patch("orchest.Config.STEP_DATA_DIR", "tests/userdir/.data/{step_uuid}")
+def test_memory_metrics(mock_get_step_uuid, memory_store, monkeypatch):
+    store_socket_name, pipeline_fname = memory_store
+    orchest.Config.PIPELINE_DEFINITION_PATH = pipeline_fname
+
+    # Setup environment variables.
+    envs = {"ORCHEST_MEMORY_EVICTION": "True"}
+    monkeypatch.setattr(os, "environ", envs)
+
+    # Do as if we are uuid-1
+    data_1 = generate_data(0.6 * PLASMA_KILOBYTES * KILOBYTE)
+    mock_get_step_uuid.return_value = "uuid-1______________"
+    orchest.transfer.output_to_memory(data_1, name=None, disk_fallback=False)
+
+    # Do as if we are uuid-2, which reads the output and then outputs
+    # data that does not fit in memory.
+    mock_get_step_uuid.return_value = "uuid-2______________"
+    orchest.transfer.get_inputs(pipeline_fname)
+    orchest.transfer.output_to_memory(
+        generate_data(0.6 * PLASMA_KILOBYTES * KILOBYTE), name=None
+    )
+
+    # Give the memory-server time to process the messages.
+    time.sleep(1)
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sock:
+        sock.bind("")
+        sock.settimeout(5)
+        sock.sendto(b"6", f"{store_socket_name}.control")
+        metrics = json.loads(sock.recv(1 << 16))
+
+    assert metrics["capacity_bytes"] == PLASMA_STORE_CAPACITY
+    assert metrics["objects"] == 1
+    assert metrics["written_objects_total"] == 1
+    assert metrics["read_objects_total"] == 1
+    assert metrics["disk_fallbacks_total"] == 1
+
+    # Give the memory-server time to write the metrics file.
+    time.sleep(1.5)
+
+    with open(f"{store_socket_name}.metrics.prom", "r") as f:
+        assert "orchest_memory_server_disk_fallbacks_total 1" in f.read().splitlines()
+
+
+def test_memory_deletion_notifications(memory_store):
+    store_socket_name, _ = memory_store
+    usage_fname = f"{store_socket_name}.usage"
+
+    # The metrics are written once the manager is ready.
+    while not os.path.exists(f"{store_socket_name}.metrics.prom"):
+        time.sleep(0.1)
+
+    def get_used():
+        with open(usage_fname, "r") as f:
+            return json.load(f)["used"]
+
+    client = plasma.connect(store_socket_name)
+    obj_ids = [client.put_raw_buffer(b"x" * 64) for _ in range(5)]
+    while get_used() < 5 * 64:
+        time.sleep(0.1)
+
+    # The notifications of deleted objects are processed right away,
+    # instead of waiting for the metadata of every deleted object.
+    client.delete(obj_ids)
+    deadline = time.monotonic() + 2
+    while get_used() > 0:
+        assert time.monotonic() < deadline
+        time.sleep(0.1)
+
+
+def test_memory_reservation_expiry(memory_store):
+    store_socket_name, _ = memory_store
+    usage_fname = f"{store_socket_name}.usage"
+
+    # The metrics are written once the manager is ready.
+    while not os.path.exists(f"{store_socket_name}.metrics.prom"):
+        time.sleep(0.1)
+
+    locked, unlocked, missing = [
+        plasma.ObjectID.from_random().binary().hex() for _ in range(3)
+    ]
+
+    # Do as if one process still makes its reservation and another one
+    # died before it sealed its object.
+    lock_file = orchest.transfer._lock_reservation(locked)
+    orchest.transfer._unlock_reservation(orchest.transfer._lock_reservation(unlocked))
+
+    with orchest.transfer._open_store_usage(usage_fname) as usage:
+        usage["reservations"] = {
+            obj_hex: {"size": KILOBYTE} for obj_hex in [locked, unlocked, missing]
+        }
+
+    # Give the memory-server time to expire the reservations.
+    time.sleep(2)
+
+    reservations_dir = orchest.Config.get_store_reservations_dir()
+    with open(usage_fname, "r") as f:
+        assert set(json.load(f)["reservations"]) == {locked}
+    assert os.listdir(reservations_dir) == [locked]
+
+    # The file is removed once the reservation is released.
+    orchest.transfer._unlock_reservation(lock_file)
+    time.sleep(2)
+
+    with open(usage_fname, "r") as f:
+        assert json.load(f)["reservations"] == {}
+    assert os.listdir(reservations_dir) == []
+
+
+def test_handle_notification_deleted(manager_state):
+    client, state = manager_state
+
+    obj_id = manager._convert_uuid_to_object_id("uuid-1______________")
+    client.metadata[obj_id] = b"1; 2021-01-01T00:00:00; ARROW_TABLE; unnamed"
+    assert manager.handle_notification(client, state, obj_id, KILOBYTE, 0) is None
+    assert obj_id in state.lru_obj_ids
+    assert state.metrics.values["used_bytes"] == KILOBYTE
+
+    # The metadata of a deleted object is not requested, since it would
+    # block until the timeout.
+    client.requested_metadata.clear()
+    assert manager.handle_notification(client, state, obj_id, -1, -1) is None
+    assert client.requested_metadata == []
+    assert obj_id not in state.lru_obj_ids
+    assert state.metrics.values["used_bytes"] == 0
+
+
+def test_handle_eviction(manager_state):
+    client, state = manager_state
+    uuid_1, uuid_2, uuid_3 = [f"uuid-{i}______________" for i in range(1, 4)]
+
+    obj_id = manager._convert_uuid_to_object_id(uuid_1)
+    client.metadata[obj_id] = b"1; 2021-01-01T00:00:00; ARROW_TABLE; unnamed"
+    manager.handle_notification(client, state, obj_id, KILOBYTE, 0)
+
+    # Without the control channel, the message is put in the store.
+    ping_obj_id = plasma.ObjectID.from_random()
+    client.metadata[ping_obj_id] = f"2;{uuid_1},{uuid_2}".encode()
+    messages = manager.handle_notification(client, state, ping_obj_id, 0, 16)
+    assert messages == [(client.metadata[ping_obj_id], None)]
+
+    pairs = manager.handle_control_messages(client, state, None, messages)
+    assert pairs == [f"{uuid_1},{uuid_2}"]
+    manager.handle_received_outputs(state, pairs)
+    assert uuid_1 not in state.uuids_to_evict
+
+    # The output is evicted once all receiving steps have read it.
+    manager.handle_received_outputs(state, [f"{uuid_1},{uuid_3}"])
+    assert uuid_1 in state.uuids_to_evict
+    assert state.metrics.values["read_objects_total"] == 2
+
+    manager.evict(client, state)
+    assert client.deleted == [obj_id]
+    assert state.uuids_to_evict == set()
+    assert state.metrics.values["evicted_objects_total"] == 1
+    assert state.metrics.values["evicted_bytes_total"] == KILOBYTE
+
+
+def test_spill_thread(manager_state, tmp_path):
+    client, state = manager_state
+    uuid_1, uuid_2 = "uuid-1______________", "uuid-2______________"
+
+    for uuid in [uuid_1, uuid_2]:
+        obj_id = manager._convert_uuid_to_object_id(uuid)
+        client.metadata[obj_id] = b"1; 2021-01-01T00:00:00; ARROW_TABLE; unnamed"
+        client.buffers[obj_id] = b"x" * KILOBYTE
+        manager.handle_notification(client, state, obj_id, KILOBYTE, 0)
+
+    # The output of uuid-2 has no receiving steps, thus it is spilled
+    # first. Objects that are being spilled count towards new requests.
+    obj_id = manager._convert_uuid_to_object_id(uuid_2)
+    manager.spill(state, KILOBYTE)
+    manager.spill(state, KILOBYTE)
+    assert state.spilling == {obj_id: KILOBYTE}
+    assert state.spill_requests.qsize() == 1
+    assert obj_id not in state.lru_obj_ids
+
+    events = queue.Queue()
+    threading.Thread(
+        target=manager.spill_objects,
+        args=(client, state.step_data_dir, state.spill_requests, events),
+        daemon=True,
+    ).start()
+    assert events.get(timeout=5) == (manager.SPILLED, (obj_id, True))
+    assert client.deleted == [obj_id]
+    with open(tmp_path / "pipeline-uuid" / uuid_2 / f"{uuid_2}.ARROW_TABLE", "rb") as f:
+        assert f.read() == b"x" * KILOBYTE
+
+    manager.handle_spilled(state, obj_id, True)
+    assert state.spilling == {}
+    assert state.metrics.values["spilled_objects_total"] == 1
+    assert state.metrics.values["spilled_bytes_total"] == KILOBYTE
@@ -131,6 +131,33 @@ class Session(Resource):
         return {"message": "Session restart was successful."}, 200
 
 
+@api.route("/<string:project_uuid>/<string:pipeline_uuid>/metrics")
+@api.param("project_uuid", "UUID of project")
+@api.param("pipeline_uuid", "UUID of pipeline")
+@api.response(404, "Session not found")
+class SessionMetrics(Resource):
+    @api.doc("get_session_metrics")
+    @api.response(200, "Metrics of the memory-server of the session")
+    @api.response(404, "Session or metrics not found")
+    def get(self, project_uuid, pipeline_uuid):
+        """Fetches the metrics of the memory-server of a session."""
+        session = models.InteractiveSession.query.get_or_404(
+            ident=(project_uuid, pipeline_uuid), description="Session not found"
+        )
+        session_obj = InteractiveSession.from_container_IDs(
+            docker_client,
+            container_IDs=session.container_ids,
+            network=_config.DOCKER_NETWORK,
+            notebook_server_info=session.notebook_server_info,
+        )
+
+        metrics = session_obj.get_memory_server_metrics()
+        if metrics is None:
+            return {"message": "Metrics not found."}, 404
+
+        return {"metrics": metrics}, 200
+
+
 class CreateInteractiveSession(TwoPhaseFunction):
     def _transaction(
         self,
@@ -9,7 +9,11 @@ import aiodocker
 import aiohttp
 
 from _orchest.internals import config as _config
-from _orchest.internals.utils import get_device_requests, get_orchest_mounts
+from _orchest.internals.utils import (
+    get_device_requests,
+    get_mount,
+    get_orchest_mounts,
+)
 from config import CONFIG_CLASS
 
 
@@ -145,6 +149,34 @@ def get_volume_mounts(run_config, task_id):
     return [f"{temp_volume_name}:{_config.TEMP_DIRECTORY_PATH}"]
 
 
+def get_job_dir_mounts(run_config, task_id):
+    """Returns the mounts and ENV variables for the job of a run.
+
+    The runs of a job share the blob store of the job directory, such
+    that data that is output to disk with deduplication is stored once
+    for all runs. Hard links to the blobs can only be created within a
+    single mount, thus the Orchest SDK writes the data of the run
+    through the mount of the job directory.
+
+    Returns:
+        A tuple of the mounts and the ENV variables. Both are empty if
+        the run is not part of a job.
+    """
+    if run_config.get("job_dir") is None:
+        return [], []
+
+    mounts = [
+        get_mount(
+            source=run_config["job_dir"], target=_config.JOB_DIR, form="docker-engine"
+        )
+    ]
+    env_variables = [
+        f"ORCHEST_JOB_RUN_DIR={os.path.join(_config.JOB_DIR, task_id)}",
+        f"ORCHEST_JOB_BLOB_STORE_DIR={_config.JOB_BLOB_STORE_DIR}",
+    ]
+    return mounts, env_variables
+
+
 class PipelineStepRunner:
     """Runs a PipelineStep on a chosen backend.
 
@@ -233,6 +265,17 @@ class PipelineStepRunner:
         # add volume mount
         orchest_mounts += get_volume_mounts(run_config, task_id)
 
+        job_dir_mounts, job_env_variables = get_job_dir_mounts(run_config, task_id)
+        orchest_mounts += job_dir_mounts
+
+        # Makes the Orchest SDK get the inputs of the step in the
+        # background as soon as it is imported, so that they are ready
+        # by the time get_inputs() is called. See the
+        # "data_passing_prefetch_inputs" pipeline setting.
+        prefetch_env_variables = []
+        if run_config.get("prefetch_inputs", False):
+            prefetch_env_variables.append("ORCHEST_PREFETCH_INPUTS=1")
+
         device_requests = get_device_requests(
             self.properties["environment"],
             run_config["project_uuid"],
@@ -259,6 +302,9 @@ class PipelineStepRunner:
             "Env": user_env_variables
             + [
                 f'ORCHEST_STEP_UUID={self.properties["uuid"]}',
+                # All processes of the step share the run, so that they
+                # do not remove each other's outputs.
+                f"ORCHEST_STEP_RUN_UUID={task_id}",
                 f'ORCHEST_PIPELINE_UUID={run_config["pipeline_uuid"]}',
                 f'ORCHEST_PIPELINE_PATH={run_config["pipeline_path"]}',
                 f'ORCHEST_PROJECT_UUID={run_config["project_uuid"]}',
@@ -274,7 +320,9 @@ class PipelineStepRunner:
                 # settings to decide whetever object eviction should
                 # take place or not.
                 "ORCHEST_MEMORY_EVICTION=1",
-            ],
+            ]
+            + job_env_variables
+            + prefetch_env_variables,
             "HostConfig": {
                 "Binds": orchest_mounts,
                 "DeviceRequests": device_requests,
@@ -812,6 +860,13 @@ class Pipeline:
         # bound to an asyncio eventloop.
         runner_client = aiodocker.Docker()
 
+        run_config = {
+            **run_config,
+            "prefetch_inputs": self.properties.get("settings", {}).get(
+                "data_passing_prefetch_inputs", False
+            ),
+        }
+
         async with aiohttp.ClientSession() as session:
             await update_status(
                 "STARTED",
@@ -1,7 +1,12 @@
+import calendar
+import json
+import logging
 import os
+import threading
 import time
 from abc import abstractmethod
 from contextlib import contextmanager
+from datetime import datetime
 from typing import Dict, NamedTuple, Optional
 from uuid import uuid4
 
@@ -126,6 +131,8 @@ class Session:
         pipeline_path: str,
         project_dir: str,
         host_userdir: Optional[str] = None,
+        job_dir: Optional[str] = None,
+        memory_backend: str = "plasma",
     ) -> None:
         """Launches pre-configured resources.
 
@@ -141,8 +148,14 @@ class Session:
                 project_dir).
             project_dir: Path to project directory.
             host_userdir: Path to the userdir on the host
+            job_dir: Path to the directory of the job on the host, if
+                the session is launched for a run of a job.
+            memory_backend: The store backend of the memory-server, see
+                :func:`get_memory_backend`.
 
         """
+        _create_temp_volume(self.client, uuid, project_uuid, memory_backend)
+
         # TODO: make convert this "pipeline" uuid into a "session" uuid.
         container_specs = _get_container_specs(
             uuid,
@@ -151,13 +164,57 @@ class Session:
             project_dir,
             host_userdir,
             self.network,
+            job_dir=job_dir,
         )
         for resource in self._resources:
             container = self.client.containers.run(**container_specs[resource])
             self._containers[resource] = container
 
+        # Steps pass data through the memory-server, thus the session is
+        # only launched once it is ready. The other containers start in
+        # the meantime.
+        if "memory-server" in self._containers:
+            _wait_for_memory_server(self._containers["memory-server"])
+
         return
 
+    def get_memory_server_metrics(self) -> Optional[Dict[str, int]]:
+        """Gets the metrics of the memory-server of the session.
+
+        The metrics are read from the file that the memory-server writes
+        in the Prometheus text format, e.g. the number of bytes used in
+        its store and the number of outputs that fell back to disk.
+
+        Returns:
+            Mapping from the name of a metric to its value, or ``None``
+            if the session has no memory-server or it did not write its
+            metrics (yet).
+
+        """
+        container = self.containers.get("memory-server")
+        if container is None:
+            return None
+
+        try:
+            exit_code, output = container.exec_run(
+                ["cat", _config.MEMORY_SERVER_METRICS_PATH]
+            )
+        except (requests.exceptions.HTTPError, NotFound, APIError):
+            return None
+
+        if exit_code != 0:
+            return None
+
+        metrics = {}
+        for line in output.decode().splitlines():
+            if not line or line.startswith("#"):
+                continue
+
+            name, value = line.rsplit(" ", 1)
+            metrics[name] = int(float(value))
+
+        return metrics
+
     @abstractmethod
     def shutdown(self) -> None:
         """Shuts down session.
@@ -300,12 +357,24 @@ class InteractiveSession(Session):
             See `Args` section in parent class :class:`Session`.
 
         """
+        # The project directory is given w.r.t. the host, whereas the
+        # userdir is mounted at "/userdir".
+        pipeline_json = os.path.join(
+            "/userdir", os.path.relpath(project_dir, host_userdir), pipeline_path
+        )
+        try:
+            with open(pipeline_json, "r") as f:
+                memory_backend = get_memory_backend(json.load(f))
+        except (OSError, ValueError):
+            memory_backend = "plasma"
+
         super().launch(
             pipeline_uuid,
             project_uuid,
             pipeline_path,
             project_dir,
             host_userdir,
+            memory_backend=memory_backend,
         )
 
         IP = self.get_containers_IP()
@@ -385,6 +454,14 @@ class InteractiveSession(Session):
         # NOTE: Docker ID does not change when restarting the container.
         container.restart(timeout=5)  # timeout in sec before killing
 
+        if resource_name == "memory-server":
+            # The logs of before the restart are kept, thus only the
+            # ready message of the new start of the container counts.
+            container.reload()
+            _wait_for_memory_server(
+                container, started_at=container.attrs["State"]["StartedAt"]
+            )
+
 
 class NonInteractiveSession(Session):
     """Manages resources for a non-interactive session."""
@@ -404,6 +481,8 @@ class NonInteractiveSession(Session):
         project_uuid: str,
         pipeline_path: str,
         project_dir: str,
+        job_dir: Optional[str] = None,
+        memory_backend: str = "plasma",
     ) -> None:
         """
 
@@ -421,12 +500,22 @@ class NonInteractiveSession(Session):
             pipeline_path: Path to the pipeline file relative to the
                 `project_dir`.
             project_dir: Path to the project directory on the host.
+            job_dir: Path to the directory of the job on the host.
+            memory_backend: The store backend of the memory-server, see
+                :func:`get_memory_backend`.
 
         """
         if uuid is None:
             uuid = self._session_uuid
 
-        return super().launch(uuid, project_uuid, pipeline_path, project_dir)
+        return super().launch(
+            uuid,
+            project_uuid,
+            pipeline_path,
+            project_dir,
+            job_dir=job_dir,
+            memory_backend=memory_backend,
+        )
 
 
 @contextmanager
@@ -436,6 +525,8 @@ def launch_noninteractive_session(
     project_uuid: str,
     pipeline_path: str,
     project_dir: str,
+    job_dir: Optional[str] = None,
+    memory_backend: str = "plasma",
 ) -> NonInteractiveSession:
     """Launches a non-interactive session for a particular pipeline.
 
@@ -446,6 +537,11 @@ def launch_noninteractive_session(
         project_dir: Path to the `project_dir`, which has to be
             mounted into the containers so that the user can interact
             with the files.
+        job_dir: Path to the directory of the job on the host, if the
+            session is launched for a run of a job. The memory-server
+            records the memory usage of the runs in it.
+        memory_backend: The store backend of the memory-server, see
+            :func:`get_memory_backend`.
 
     Yields:
         A Session object that has already launched its resources.
@@ -457,6 +553,8 @@ def launch_noninteractive_session(
         project_uuid,
         pipeline_path,
         project_dir,
+        job_dir=job_dir,
+        memory_backend=memory_backend,
     )
     try:
         yield session
@@ -464,8 +562,114 @@ def launch_noninteractive_session(
         session.shutdown()
 
 
+def get_memory_backend(pipeline_definition: Dict) -> str:
+    """Returns the store backend of the memory-server of a pipeline.
+
+    Has to match ``utils.get_store_backend`` of the memory-server.
+
+    Returns:
+        Either "plasma" (the default) or "mmap".
+
+    """
+    settings = pipeline_definition.get("settings", {})
+    return settings.get("data_passing_memory_backend", "plasma")
+
+
+def _create_temp_volume(
+    client, uuid: str, project_uuid: str, memory_backend: str
+) -> None:
+    """Creates the volume that is shared by the memory-server and steps.
+
+    The "mmap" backend of the memory-server stores objects as files in
+    this volume, thus the volume is created as a tmpfs instead of on the
+    disk of the host, just like the shared memory of the plasma store.
+    Otherwise Docker creates the volume once it is first mounted.
+
+    The files only have to stay valid for as long as they are mapped:
+    a deleted (unlinked) file is only freed once all its mappings are
+    closed, thus the store needs no reference counting of its own.
+    Note that the tmpfs is emptied once no container mounts it anymore.
+    """
+    if memory_backend != "mmap":
+        return
+
+    # Creating a volume that already exists returns the existing one.
+    client.volumes.create(
+        name=_config.TEMP_VOLUME_NAME.format(uuid=uuid, project_uuid=project_uuid),
+        driver="local",
+        driver_opts={"type": "tmpfs", "device": "tmpfs"},
+    )
+
+
+def _parse_docker_timestamp(timestamp: str) -> datetime:
+    """Parses an RFC 3339 timestamp of docker, e.g. of its logs.
+
+    Docker uses nanoseconds, which are truncated to microseconds.
+    """
+    seconds, _, fraction = timestamp.rstrip("Z").partition(".")
+    parsed = datetime.strptime(seconds, "%Y-%m-%dT%H:%M:%S")
+    return parsed.replace(microsecond=int(fraction[:6].ljust(6, "0")))
+
+
+def _wait_for_memory_server(container, started_at: Optional[str] = None) -> bool:
+    """Waits for the memory-server to signal that it is ready.
+
+    The memory-server prints ``MEMORY_SERVER_READY_MESSAGE`` once its
+    store accepts connections and its manager is set up. Its logs are
+    streamed, so that the wait ends as soon as the message is printed.
+
+    Args:
+        container (docker.models.containers.Container): The container
+            of the memory-server.
+        started_at: Only consider logs from this start of the container
+            onwards, e.g. when the container was restarted. The
+            ``State.StartedAt`` of the container.
+
+    Returns:
+        Whether the memory-server is ready. If not, then it exited or
+        did not become ready within ``MEMORY_SERVER_READY_TIMEOUT``
+        seconds, in which case steps fall back to passing data through
+        disk.
+
+    """
+    # The `since` of docker has a granularity of seconds, thus the
+    # timestamps of the logs are compared to the exact start as well.
+    since = None
+    if started_at is not None:
+        started_at = _parse_docker_timestamp(started_at)
+        since = calendar.timegm(started_at.timetuple())
+
+    logs = container.logs(stream=True, follow=True, since=since, timestamps=True)
+
+    # The stream blocks until the container logs something, thus it is
+    # closed from another thread on timeout.
+    timer = threading.Timer(_config.MEMORY_SERVER_READY_TIMEOUT, logs.close)
+    timer.start()
+    try:
+        for line in logs:
+            timestamp, _, message = line.decode(errors="replace").partition(" ")
+            if _config.MEMORY_SERVER_READY_MESSAGE not in message:
+                continue
+            elif started_at is None:
+                return True
+            elif _parse_docker_timestamp(timestamp) >= started_at:
+                return True
+    except Exception:
+        # Raised by the stream if it was closed on timeout.
+        pass
+    finally:
+        timer.cancel()
+
+    logging.warning("Memory-server %s did not become ready." % container.name)
+    return False
+
+
 def _get_mounts(
-    uuid: str, project_uuid: str, project_dir: str, host_userdir: str
+    uuid: str,
+    project_uuid: str,
+    project_dir: str,
+    host_userdir: str,
+    job_dir: Optional[str] = None,
 ) -> Dict[str, Mount]:
     """Constructs the mounts for all resources.
 
@@ -480,6 +684,8 @@ def _get_mounts(
         project_dir: Project directory w.r.t. the host. Needed to
             construct the mounts.
         host_userdir: Path to the userdir on the host
+        job_dir: Path to the directory of the job on the host, only
+            passed for runs of jobs.
 
 
     Returns:
@@ -490,6 +696,7 @@ def _get_mounts(
                 'docker_sock': Mount,
                 'project_dir': Mount,
                 'temp_volume': Mount,
+                'job_dir': Mount,  # None if not a run of a job.
 
                 # Used for persisting user configurations.
                 'jupyterlab': {
@@ -557,6 +764,10 @@ def _get_mounts(
         type="volume",
     )
 
+    mounts["job_dir"] = None
+    if job_dir is not None:
+        mounts["job_dir"] = Mount(target=_config.JOB_DIR, source=job_dir, type="bind")
+
     return mounts
 
 
@@ -567,6 +778,7 @@ def _get_container_specs(
     project_dir: str,
     host_userdir: str,
     network: str,
+    job_dir: Optional[str] = None,
 ) -> Dict[str, dict]:
     """Constructs the container specifications for all resources.
 
@@ -583,6 +795,8 @@ def _get_container_specs(
         host_userdir: Path to the userdir on the host
         network: Docker network. This is put directly into the specs, so
             that the containers are started on the specified network.
+        job_dir: Path to the directory of the job on the host, if the
+            session is launched for a run of a job.
 
     Returns:
         Mapping from container name to container specification for the
@@ -596,12 +810,23 @@ def _get_container_specs(
     """
     # TODO: possibly add ``auto_remove=True`` to the specs.
     container_specs = {}
-    mounts = _get_mounts(uuid, project_uuid, project_dir, host_userdir)
+    mounts = _get_mounts(uuid, project_uuid, project_dir, host_userdir, job_dir)
+
+    # Every run of a job starts from a fresh copy of the snapshot, thus
+    # the memory-server records the memory usage of the runs in the job
+    # directory instead, so that "auto" sizing uses all of them.
+    memory_server_mounts = [mounts["project_dir"], mounts["temp_volume"]]
+    memory_server_env = [f"ORCHEST_PIPELINE_PATH={pipeline_path}"]
+    if mounts["job_dir"] is not None:
+        memory_server_mounts.append(mounts["job_dir"])
+        memory_server_env.append(
+            f"ORCHEST_MEMORY_HISTORY_FNAME={_config.JOB_MEMORY_HISTORY_FNAME}"
+        )
 
     container_specs["memory-server"] = {
         "image": "orchest/memory-server:latest",
         "detach": True,
-        "mounts": [mounts["project_dir"], mounts["temp_volume"]],
+        "mounts": memory_server_mounts,
         # TODO: name not unique... and uuid cannot be used.
         "name": f"memory-server-{project_uuid}-{uuid}",
         "network": network,
@@ -610,9 +835,7 @@ def _get_container_specs(
         # definition). Mounting `/dev/shm` directly is not supported on
         # Mac.
         "shm_size": "1000G",
-        "environment": [
-            f"ORCHEST_PIPELINE_PATH={pipeline_path}",
-        ],
+        "environment": memory_server_env,
         # Labels are used to have a way of keeping track of the
         # containers attributes through ``Session.from_container_IDs``
         "labels": {"session_identity_uuid": uuid, "project_uuid": project_uuid},
@@ -15,7 +15,7 @@ from app.connections import docker_client
 from app.core.environment_builds import build_environment_task
 from app.core.jupyter_builds import build_jupyter_task
 from app.core.pipelines import Pipeline, PipelineDefinition
-from app.core.sessions import launch_noninteractive_session
+from app.core.sessions import get_memory_backend, launch_noninteractive_session
 
 logger = get_task_logger(__name__)
 
@@ -238,6 +238,7 @@ def start_non_interactive_pipeline_run(
     # To join the paths, the `run_dir` cannot start with `/userdir/...`
     # but should start as `userdir/...`
     run_config["project_dir"] = os.path.join(host_base_user_dir, run_dir[1:])
+    run_config["job_dir"] = os.path.join(host_base_user_dir, job_dir[1:])
     run_config["run_endpoint"] = f"jobs/{job_uuid}"
     run_config["pipeline_uuid"] = pipeline_uuid
     run_config["project_uuid"] = project_uuid
@@ -255,6 +256,8 @@ def start_non_interactive_pipeline_run(
         project_uuid,
         run_config["pipeline_path"],
         run_config["project_dir"],
+        job_dir=run_config["job_dir"],
+        memory_backend=get_memory_backend(pipeline_definition),
     ):
         status = run_pipeline(
             pipeline_definition, project_uuid, run_config, task_id=self.request.id
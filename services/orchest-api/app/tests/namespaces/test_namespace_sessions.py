@@ -97,6 +97,31 @@ def test_session_put(client, pipeline, monkeypatch_interactive_session, monkeypa
     assert r.restarted
 
 
+def test_session_metrics_get(
+    client, pipeline, monkeypatch_interactive_session, monkeypatch
+):
+    pipeline_spec = {
+        "project_uuid": pipeline.project.uuid,
+        "pipeline_uuid": pipeline.uuid,
+        "pipeline_path": "pip_path",
+        "project_dir": "project_dir",
+        "host_userdir": "host_userdir",
+    }
+
+    class WithMetrics:
+        def get_memory_server_metrics(self):
+            return {"orchest_memory_server_used_bytes": 1024}
+
+    monkeypatch.setattr(
+        InteractiveSession, "from_container_IDs", lambda *args, **kwargs: WithMetrics()
+    )
+    client.post("/api/sessions/", json=pipeline_spec)
+
+    resp = client.get(f"/api/sessions/{pipeline.project.uuid}/{pipeline.uuid}/metrics")
+    assert resp.status_code == 200
+    assert resp.get_json() == {"metrics": {"orchest_memory_server_used_bytes": 1024}}
+
+
 def test_session_put_non_existent(client):
     resp = client.put("/api/sessions/hello/world")
     assert resp.status_code == 404
@@ -453,9 +453,10 @@ def create_job_directory(job_uuid, pipeline_uuid, project_uuid):
                 ['hello.txt', 'some-dir']
             """
         # Ignore the ".orchest/pipelines" directory containing the
-        # logs and data directories.
+        # logs and data directories, and the ".orchest/blobs" directory
+        # containing the data that is linked to from data directories.
         if path.endswith(".orchest"):
-            return ["pipelines"]
+            return ["pipelines", "blobs"]
 
         # Ignore nothing.
         return []
@@ -464,7 +464,9 @@ class PipelineSettingsView extends React.Component {
                       <p className="push-down">
                         Change the size of the memory server for data passing.
                         For units use KB, MB, or GB, e.g.{" "}
-                        <span className="code">1GB</span>.{" "}
+                        <span className="code">1GB</span>, or{" "}
+                        <span className="code">auto</span> to size it based on
+                        the memory usage of previous sessions.{" "}
                       </p>
                     )}
 